@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QIcon
@@ -48,4 +49,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    # 支持打包后的程序启动PDF页面提取进程池
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
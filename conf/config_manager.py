@@ -20,6 +20,25 @@ class ConfigManager:
         'splitter_sizes': [200, 400, 400, 200],  # 左侧文件树、文本阅读区、图片查看区、右侧聊天区的宽度比例
         'image_viewer_splitter_sizes': [700, 300],  # 图片查看器中上部图片区域和下部缩略图区域的高度比例
         'zoom_level': 1.0,  # PDF查看器的缩放级别
+        'extract_workers': 0,  # PDF页面并行提取的进程数，0表示使用CPU核心数
+        'parallel_extract_threshold': 32,  # 启用并行提取的最小页数
+        'cache_max_bytes': 2 * 1024 ** 3,  # 文档缓存的总大小上限（字节），0表示不限制
+        'cache_max_entries': 0,  # 文档缓存的条目数上限，0表示不限制
+        'llm_max_workers': 4,  # 同时进行的LLM请求数上限
+        'llm_pool_size': 10,  # 每个LLM客户端保持的HTTP连接数上限
+        'llm_connect_timeout': 10.0,  # LLM请求的连接超时时间（秒）
+        'llm_read_timeout': 120.0,  # LLM请求的读取超时时间（秒）
+        'llm_requests_per_minute': 60,  # 每个LLM接口每分钟的请求数上限，0表示不限制
+        'llm_tokens_per_minute': 90000,  # 每个LLM接口每分钟的token数上限，0表示不限制
+        'llm_max_retries': 5,  # LLM请求遇到限流或临时错误时的最大重试次数
+        'llm_max_retry_delay': 60,  # LLM请求单次等待（限流、退避）的最长秒数，Retry-After超过该值时直接失败
+        'translation_cache_max_entries': 10000,  # 翻译缓存的条目数上限，0表示不限制
+        'translate_max_in_flight': 3,  # 全文翻译时同时进行的请求数上限
+        'chat_context_tokens': 3000,  # AI对话中检索到的文档上下文的token预算
+        'chat_context_top_k': 8,  # AI对话中最多使用的文档文本块数量
+        'chat_window_tokens': 16385,  # AI对话模型的上下文窗口大小（token）
+        'chat_reply_tokens': 1024,  # AI对话中为回复预留的token数量
+        'image_cache_max_bytes': 512 * 1024 ** 2,  # 图片查看器中已解码图片（含缩放金字塔）占用内存的上限（字节）
         'categories': {},  # 文献分类数据
         'llm_configs': {  # LLM配置，包含三套配置
             'format': {  # 文本整理配置
@@ -203,6 +222,158 @@ class ConfigManager:
     def zoom_level(self, value: float) -> None:
         self.set('zoom_level', value)
     
+    @property
+    def extract_workers(self) -> int:
+        return self.get('extract_workers', self._default_config['extract_workers'])
+    
+    @extract_workers.setter
+    def extract_workers(self, value: int) -> None:
+        self.set('extract_workers', value)
+    
+    @property
+    def parallel_extract_threshold(self) -> int:
+        return self.get('parallel_extract_threshold', self._default_config['parallel_extract_threshold'])
+    
+    @parallel_extract_threshold.setter
+    def parallel_extract_threshold(self, value: int) -> None:
+        self.set('parallel_extract_threshold', value)
+    
+    @property
+    def cache_max_bytes(self) -> int:
+        return self.get('cache_max_bytes', self._default_config['cache_max_bytes'])
+    
+    @cache_max_bytes.setter
+    def cache_max_bytes(self, value: int) -> None:
+        self.set('cache_max_bytes', value)
+    
+    @property
+    def cache_max_entries(self) -> int:
+        return self.get('cache_max_entries', self._default_config['cache_max_entries'])
+    
+    @cache_max_entries.setter
+    def cache_max_entries(self, value: int) -> None:
+        self.set('cache_max_entries', value)
+    
+    @property
+    def llm_max_workers(self) -> int:
+        return self.get('llm_max_workers', self._default_config['llm_max_workers'])
+    
+    @llm_max_workers.setter
+    def llm_max_workers(self, value: int) -> None:
+        self.set('llm_max_workers', value)
+    
+    @property
+    def llm_pool_size(self) -> int:
+        return self.get('llm_pool_size', self._default_config['llm_pool_size'])
+    
+    @llm_pool_size.setter
+    def llm_pool_size(self, value: int) -> None:
+        self.set('llm_pool_size', value)
+    
+    @property
+    def llm_connect_timeout(self) -> float:
+        return self.get('llm_connect_timeout', self._default_config['llm_connect_timeout'])
+    
+    @llm_connect_timeout.setter
+    def llm_connect_timeout(self, value: float) -> None:
+        self.set('llm_connect_timeout', value)
+    
+    @property
+    def llm_read_timeout(self) -> float:
+        return self.get('llm_read_timeout', self._default_config['llm_read_timeout'])
+    
+    @llm_read_timeout.setter
+    def llm_read_timeout(self, value: float) -> None:
+        self.set('llm_read_timeout', value)
+    
+    @property
+    def llm_requests_per_minute(self) -> int:
+        return self.get('llm_requests_per_minute', self._default_config['llm_requests_per_minute'])
+    
+    @llm_requests_per_minute.setter
+    def llm_requests_per_minute(self, value: int) -> None:
+        self.set('llm_requests_per_minute', value)
+    
+    @property
+    def llm_tokens_per_minute(self) -> int:
+        return self.get('llm_tokens_per_minute', self._default_config['llm_tokens_per_minute'])
+    
+    @llm_tokens_per_minute.setter
+    def llm_tokens_per_minute(self, value: int) -> None:
+        self.set('llm_tokens_per_minute', value)
+    
+    @property
+    def llm_max_retries(self) -> int:
+        return self.get('llm_max_retries', self._default_config['llm_max_retries'])
+    
+    @llm_max_retries.setter
+    def llm_max_retries(self, value: int) -> None:
+        self.set('llm_max_retries', value)
+    
+    @property
+    def llm_max_retry_delay(self) -> float:
+        return self.get('llm_max_retry_delay', self._default_config['llm_max_retry_delay'])
+    
+    @llm_max_retry_delay.setter
+    def llm_max_retry_delay(self, value: float) -> None:
+        self.set('llm_max_retry_delay', value)
+    
+    @property
+    def translation_cache_max_entries(self) -> int:
+        return self.get('translation_cache_max_entries', self._default_config['translation_cache_max_entries'])
+    
+    @translation_cache_max_entries.setter
+    def translation_cache_max_entries(self, value: int) -> None:
+        self.set('translation_cache_max_entries', value)
+    
+    @property
+    def translate_max_in_flight(self) -> int:
+        return self.get('translate_max_in_flight', self._default_config['translate_max_in_flight'])
+    
+    @translate_max_in_flight.setter
+    def translate_max_in_flight(self, value: int) -> None:
+        self.set('translate_max_in_flight', value)
+    
+    @property
+    def chat_context_tokens(self) -> int:
+        return self.get('chat_context_tokens', self._default_config['chat_context_tokens'])
+    
+    @chat_context_tokens.setter
+    def chat_context_tokens(self, value: int) -> None:
+        self.set('chat_context_tokens', value)
+    
+    @property
+    def chat_context_top_k(self) -> int:
+        return self.get('chat_context_top_k', self._default_config['chat_context_top_k'])
+    
+    @chat_context_top_k.setter
+    def chat_context_top_k(self, value: int) -> None:
+        self.set('chat_context_top_k', value)
+    
+    @property
+    def chat_window_tokens(self) -> int:
+        return self.get('chat_window_tokens', self._default_config['chat_window_tokens'])
+    
+    @chat_window_tokens.setter
+    def chat_window_tokens(self, value: int) -> None:
+        self.set('chat_window_tokens', value)
+    
+    @property
+    def chat_reply_tokens(self) -> int:
+        return self.get('chat_reply_tokens', self._default_config['chat_reply_tokens'])
+    
+    @chat_reply_tokens.setter
+    def chat_reply_tokens(self, value: int) -> None:
+        self.set('chat_reply_tokens', value)
+    
+    @property
+    def image_cache_max_bytes(self) -> int:
+        return self.get('image_cache_max_bytes', self._default_config['image_cache_max_bytes'])
+    
+    @image_cache_max_bytes.setter
+    def image_cache_max_bytes(self, value: int) -> None:
+        self.set('image_cache_max_bytes', value)
+    
     @property
     def image_viewer_splitter_sizes(self) -> list:
         return self.get('image_viewer_splitter_sizes', self._default_config['image_viewer_splitter_sizes'])
@@ -1,18 +1,24 @@
 # controllers/chat_controller.py
+from concurrent.futures import Future
 from typing import Dict, Any, List
 from core.logger import logger
 from core.event_bus import EventBus
 from models.chat_model import ChatModel
 from models.config_model import ConfigModel
 from services.ai_service import AIService
+from services.config_service import ConfigService
+from llm.context_window import build_messages
+from llm.llm_worker import LLMRequest
 
 class ChatController:
-    def __init__(self, chat_model=None, config_model=None, ai_service=None):
+    def __init__(self, chat_model=None, config_model=None, ai_service=None, config_service=None):
+        self.config_service = config_service or ConfigService()
         self.chat_model = chat_model or ChatModel()
         self.config_model = config_model or ConfigModel()
         self.ai_service = ai_service or AIService()
         self.event_bus = EventBus()
         self.current_context = ""
+        self.pending_requests = []  # 正在进行的LLM请求
         logger.info("聊天控制器初始化完成")
         
         # 订阅事件
@@ -39,30 +45,49 @@ class ChatController:
         # 这里可以从PDF模型获取当前页面的文本内容作为上下文
         # 暂时留空，等待实现
     
-    def send_message(self, text: str) -> None:
-        """发送用户消息
+    def send_message(self, text: str) -> Future:
+        """发送用户消息，回复在LLM服务的线程池中获取，收到后加入聊天模型
         
         Args:
             text: 用户消息文本
+            
+        Returns:
+            Future: 结果为AI的回复，请求失败时为None
         """
         # 添加用户消息到聊天模型
-        self.chat_model.add_message(text, True)
+        self.chat_model.add_message('user', text)
         
-        # 构建消息列表
-        messages = []
-        for msg in self.chat_model.messages[-5:]:  # 只取最近的5条消息
-            role = "user" if msg.is_user else "assistant"
-            messages.append({"role": role, "content": msg.text})
+        # 在模型上下文窗口内组装与问题相关的文档片段和历史消息，失败的回复不计入历史
+        context = self.chat_model.retrieve_context(text) or self.current_context
+        history = [msg for msg in self.chat_model.get_chat_history() if not msg.get('error')]
+        reply_tokens = self.config_service.chat_reply_tokens
+        messages = build_messages(history, context, self.ai_service.model,
+                                  self.config_service.chat_window_tokens, reply_tokens)
         
-        # 调用AI服务获取回复
-        response = self.ai_service.send_message(messages, self.current_context)
+        # 调用AI服务获取回复，回复通过LLMRequest的信号交给界面线程处理，
+        # 聊天模型发布的事件会由视图直接更新界面组件
+        future = self.ai_service.send_message_async(messages, max_tokens=reply_tokens)
+        request = LLMRequest()
+        request.completed.connect(self._on_response)
+        request.failed.connect(lambda error: self._on_response(None))
+        request.finished.connect(lambda: self.pending_requests.remove(request))
+        request.finished.connect(request.deleteLater)
+        self.pending_requests.append(request)
+        request.attach(future)
+        return future
+    
+    def _on_response(self, response) -> None:
+        """在界面线程中处理AI服务的回复
         
+        Args:
+            response: AI的回复，请求失败时为None
+        """
         if response:
             # 添加AI回复到聊天模型
-            self.chat_model.add_message(response, False)
+            self.chat_model.add_message('assistant', response)
         else:
             # 添加错误消息
-            self.chat_model.add_message("抱歉，无法获取回复。请检查API设置或网络连接。", False)
+            self.chat_model.add_message('assistant', "抱歉，无法获取回复。请检查API设置或网络连接。", error=True)
     
     def get_messages(self) -> List[Dict[str, Any]]:
         """获取所有消息
@@ -71,13 +96,13 @@ class ChatController:
             List[Dict[str, Any]]: 消息列表
         """
         return [{
-            "text": msg.text,
-            "is_user": msg.is_user
-        } for msg in self.chat_model.messages]
+            "text": msg['content'],
+            "is_user": msg['role'] == 'user'
+        } for msg in self.chat_model.get_chat_history()]
     
     def clear_messages(self) -> None:
         """清空所有消息"""
-        self.chat_model.messages = []
+        self.chat_model.clear_chat_history()
         # 发布消息清空事件
         self.event_bus.publish('messages_cleared', {})
     
@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QTextEdit, QSizePolicy
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QBrush, QFont, QTextOption
+from gui.text_measure import TextMeasureService
 
 class ChatBubbleWidget(QWidget):
     """聊天气泡组件，用于显示聊天消息"""
@@ -69,6 +70,7 @@ class ChatBubble(QWidget):
         super().__init__(parent)
         self.text = text
         self.is_user = is_user
+        self.text_measure = TextMeasureService()
         self.initUI()
     
     def initUI(self):
@@ -121,36 +123,35 @@ class ChatBubble(QWidget):
         # 设置气泡颜色
         self.bubble_color = QColor("#2B5B84") if self.is_user else QColor("#333333")
         
-        # 添加文档大小变化的连接，确保气泡大小随内容变化
-        self.text_edit.document().contentsChanged.connect(self.adjust_size)
-        
-        # 初始化时立即调整大小
-        self.adjust_size()
+        # 初始化后在下一帧调整大小
+        self.text_measure.schedule_layout(self.adjust_size)
     
     def adjust_size(self):
-        """根据内容调整气泡大小"""
-        # 获取文档实际大小
-        doc_size = self.text_edit.document().size()
+        """根据内容调整气泡大小，文本高度由文本测量服务计算并缓存"""
+        width = self.text_edit.viewport().width()
+        content_height = self.text_measure.text_height(self.text, width, self.text_edit.font())
+        if content_height <= 0:
+            # 尚未完成布局，等大小变化时再调整
+            return
         # 设置足够的高度以显示所有内容，增加更多额外空间确保完全显示
-        height = int(doc_size.height()) + 50
+        height = content_height + 50
+        if height == self.text_edit.height():
+            return
         self.text_edit.setFixedHeight(height)
         
-        # 强制文本编辑器重新计算内容大小
-        self.text_edit.document().adjustSize()
-        # 更新布局
+        # 更新布局，父组件的布局会随之更新
         self.updateGeometry()
-        # 确保父组件也更新布局
-        parent = self.parent()
-        while parent:
-            parent.updateGeometry()
-            parent = parent.parent()
             
-        # 强制更新滚动区域，确保当前气泡可见
+        # 确保当前气泡可见
         top_level = self.window()
         if hasattr(top_level, 'scroll_area'):
             top_level.scroll_area.ensureWidgetVisible(self)
-            # 强制刷新滚动区域
-            top_level.scroll_area.update()
+    
+    def resizeEvent(self, event):
+        """大小变化事件"""
+        super().resizeEvent(event)
+        # 当组件大小变化时，在下一帧重新调整大小
+        self.text_measure.schedule_layout(self.adjust_size)
     
     def paintEvent(self, event):
         """绘制气泡背景"""
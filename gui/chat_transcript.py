@@ -0,0 +1,285 @@
+from PyQt5.QtWidgets import (QListView, QStyledItemDelegate, QStyle, QTextBrowser, QAbstractItemView, QMenu,
+                             QApplication)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QTimer
+from PyQt5.QtGui import (QTextDocument, QTextOption, QAbstractTextDocumentLayout, QPalette, QColor, QPainter, QPen,
+                         QFont, QFontMetrics, QKeySequence)
+from gui.text_measure import TextMeasureService
+
+
+class ChatTranscriptModel(QAbstractListModel):
+    """聊天记录模型，每行一条消息"""
+
+    IsUserRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.messages = []  # 元素为 {'text': 消息文本, 'is_user': 是否为用户消息}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self.messages[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return message['text']
+        if role == self.IsUserRole:
+            return message['is_user']
+        return None
+
+    def add_message(self, text, is_user):
+        """添加消息
+
+        Args:
+            text: 消息文本
+            is_user: 是否为用户消息
+
+        Returns:
+            int: 新消息的行号
+        """
+        row = len(self.messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.messages.append({'text': text, 'is_user': is_user})
+        self.endInsertRows()
+        return row
+
+    def append_text(self, row, text):
+        """向消息末尾追加文本
+
+        Args:
+            row: 消息行号
+            text: 追加的文本
+        """
+        self.messages[row]['text'] += text
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def message_text(self, row):
+        """获取消息文本"""
+        return self.messages[row]['text']
+
+
+class ChatMessageDelegate(QStyledItemDelegate):
+    """聊天消息绘制代理
+
+    只为可见的消息绘制文本，消息高度由文本测量服务按 (文本, 宽度, 字体) 缓存，滚动时不需要重新排版。
+    双击消息时打开只读的文本浏览器，用于选择和复制部分文本。
+    """
+
+    MARGIN = 3  # 消息四周的边距
+    PADDING = 6  # 文本与消息背景之间的距离
+    HEADER_SPACING = 2  # 标题与消息背景之间的距离
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 绘制用的排版文档，换行方式与文本测量服务一致
+        self.document = QTextDocument()
+        self.document.setDocumentMargin(0)
+        option = self.document.defaultTextOption()
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+        self.document.setDefaultTextOption(option)
+        self.header_font = QFont()
+        self.header_font.setBold(True)
+        self.text_measure = TextMeasureService()
+
+    def _text_width(self, option):
+        view = self.parent()
+        width = view.viewport().width() if view is not None else option.rect.width()
+        return max(50, width - 2 * (self.MARGIN + self.PADDING))
+
+    def _header_height(self):
+        return QFontMetrics(self.header_font).height() + self.HEADER_SPACING
+
+    def _layout_text(self, text, width, font):
+        self.document.setDefaultFont(font)
+        self.document.setPlainText(text)
+        self.document.setTextWidth(width)
+        return self.document
+
+    def sizeHint(self, option, index):
+        width = self._text_width(option)
+        text_height = self.text_measure.text_height(index.data(Qt.DisplayRole) or '', width, option.font, rich=False)
+        height = self._header_height() + text_height + 2 * (self.MARGIN + self.PADDING) + 1
+        return QSize(width + 2 * (self.MARGIN + self.PADDING), height)
+
+    def _bubble_rect(self, rect):
+        top = rect.top() + self.MARGIN + self._header_height()
+        return QRect(rect.left() + self.MARGIN, top, rect.width() - 2 * self.MARGIN,
+                     rect.bottom() - self.MARGIN - top)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = option.rect
+        is_user = index.data(ChatTranscriptModel.IsUserRole)
+
+        # 标题（用户/AI）
+        painter.setFont(self.header_font)
+        painter.setPen(QColor("#CCCCCC"))
+        header_rect = QRect(rect.left() + self.MARGIN, rect.top() + self.MARGIN,
+                            rect.width() - 2 * self.MARGIN, self._header_height())
+        painter.drawText(header_rect, Qt.AlignLeft | Qt.AlignTop, "用户" if is_user else "AI")
+
+        # 消息背景，选中时加边框
+        bubble = self._bubble_rect(rect)
+        selected = option.state & QStyle.State_Selected
+        painter.setPen(QPen(QColor("#2B5B84"), 1) if selected else Qt.NoPen)
+        painter.setBrush(QColor("#222222"))
+        painter.drawRoundedRect(bubble, 5, 5)
+
+        # 消息文本
+        document = self._layout_text(index.data(Qt.DisplayRole) or '', self._text_width(option), option.font)
+        painter.translate(bubble.left() + self.PADDING, bubble.top() + self.PADDING)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.Text, QColor("white"))
+        context.clip = QRect(0, 0, bubble.width() - 2 * self.PADDING, bubble.height() - 2 * self.PADDING)
+        painter.setClipRect(context.clip)
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+        # 分隔线
+        painter.save()
+        painter.setPen(QColor("#555555"))
+        painter.drawLine(rect.left() + self.MARGIN, rect.bottom(), rect.right() - self.MARGIN, rect.bottom())
+        painter.restore()
+
+    def createEditor(self, parent, option, index):
+        # 只读的文本浏览器，用于选择部分文本
+        editor = QTextBrowser(parent)
+        editor.setOpenExternalLinks(True)
+        editor.setReadOnly(True)
+        editor.setFrameStyle(QTextBrowser.NoFrame)
+        editor.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        editor.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        editor.document().setDocumentMargin(0)
+        editor.setStyleSheet("background-color: #222222; color: white; border: 1px solid #2B5B84;")
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setPlainText(index.data(Qt.DisplayRole) or '')
+
+    def setModelData(self, editor, model, index):
+        # 消息只读，不回写
+        pass
+
+    def updateEditorGeometry(self, editor, option, index):
+        bubble = self._bubble_rect(option.rect)
+        editor.setGeometry(bubble.adjusted(self.PADDING - 1, self.PADDING - 1, -self.PADDING + 1, -self.PADDING + 1))
+
+
+class ChatTranscriptView(QListView):
+    """聊天记录视图
+
+    使用模型/视图结构代替每条消息一个文本浏览器的做法，只绘制可见的消息。
+    流式追加的文本先缓存，按固定间隔合并写入模型，每次写入只重新排版一次。
+    """
+
+    # 流式输出时合并文本片段写入模型的间隔（毫秒）
+    STREAM_FLUSH_INTERVAL = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.transcript = ChatTranscriptModel(self)
+        self.setModel(self.transcript)
+        self.message_delegate = ChatMessageDelegate(self)
+        self.setItemDelegate(self.message_delegate)
+
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(False)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        self.setFrameShape(QListView.NoFrame)
+        self.setSpacing(2)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+
+        # 流式追加的文本片段：行号 -> 片段列表
+        self.pending_text = {}
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.STREAM_FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush_text)
+
+        # 停留在底部时，内容增加后自动滚动到底部
+        self.stick_to_bottom = True
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+        self.verticalScrollBar().rangeChanged.connect(self._on_range_changed)
+
+    def _on_scrolled(self, value):
+        self.stick_to_bottom = value >= self.verticalScrollBar().maximum() - 4
+
+    def _on_range_changed(self, minimum, maximum):
+        if self.stick_to_bottom:
+            self.verticalScrollBar().setValue(maximum)
+
+    def add_message(self, text, is_user):
+        """添加消息
+
+        Args:
+            text: 消息文本
+            is_user: 是否为用户消息
+
+        Returns:
+            int: 新消息的行号
+        """
+        self.stick_to_bottom = True
+        return self.transcript.add_message(text, is_user)
+
+    def has_text(self, row):
+        """消息中是否已有内容（包括尚未写入模型的片段）"""
+        return bool(self.transcript.message_text(row) or self.pending_text.get(row))
+
+    def append_text(self, row, delta):
+        """追加流式输出的文本片段
+
+        Args:
+            row: 消息行号
+            delta: 文本片段
+        """
+        self.pending_text.setdefault(row, []).append(delta)
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+
+    def flush_text(self):
+        """将缓存的文本片段写入模型"""
+        self.flush_timer.stop()
+        pending, self.pending_text = self.pending_text, {}
+        for row, parts in pending.items():
+            self.transcript.append_text(row, ''.join(parts))
+            # 通知视图该消息的高度已变化
+            self.message_delegate.sizeHintChanged.emit(self.transcript.index(row))
+
+    def selected_text(self):
+        """按顺序拼接选中消息的文本"""
+        rows = sorted(index.row() for index in self.selectedIndexes())
+        return "\n\n".join(self.transcript.message_text(row) for row in rows)
+
+    def copy_selected(self):
+        """复制选中的消息"""
+        text = self.selected_text()
+        if text:
+            QApplication.clipboard().setText(text)
+
+    def copy_all(self):
+        """复制全部消息"""
+        lines = [f"{'用户' if message['is_user'] else 'AI'}: {message['text']}" for message in self.transcript.messages]
+        QApplication.clipboard().setText("\n\n".join(lines))
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.Copy):
+            self.copy_selected()
+            return
+        super().keyPressEvent(event)
+
+    def show_context_menu(self, position):
+        menu = QMenu(self)
+        copy_action = menu.addAction('复制')
+        copy_action.setEnabled(bool(self.selectedIndexes()))
+        copy_action.triggered.connect(self.copy_selected)
+        copy_all_action = menu.addAction('复制全部')
+        copy_all_action.triggered.connect(self.copy_all)
+        menu.exec_(self.viewport().mapToGlobal(position))
@@ -0,0 +1,116 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QProgressBar, QTextBrowser, QPushButton, QLabel,
+                             QFileDialog, QMessageBox)
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.logger import logger
+from pdf.page_text import PAGE_HEADER
+from services.document_translator import DocumentTranslator
+
+
+class DocumentTranslateWorker(QThread):
+    """全文翻译线程"""
+
+    progress = pyqtSignal(int, int)  # 已完成片段数, 片段总数
+    page_translated = pyqtSignal(int, str)  # 页码（从0开始）, 译文
+    failed = pyqtSignal(str)  # 错误信息
+
+    def __init__(self, llm_client, target_lang, pages, max_in_flight, parent=None):
+        super().__init__(parent)
+        self.translator = DocumentTranslator(llm_client, target_lang, max_in_flight)
+        self.pages = pages
+        self._cancelled = False
+
+    def cancel(self):
+        """取消翻译，已完成的片段保留在翻译缓存中"""
+        self._cancelled = True
+
+    def run(self):
+        try:
+            self.translator.translate_pages(self.pages, self.progress.emit, self.page_translated.emit,
+                                            lambda: self._cancelled)
+        except Exception as e:
+            logger.error(f"全文翻译失败: {str(e)}")
+            self.failed.emit(str(e))
+
+
+class DocumentTranslateDialog(QDialog):
+    """全文翻译对话框，显示翻译进度并按页显示译文"""
+
+    def __init__(self, main_window, llm_client, target_lang, pages, title=''):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.target_lang = target_lang
+        self.title = title
+        self.page_count = len(pages)
+        self.translated_pages = []
+        self.error = None
+        self.setWindowTitle(f'全文翻译 - {target_lang}')
+        self.resize(700, 600)
+        self.initUI()
+
+        max_in_flight = main_window.config_manager.translate_max_in_flight
+        self.worker = DocumentTranslateWorker(llm_client, target_lang, pages, max_in_flight, self)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.page_translated.connect(self.on_page_translated)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.start()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel('正在准备翻译...')
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+
+        self.text_browser = QTextBrowser()
+        layout.addWidget(self.text_browser)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        self.save_btn = QPushButton('保存译文')
+        self.save_btn.setEnabled(False)
+        self.save_btn.clicked.connect(self.save_translation)
+        button_layout.addWidget(self.save_btn)
+        layout.addLayout(button_layout)
+
+    def on_progress(self, done, total):
+        """显示翻译进度"""
+        self.progress_bar.setMaximum(max(total, 1))
+        self.progress_bar.setValue(done)
+        self.status_label.setText(f'正在翻译 ({done}/{total} 个片段)')
+
+    def on_page_translated(self, page_num, text):
+        """追加已翻译完成的页面"""
+        self.translated_pages.append(text)
+        self.text_browser.append(PAGE_HEADER.format(page_num + 1) + text)
+
+    def on_failed(self, error):
+        self.error = error
+        self.status_label.setText(f'翻译中断: {error}（已完成的片段已缓存，重新翻译时将从中断处继续）')
+
+    def on_finished(self):
+        self.save_btn.setEnabled(bool(self.translated_pages))
+        if self.error is None and len(self.translated_pages) == self.page_count:
+            self.status_label.setText(f'翻译完成，共{self.page_count}页')
+
+    def save_translation(self):
+        """将已翻译的页面保存为文本文件"""
+        default_name = f"{self.title or '译文'}_{self.target_lang}.txt"
+        file_path, _ = QFileDialog.getSaveFileName(self, '保存译文', default_name, '文本文件 (*.txt)')
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write("".join(PAGE_HEADER.format(i + 1) + text for i, text in enumerate(self.translated_pages)))
+            logger.info(f"译文已保存: {file_path}")
+        except OSError as e:
+            QMessageBox.warning(self, '保存失败', f'保存译文失败: {str(e)}')
+
+    def done(self, result):
+        # 关闭对话框时停止翻译
+        if self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().done(result)
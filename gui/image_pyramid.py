@@ -0,0 +1,99 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+from core.logger import logger
+
+# 金字塔最小一级的长边（像素），再小就不再继续缩小
+PYRAMID_MIN_SIDE = 256
+
+
+class ImagePyramid:
+    """图片缩放金字塔
+
+    保存原图以及依次缩小一半的各级图片（1/2、1/4……），缩放时从不小于目标尺寸的最近一级开始缩放，
+    缩小大图时不需要每次都处理全部像素。
+    """
+
+    def __init__(self, image: QImage):
+        """构建缩放金字塔
+
+        Args:
+            image: 解码后的原图
+        """
+        # 转换为绘制和缩放最快的格式
+        image = image.convertToFormat(
+            QImage.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format_RGB32)
+        self.levels = [image]
+        while max(self.levels[-1].width(), self.levels[-1].height()) >= 2 * PYRAMID_MIN_SIDE:
+            previous = self.levels[-1]
+            self.levels.append(previous.scaled(max(1, previous.width() // 2), max(1, previous.height() // 2),
+                                               Qt.IgnoreAspectRatio, Qt.SmoothTransformation))
+
+    @property
+    def width(self) -> int:
+        """原图宽度"""
+        return self.levels[0].width()
+
+    @property
+    def height(self) -> int:
+        """原图高度"""
+        return self.levels[0].height()
+
+    def size_in_bytes(self) -> int:
+        """各级图片占用的内存（字节）"""
+        return sum(level.sizeInBytes() for level in self.levels)
+
+    def level_for(self, scale: float) -> Tuple[QImage, float]:
+        """选择不小于目标缩放比例的最小一级
+
+        Args:
+            scale: 相对原图的缩放比例
+
+        Returns:
+            Tuple[QImage, float]: (该级图片, 该级相对原图的缩放比例)
+        """
+        chosen, chosen_scale = self.levels[0], 1.0
+        for level in self.levels[1:]:
+            level_scale = level.width() / self.width
+            if level_scale < scale:
+                break
+            chosen, chosen_scale = level, level_scale
+        return chosen, chosen_scale
+
+
+class DecodedImageCache:
+    """已解码图片的LRU缓存，按占用内存淘汰最久未使用的缩放金字塔"""
+
+    def __init__(self, max_bytes: int):
+        """初始化缓存
+
+        Args:
+            max_bytes: 占用内存的上限（字节），最近使用的一张图片总会保留
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+    def get(self, key) -> Optional[ImagePyramid]:
+        """获取缓存的缩放金字塔，并标记为最近使用"""
+        pyramid = self.entries.get(key)
+        if pyramid is not None:
+            self.entries.move_to_end(key)
+        return pyramid
+
+    def put(self, key, pyramid: ImagePyramid) -> None:
+        """加入缓存，超出内存上限时淘汰最久未使用的图片"""
+        if key in self.entries:
+            self.total_bytes -= self.entries.pop(key).size_in_bytes()
+        self.entries[key] = pyramid
+        self.total_bytes += pyramid.size_in_bytes()
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            evicted_key, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= evicted.size_in_bytes()
+            logger.debug(f"淘汰已解码图片: {evicted_key}")
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self.entries.clear()
+        self.total_bytes = 0
@@ -2,8 +2,11 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QScrollArea, QHBoxLay
                              QPushButton, QSlider, QFrame, QGridLayout, QSpacerItem, QSizePolicy,
                              QGraphicsOpacityEffect)
 from gui.flow_layout import QFlowLayout
-from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QSize, QPropertyAnimation, QEasingCurve, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QSize, QRect, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt5.QtGui import QPixmap, QImage, QCursor, QMouseEvent, QPainter, QColor, QPen
+from gui.thumbnail_loader import ThumbnailLoader, THUMBNAIL_HEIGHT
+from gui.image_pyramid import ImagePyramid, DecodedImageCache
+from gui.tiled_image_view import TiledImageWidget
 from core.logger import logger
 
 class ImageViewerPanel(QWidget):
@@ -15,13 +18,20 @@ class ImageViewerPanel(QWidget):
     def __init__(self):
         super().__init__()
         self.images = []  # 存储当前页面的所有图片数据
+        self.thumbnails = {}  # 缓存中的缩略图，图片序号 -> (显示宽度, JPEG数据)
         self.current_index = 0  # 当前显示的图片索引
         self.zoom_level = 100  # 缩放级别，默认100%
         self.drag_start_position = None  # 拖拽起始位置
         self.is_dragging = False  # 是否正在拖拽
         self.image_offset = QPoint(0, 0)  # 图片偏移量
+        self.thumbnail_labels = []  # 缩略图标签，按图片序号排列
+        # 在线程池中生成缩略图，按可见顺序加载
+        self.thumbnail_loader = ThumbnailLoader(self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
         logger.debug("初始化图片查看器面板")
         self.initUI()
+        # 已解码图片及其缩放金字塔，缩放和切换回来时不需要重新解码
+        self.decoded_images = DecodedImageCache(self.config_manager.image_cache_max_bytes)
     
     def initUI(self):
         # 创建主布局
@@ -59,12 +69,10 @@ class ImageViewerPanel(QWidget):
         self.current_image_scroll.setAlignment(Qt.AlignCenter)
         self.current_image_scroll.setFrameShape(QFrame.NoFrame)
         
-        # 创建图片标签
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setText("无图片")
-        self.image_label.setStyleSheet("background-color: transparent;")
-        self.current_image_scroll.setWidget(self.image_label)
+        # 创建分块绘制的图片组件，只为可见区域生成缩放后的图块
+        self.image_view = TiledImageWidget()
+        self.image_view.clear_image("无图片")
+        self.current_image_scroll.setWidget(self.image_view)
         
         # 创建左右切换按钮容器
         self.nav_buttons_widget = QWidget(self.current_image_widget)
@@ -123,6 +131,7 @@ class ImageViewerPanel(QWidget):
         self.zoom_slider.setValue(100)  # 默认缩放比例100%
         self.zoom_slider.setFixedWidth(100)
         self.zoom_slider.valueChanged.connect(self.slider_zoom_changed)
+        self.zoom_slider.sliderReleased.connect(self.finish_interactive_zoom)
         zoom_control_layout.addWidget(self.zoom_slider)
         
         # 增加缩放按钮
@@ -150,6 +159,12 @@ class ImageViewerPanel(QWidget):
         # 添加缩放控制栏到布局
         current_image_layout.addLayout(zoom_control_layout)
         
+        # 连续缩放（滚轮、拖动滑动条）时先用快速缩放显示，停止操作一段时间后再平滑缩放一次
+        self.smooth_zoom_timer = QTimer(self)
+        self.smooth_zoom_timer.setSingleShot(True)
+        self.smooth_zoom_timer.setInterval(150)
+        self.smooth_zoom_timer.timeout.connect(self.finish_interactive_zoom)
+        
         # 下半部分 - 缩略图预览区域
         self.thumbnails_widget = QWidget()
         # 使用流式布局替代网格布局，更灵活地显示缩略图
@@ -164,6 +179,14 @@ class ImageViewerPanel(QWidget):
         self.thumbnails_scroll.setMinimumHeight(120)  # 设置缩略图区域的最小高度
         self.thumbnails_scroll.setFrameShape(QFrame.NoFrame)
         
+        # 缩略图区域滚动或大小变化后，加载进入可见范围的缩略图
+        self.thumbnail_check_timer = QTimer(self)
+        self.thumbnail_check_timer.setSingleShot(True)
+        self.thumbnail_check_timer.setInterval(50)
+        self.thumbnail_check_timer.timeout.connect(self.request_visible_thumbnails)
+        self.thumbnails_scroll.verticalScrollBar().valueChanged.connect(self.schedule_thumbnail_check)
+        self.splitter.splitterMoved.connect(self.schedule_thumbnail_check)
+        
         # 添加到分割器
         self.splitter.addWidget(self.current_image_widget)
         self.splitter.addWidget(self.thumbnails_scroll)
@@ -181,27 +204,30 @@ class ImageViewerPanel(QWidget):
         
         # 安装事件过滤器以处理鼠标移动事件
         self.current_image_widget.installEventFilter(self)
-        self.image_label.installEventFilter(self)
+        self.image_view.installEventFilter(self)
     
-    def set_images(self, image_data_list):
+    def set_images(self, image_data_list, thumbnails=None):
         """设置要显示的图片列表
         
         Args:
-            image_data_list: 图片数据列表，每个元素是图片的二进制数据
+            image_data_list: 图片数据序列，每个元素是图片的二进制数据
+            thumbnails: 缓存中已有的缩略图，图片序号 -> (显示宽度, JPEG数据)，有缩略图的图片不再解码完整图片
         """
         self.images = image_data_list
+        self.thumbnails = thumbnails or {}
+        self.decoded_images.clear()
         self.current_index = 0 if image_data_list else -1
         self.image_offset = QPoint(0, 0)  # 重置图片偏移量
         
         logger.info(f"设置图片列表，共{len(image_data_list) if image_data_list else 0}张图片")
         
-        # 清除所有缩略图
+        # 清除所有缩略图，丢弃上一批尚未完成的缩略图
         self.clear_thumbnails()
+        self.thumbnail_loader.reset()
         
         if not image_data_list:
             # 如果没有图片，显示提示信息
-            self.image_label.setText("无图片")
-            self.image_label.setPixmap(QPixmap())  # 清除图片
+            self.image_view.clear_image("无图片")  # 清除图片
             logger.debug("没有图片可显示")
             self.prev_button.setVisible(False)
             self.next_button.setVisible(False)
@@ -212,11 +238,12 @@ class ImageViewerPanel(QWidget):
             self.thumbnails_layout.addWidget(no_image_label)
             return
         
-        # 创建所有缩略图（使用流式布局）
-        for i, img_data in enumerate(image_data_list):
-            thumbnail = self.add_thumbnail(img_data, i)
-            if thumbnail:
-                self.thumbnails_layout.addWidget(thumbnail)
+        # 先为所有图片创建占位标签（使用流式布局），缩略图在后台生成，可见的优先
+        for i in range(len(image_data_list)):
+            thumbnail = self.add_thumbnail(i)
+            self.thumbnail_labels.append(thumbnail)
+            self.thumbnails_layout.addWidget(thumbnail)
+        self.schedule_thumbnail_check()
         
         # 显示第一张图片
         self.show_image(0)
@@ -226,48 +253,104 @@ class ImageViewerPanel(QWidget):
     
     def clear_thumbnails(self):
         """清除所有缩略图"""
+        self.thumbnail_labels = []
         while self.thumbnails_layout.count():
             item = self.thumbnails_layout.takeAt(0)
             if item and item.widget():
                 item.widget().deleteLater()
     
-    def add_thumbnail(self, img_data, index):
-        """添加一个缩略图
+    def add_thumbnail(self, index):
+        """创建一个缩略图占位标签，缩略图生成后再填入
         
         Args:
-            img_data: 图片的二进制数据
             index: 图片在列表中的索引
             
         Returns:
-            创建的缩略图标签，如果创建失败则返回None
+            创建的缩略图标签
         """
-        img = QImage.fromData(img_data)
-        if not img.isNull():
-            # 创建缩略图（固定高度为100像素）
-            pixmap = QPixmap.fromImage(img)
-            thumbnail_height = 100
-            thumbnail_width = int(pixmap.width() * thumbnail_height / pixmap.height()) if pixmap.height() > 0 else 100
-            scaled_pixmap = pixmap.scaled(
-                thumbnail_width, 
-                thumbnail_height,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            
-            # 创建缩略图标签
-            thumbnail_label = QLabel()
-            thumbnail_label.setPixmap(scaled_pixmap)
-            thumbnail_label.setAlignment(Qt.AlignCenter)
-            thumbnail_label.setFixedSize(thumbnail_width + 10, thumbnail_height + 10)  # 添加一些边距
-            thumbnail_label.setStyleSheet("border: 1px solid lightgray; margin: 2px;")
-            thumbnail_label.setProperty("index", index)  # 存储图片索引
-            thumbnail_label.setCursor(QCursor(Qt.PointingHandCursor))
-            
-            # 添加鼠标点击事件
-            thumbnail_label.mousePressEvent = lambda event, idx=index: self.show_image(idx)
-            
-            return thumbnail_label
-        return None
+        thumbnail_label = QLabel("...")
+        thumbnail_label.setAlignment(Qt.AlignCenter)
+        # 有缓存的缩略图时直接使用其宽度，否则在缩略图生成后调整
+        width = self.thumbnails[index][0] if index in self.thumbnails else THUMBNAIL_HEIGHT
+        thumbnail_label.setFixedSize(width + 10, THUMBNAIL_HEIGHT + 10)
+        thumbnail_label.setStyleSheet("border: 1px solid lightgray; margin: 2px;")
+        thumbnail_label.setProperty("index", index)  # 存储图片索引
+        thumbnail_label.setCursor(QCursor(Qt.PointingHandCursor))
+        
+        # 添加鼠标点击事件
+        thumbnail_label.mousePressEvent = lambda event, idx=index: self.show_image(idx)
+        
+        return thumbnail_label
+    
+    def schedule_thumbnail_check(self, *args):
+        """稍后检查并加载可见范围内的缩略图，连续滚动时只检查一次"""
+        if self.thumbnail_labels and not self.thumbnail_check_timer.isActive():
+            self.thumbnail_check_timer.start()
+    
+    def request_visible_thumbnails(self):
+        """请求生成可见范围内的缩略图，再预取上下各一屏，其余的推迟到滚动到附近时再生成"""
+        if not self.thumbnail_labels:
+            return
+        viewport = self.thumbnails_scroll.viewport()
+        top = self.thumbnails_scroll.verticalScrollBar().value()
+        visible = QRect(0, top, viewport.width(), viewport.height())
+        nearby = visible.adjusted(0, -viewport.height(), 0, viewport.height())
+        
+        visible_indexes, nearby_indexes = [], []
+        for index, label in enumerate(self.thumbnail_labels):
+            if label.property("loaded"):
+                continue
+            geometry = label.geometry()
+            if geometry.intersects(visible):
+                visible_indexes.append(index)
+            elif geometry.intersects(nearby):
+                nearby_indexes.append(index)
+        
+        # 取消已经远离可见范围、尚未开始的请求
+        wanted = set(visible_indexes) | set(nearby_indexes)
+        for index in self.thumbnail_loader.pending_indexes() - wanted:
+            self.thumbnail_loader.cancel(index)
+        # 请求按提交顺序执行，先提交可见的
+        for index in visible_indexes + nearby_indexes:
+            self.thumbnail_loader.request(index, self.thumbnail_source(index))
+    
+    def thumbnail_source(self, index):
+        """返回读取缩略图原始数据的函数：优先使用缓存的缩略图，否则使用完整图片"""
+        if index in self.thumbnails:
+            data = self.thumbnails[index][1]
+            return lambda: data
+        images = self.images
+        return lambda: images[index]
+    
+    def on_thumbnail_ready(self, generation, index, image):
+        """缩略图生成完成后填入对应的占位标签
+        
+        Args:
+            generation: 请求所属的批次号
+            index: 图片序号
+            image: 缩略图，生成失败时为空图片
+        """
+        if generation != self.thumbnail_loader.generation or index >= len(self.thumbnail_labels):
+            return
+        self.thumbnail_loader.finish(index)
+        label = self.thumbnail_labels[index]
+        label.setProperty("loaded", True)
+        if image.isNull():
+            label.setText("无法显示")
+            return
+        label.setText("")
+        label.setPixmap(QPixmap.fromImage(image))
+        label.setFixedSize(image.width() + 10, THUMBNAIL_HEIGHT + 10)  # 添加一些边距
+        # 标签宽度变化会使后面的缩略图移动位置
+        self.schedule_thumbnail_check()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_thumbnail_check()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_thumbnail_check()
     
     def show_image(self, index):
         """显示指定索引的图片
@@ -280,22 +363,11 @@ class ImageViewerPanel(QWidget):
         
         self.current_index = index
         self.image_offset = QPoint(0, 0)  # 重置图片偏移量
-        img_data = self.images[index]
-        img = QImage.fromData(img_data)
+        pyramid = self.current_pyramid()
         
-        if not img.isNull():
-            # 更新当前图片缓存
-            self.current_pixmap = QPixmap.fromImage(img)
-            
-            # 根据缩放级别调整图片大小
-            scaled_pixmap = self.current_pixmap.scaled(
-                int(self.current_pixmap.width() * self.zoom_level / 100),
-                int(self.current_pixmap.height() * self.zoom_level / 100),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
-            self.image_label.adjustSize()  # 调整标签大小以适应图片
+        if pyramid is not None:
+            # 根据缩放级别显示图片
+            self.render_current_image(pyramid)
             
             # 更新缩略图的选中状态
             self.update_thumbnail_selection()
@@ -306,6 +378,33 @@ class ImageViewerPanel(QWidget):
             # 发出图片改变信号
             self.image_changed.emit(index)
     
+    def current_pyramid(self):
+        """获取当前图片的缩放金字塔，不在缓存中时解码并构建
+        
+        Returns:
+            ImagePyramid: 缩放金字塔，没有图片或解码失败时返回None
+        """
+        if not self.images or self.current_index < 0 or self.current_index >= len(self.images):
+            return None
+        pyramid = self.decoded_images.get(self.current_index)
+        if pyramid is None:
+            img = QImage.fromData(self.images[self.current_index])
+            if img.isNull():
+                return None
+            pyramid = ImagePyramid(img)
+            self.decoded_images.put(self.current_index, pyramid)
+        return pyramid
+    
+    def render_current_image(self, pyramid, smooth=True):
+        """按当前缩放级别显示图片，图块从缩放金字塔中最接近的一级开始缩放
+        
+        Args:
+            pyramid: 当前图片的缩放金字塔
+            smooth: 是否平滑缩放，连续缩放过程中使用快速缩放
+        """
+        self.image_view.set_image(pyramid, self.zoom_level / 100, smooth)
+        self.image_view.adjustSize()  # 调整组件大小以适应图片
+    
     def update_thumbnail_selection(self):
         """更新缩略图的选中状态，高亮当前选中的图片缩略图"""
         # 遍历所有缩略图，更新选中状态
@@ -409,7 +508,7 @@ class ImageViewerPanel(QWidget):
         self.fade_out_animation_prev.start()
         self.fade_out_animation_next.start()
     
-    def set_zoom_level(self, new_level, mouse_pos=None, rel_x=None, rel_y=None):
+    def set_zoom_level(self, new_level, mouse_pos=None, rel_x=None, rel_y=None, interactive=False):
         """设置缩放级别
         
         Args:
@@ -417,6 +516,7 @@ class ImageViewerPanel(QWidget):
             mouse_pos: 鼠标位置，用于以鼠标位置为中心点进行缩放
             rel_x: 鼠标相对于图片的水平位置比例
             rel_y: 鼠标相对于图片的垂直位置比例
+            interactive: 是否为连续缩放中的一步，是则先快速缩放，停止操作后再平滑缩放
         """
         # 限制缩放级别在10%到1000%之间
         new_zoom = max(10, min(1000, new_level))
@@ -427,79 +527,77 @@ class ImageViewerPanel(QWidget):
         
         # 保存旧的缩放级别和图片尺寸
         old_zoom = self.zoom_level
-        old_width = self.image_label.width()
-        old_height = self.image_label.height()
+        old_width = self.image_view.width()
+        old_height = self.image_view.height()
         old_offset = self.image_offset
         
         # 更新缩放级别
         self.zoom_level = new_zoom
         
-        # 更新缩放滑动条 - 确保传递整数值
+        # 更新缩放滑动条 - 确保传递整数值，不触发滑动条的缩放处理以免重复缩放
+        self.zoom_slider.blockSignals(True)
         self.zoom_slider.setValue(int(self.zoom_level))
+        self.zoom_slider.blockSignals(False)
         
         # 更新缩放级别标签
         self.zoom_level_label.setText(f'{int(self.zoom_level)}%')
         
-        # 如果当前有图片，重新显示以应用新的缩放级别
-        if self.current_index >= 0 and self.current_index < len(self.images):
-            # 重新显示图片
-            img_data = self.images[self.current_index]
-            img = QImage.fromData(img_data)
+        # 如果当前有图片，重新显示以应用新的缩放级别（使用缓存的缩放金字塔，不重新解码）
+        pyramid = self.current_pyramid()
+        if pyramid is not None:
+            self.render_current_image(pyramid, smooth=not interactive)
+            if interactive:
+                self.smooth_zoom_timer.start()
+            else:
+                self.smooth_zoom_timer.stop()
             
-            if not img.isNull():
-                # 使用类变量缓存原始图片，避免重复加载
-                if not hasattr(self, 'current_pixmap') or self.current_pixmap is None:
-                    self.current_pixmap = QPixmap.fromImage(img)
+            # 计算新的图片尺寸
+            new_width = self.image_view.width()
+            new_height = self.image_view.height()
+            
+            # 如果提供了鼠标位置和相对位置比例，则以鼠标位置为中心点进行缩放
+            if mouse_pos is not None and rel_x is not None and rel_y is not None:
+                # 计算缩放比例
+                scale_factor = new_zoom / old_zoom
                 
-                # 根据缩放级别调整图片大小
-                scaled_pixmap = self.current_pixmap.scaled(
-                    int(self.current_pixmap.width() * self.zoom_level / 100),
-                    int(self.current_pixmap.height() * self.zoom_level / 100),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.image_label.setPixmap(scaled_pixmap)
-                self.image_label.adjustSize()  # 调整标签大小以适应图片
+                # 计算鼠标在图片上的相对位置（相对于图片左上角的比例）
+                # 这个比例在缩放前后应该保持不变
+                mouse_rel_x = rel_x
+                mouse_rel_y = rel_y
                 
-                # 计算新的图片尺寸
-                new_width = self.image_label.width()
-                new_height = self.image_label.height()
+                # 计算鼠标在图片上的绝对位置（相对于图片左上角的像素）
+                mouse_x_on_image = mouse_rel_x * old_width
+                mouse_y_on_image = mouse_rel_y * old_height
                 
-                # 如果提供了鼠标位置和相对位置比例，则以鼠标位置为中心点进行缩放
-                if mouse_pos is not None and rel_x is not None and rel_y is not None:
-                    # 计算缩放比例
-                    scale_factor = new_zoom / old_zoom
-                    
-                    # 计算鼠标在图片上的相对位置（相对于图片左上角的比例）
-                    # 这个比例在缩放前后应该保持不变
-                    mouse_rel_x = rel_x
-                    mouse_rel_y = rel_y
-                    
-                    # 计算鼠标在图片上的绝对位置（相对于图片左上角的像素）
-                    mouse_x_on_image = mouse_rel_x * old_width
-                    mouse_y_on_image = mouse_rel_y * old_height
-                    
-                    # 计算缩放后鼠标在图片上的新位置（像素）
-                    new_mouse_x_on_image = mouse_rel_x * new_width
-                    new_mouse_y_on_image = mouse_rel_y * new_height
-                    
-                    # 计算鼠标在窗口中的位置（相对于图片容器左上角）
-                    mouse_x_on_window = mouse_pos.x()
-                    mouse_y_on_window = mouse_pos.y()
-                    
-                    # 计算新的偏移量，保持鼠标指向的图片部分不变
-                    # 新偏移量 = 鼠标在窗口中的位置 - 鼠标在新图片上的位置
-                    new_offset_x = mouse_x_on_window - new_mouse_x_on_image
-                    new_offset_y = mouse_y_on_window - new_mouse_y_on_image
-                    
-                    # 更新图片偏移量，保持鼠标位置不变
-                    new_offset = QPoint(int(new_offset_x), int(new_offset_y))
-                    self.image_offset = new_offset
-                    self.image_label.move(new_offset)
-                else:
-                    # 如果没有提供鼠标位置，则使用旧的偏移量
-                    self.image_offset = old_offset
-                    self.image_label.move(old_offset)
+                # 计算缩放后鼠标在图片上的新位置（像素）
+                new_mouse_x_on_image = mouse_rel_x * new_width
+                new_mouse_y_on_image = mouse_rel_y * new_height
+                
+                # 计算鼠标在窗口中的位置（相对于图片容器左上角）
+                mouse_x_on_window = mouse_pos.x()
+                mouse_y_on_window = mouse_pos.y()
+                
+                # 计算新的偏移量，保持鼠标指向的图片部分不变
+                # 新偏移量 = 鼠标在窗口中的位置 - 鼠标在新图片上的位置
+                new_offset_x = mouse_x_on_window - new_mouse_x_on_image
+                new_offset_y = mouse_y_on_window - new_mouse_y_on_image
+                
+                # 更新图片偏移量，保持鼠标位置不变
+                new_offset = QPoint(int(new_offset_x), int(new_offset_y))
+                self.image_offset = new_offset
+                self.image_view.move(new_offset)
+            else:
+                # 如果没有提供鼠标位置，则使用旧的偏移量
+                self.image_offset = old_offset
+                self.image_view.move(old_offset)
+    
+    def finish_interactive_zoom(self):
+        """连续缩放结束后以平滑缩放重新显示当前图片，图片尺寸不变，位置保持不变"""
+        self.smooth_zoom_timer.stop()
+        pyramid = self.current_pyramid()
+        if pyramid is not None:
+            self.render_current_image(pyramid)
+            self.image_view.move(self.image_offset)
     
     def slider_zoom_changed(self, value):
         """缩放滑动条值改变时的处理函数
@@ -507,7 +605,8 @@ class ImageViewerPanel(QWidget):
         Args:
             value: 新的缩放级别值
         """
-        self.set_zoom_level(value)
+        # 拖动滑动条时按连续缩放处理
+        self.set_zoom_level(value, interactive=self.zoom_slider.isSliderDown())
     
     def wheelEvent(self, event):
         """处理鼠标滚轮事件
@@ -522,13 +621,13 @@ class ImageViewerPanel(QWidget):
             # 获取鼠标相对于图片的位置
             mouse_pos = event.pos()
             
-            # 获取图片标签相对于视图的位置
-            label_pos = self.image_label.pos()
+            # 获取图片组件相对于视图的位置
+            label_pos = self.image_view.pos()
             
             # 计算鼠标相对于图片的位置比例
             # 确保鼠标位置在图片范围内
-            rel_x = max(0, min(1, (mouse_pos.x() - label_pos.x()) / self.image_label.width())) if self.image_label.width() > 0 else 0.5
-            rel_y = max(0, min(1, (mouse_pos.y() - label_pos.y()) / self.image_label.height())) if self.image_label.height() > 0 else 0.5
+            rel_x = max(0, min(1, (mouse_pos.x() - label_pos.x()) / self.image_view.width())) if self.image_view.width() > 0 else 0.5
+            rel_y = max(0, min(1, (mouse_pos.y() - label_pos.y()) / self.image_view.height())) if self.image_view.height() > 0 else 0.5
             
             # 保存旧的缩放级别
             old_zoom = self.zoom_level
@@ -537,7 +636,8 @@ class ImageViewerPanel(QWidget):
             new_zoom = old_zoom * 1.1 if delta > 0 else old_zoom * 0.9
             
             # 设置新的缩放级别，传递鼠标位置和相对比例，以鼠标位置为中心点进行缩放
-            self.set_zoom_level(new_zoom, mouse_pos, rel_x, rel_y)
+            # 滚轮缩放通常连续多次，先快速缩放，停止滚动后再平滑缩放
+            self.set_zoom_level(new_zoom, mouse_pos, rel_x, rel_y, interactive=True)
             
             event.accept()  # 接受事件，防止继续传播
         else:
@@ -556,7 +656,7 @@ class ImageViewerPanel(QWidget):
         """
         # 处理鼠标按下事件，开始拖拽
         if event.type() == event.MouseButtonPress and event.button() == Qt.LeftButton:
-            if obj == self.image_label and self.image_label.pixmap() and not self.image_label.pixmap().isNull():
+            if obj == self.image_view and self.image_view.has_image():
                 self.drag_start_position = event.pos()
                 self.is_dragging = True
                 return True
@@ -569,19 +669,19 @@ class ImageViewerPanel(QWidget):
         
         # 处理鼠标移动事件，实现拖拽
         elif event.type() == event.MouseMove and self.is_dragging and self.drag_start_position:
-            if obj == self.image_label and self.image_label.pixmap() and not self.image_label.pixmap().isNull():
+            if obj == self.image_view and self.image_view.has_image():
                 # 计算拖拽偏移量
                 delta = event.pos() - self.drag_start_position
-                new_pos = self.image_label.pos() + delta
+                new_pos = self.image_view.pos() + delta
                 
                 # 更新图片位置
-                self.image_label.move(new_pos)
+                self.image_view.move(new_pos)
                 self.image_offset = new_pos
                 return True
         
         # 处理鼠标滚轮事件，实现缩放
         elif event.type() == event.Wheel:
-            if obj == self.image_label or obj == self.current_image_widget:
+            if obj == self.image_view or obj == self.current_image_widget:
                 if event.modifiers() == Qt.ControlModifier:
                     # Ctrl+滚轮缩放
                     delta = event.angleDelta().y()
@@ -589,21 +689,21 @@ class ImageViewerPanel(QWidget):
                     # 获取鼠标相对于当前视图的位置
                     mouse_pos = event.pos()
                     
-                    # 如果是在图片标签上滚动，需要调整鼠标位置
-                    if obj == self.image_label:
-                        # 鼠标位置已经是相对于图片标签的
+                    # 如果是在图片组件上滚动，需要调整鼠标位置
+                    if obj == self.image_view:
+                        # 鼠标位置已经是相对于图片组件的
                         pass
                     else:
-                        # 鼠标位置是相对于父容器的，需要减去图片标签的位置偏移
-                        mouse_pos = event.pos() - self.image_label.pos()
+                        # 鼠标位置是相对于父容器的，需要减去图片组件的位置偏移
+                        mouse_pos = event.pos() - self.image_view.pos()
                     
-                    # 获取图片标签相对于视图的位置
-                    label_pos = self.image_label.pos()
+                    # 获取图片组件相对于视图的位置
+                    label_pos = self.image_view.pos()
                     
                     # 计算鼠标相对于图片的位置比例
                     # 确保鼠标位置在图片范围内
-                    rel_x = max(0, min(1, (mouse_pos.x() - (0 if obj == self.image_label else 0)) / self.image_label.width())) if self.image_label.width() > 0 else 0.5
-                    rel_y = max(0, min(1, (mouse_pos.y() - (0 if obj == self.image_label else 0)) / self.image_label.height())) if self.image_label.height() > 0 else 0.5
+                    rel_x = max(0, min(1, (mouse_pos.x() - (0 if obj == self.image_view else 0)) / self.image_view.width())) if self.image_view.width() > 0 else 0.5
+                    rel_y = max(0, min(1, (mouse_pos.y() - (0 if obj == self.image_view else 0)) / self.image_view.height())) if self.image_view.height() > 0 else 0.5
                     
                     # 保存旧的缩放级别
                     old_zoom = self.zoom_level
@@ -611,8 +711,8 @@ class ImageViewerPanel(QWidget):
                     # 计算新的缩放级别
                     new_zoom = old_zoom * 1.1 if delta > 0 else old_zoom * 0.9
                     
-                    # 设置新的缩放级别
-                    self.set_zoom_level(new_zoom, mouse_pos, rel_x, rel_y)
+                    # 设置新的缩放级别，滚轮缩放时先快速缩放，停止滚动后再平滑缩放
+                    self.set_zoom_level(new_zoom, mouse_pos, rel_x, rel_y, interactive=True)
                     
                     event.accept()  # 接受事件，防止继续传播
                     return True
@@ -654,7 +754,7 @@ class ImageViewerPanel(QWidget):
                 # 由于已经添加了wheelEvent方法直接处理Ctrl+滚轮事件
                 # 这里只处理非Ctrl+滚轮的图片切换功能
                 # 当鼠标在图片查看区域内时
-                if obj == self.current_image_widget or obj == self.image_label:
+                if obj == self.current_image_widget or obj == self.image_view:
                     delta = event.angleDelta().y()
                     if delta > 0:
                         # 向上滚动，显示上一张图片
@@ -671,19 +771,13 @@ class ImageViewerPanel(QWidget):
         """将图片缩放到适合当前查看区域大小
         使图片完全显示在查看区域内，不需要滚动即可查看整个图片
         """
-        if not self.images or self.current_index < 0 or self.current_index >= len(self.images):
-            return
-        
-        # 获取当前图片数据
-        img_data = self.images[self.current_index]
-        img = QImage.fromData(img_data)
-        
-        if img.isNull():
+        pyramid = self.current_pyramid()
+        if pyramid is None:
             return
         
         # 获取图片原始尺寸
-        img_width = img.width()
-        img_height = img.height()
+        img_width = pyramid.width
+        img_height = pyramid.height
         
         # 获取查看区域的尺寸
         view_width = self.current_image_scroll.width() - 20  # 减去滚动条宽度
@@ -707,4 +801,4 @@ class ImageViewerPanel(QWidget):
         
         # 重置图片偏移量，使图片居中显示
         self.image_offset = QPoint(0, 0)
-        self.image_label.move(self.image_offset)
\ No newline at end of file
+        self.image_view.move(self.image_offset)
\ No newline at end of file
@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QSizePolicy, QScrollArea, QTextBrowser
-from PyQt5.QtCore import Qt, QSize, QEvent, QTimer, QRect, QMargins
-from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QBrush, QFont, QTextOption, QTextDocument, QFontMetrics
+from PyQt5.QtCore import Qt, QSize, QEvent, QRect, QMargins
+from PyQt5.QtGui import QColor, QPainter, QPainterPath, QPen, QBrush, QFont, QTextOption
+from gui.text_measure import TextMeasureService
 
 class ImprovedChatBubbleWidget(QWidget):
     """改进的聊天气泡组件，用于显示聊天消息"""
@@ -71,8 +72,7 @@ class ImprovedChatBubble(QWidget):
         super().__init__(parent)
         self.text = text
         self.is_user = is_user
-        self.doc = QTextDocument()
-        self.doc.setHtml(self.text)
+        self.text_measure = TextMeasureService()
         self.initUI()
     
     def initUI(self):
@@ -115,69 +115,46 @@ class ImprovedChatBubble(QWidget):
         # 设置气泡颜色
         self.bubble_color = QColor("#2B5B84") if self.is_user else QColor("#333333")
         
-        # 添加文档大小变化的连接，确保气泡大小随内容变化
-        self.text_browser.document().contentsChanged.connect(self.adjust_size)
-        
-        # 初始化时立即调整大小
-        QTimer.singleShot(0, self.adjust_size)
+        # 初始化后在下一帧调整大小
+        self.text_measure.schedule_layout(self.adjust_size)
     
     def adjust_size(self):
-        """根据内容调整气泡大小"""
-        # 获取字体度量
-        font_metrics = QFontMetrics(self.text_browser.font())
-        line_height = font_metrics.lineSpacing()
-        
-        # 获取实际行数
-        line_count = self.text_browser.document().lineCount()
-        
-        # 计算内容高度（包含边距）
-        content_height = line_count * line_height
+        """根据内容调整气泡大小，文本高度由文本测量服务计算并缓存"""
+        width = self.text_browser.viewport().width()
+        content_height = self.text_measure.text_height(self.text, width, self.text_browser.font(), rich=True)
+        if content_height <= 0:
+            # 尚未完成布局，等大小变化时再调整
+            return
         
         # 获取文本浏览器的内边距
         margins = self.text_browser.contentsMargins()
         margin_height = margins.top() + margins.bottom()
         
-        # 设置最终高度（内容高度+边距+5px余量）
-        height = content_height + margin_height + 5
-        
-        # 设置最小高度保证可视性
-        min_height = 30
-        self.text_browser.setMinimumHeight(min_height)
+        # 最终高度（内容高度+边距+5px余量），最小30像素保证可视性
+        height = max(30, content_height + margin_height + 5)
+        if height == self.text_browser.height():
+            return
+        self.text_browser.setFixedHeight(height)
         
-        # 应用计算高度
-        if height > min_height:
-            self.text_browser.setFixedHeight(height)
-        
-        # 强制文本浏览器重新计算内容大小
-        self.text_browser.document().adjustSize()
-        
-        # 更新布局
+        # 更新布局，父组件的布局会随之更新
         self.updateGeometry()
         
-        # 确保父组件也更新布局
-        parent = self.parent()
-        while parent:
-            parent.updateGeometry()
-            parent = parent.parent()
-        
-        # 强制更新滚动区域，确保当前气泡可见
+        # 确保当前气泡可见
         top_level = self.window()
         if hasattr(top_level, 'scroll_area'):
             top_level.scroll_area.ensureWidgetVisible(self)
-            # 强制刷新滚动区域
-            top_level.scroll_area.update()
     
     def resizeEvent(self, event):
         """大小变化事件"""
         super().resizeEvent(event)
-        # 当组件大小变化时，重新调整大小
-        QTimer.singleShot(0, self.adjust_size)
+        # 当组件大小变化时，在下一帧重新调整大小
+        self.text_measure.schedule_layout(self.adjust_size)
     
     def showEvent(self, event):
         """显示事件"""
         super().showEvent(event)
-        # 当组件显示时，重新调整大小
-        QTimer.singleShot(0, self.adjust_size)
+        # 当组件显示时，在下一帧重新调整大小
+        self.text_measure.schedule_layout(self.adjust_size)
     
     def paintEvent(self, event):
         """绘制气泡背景"""
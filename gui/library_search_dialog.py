@@ -0,0 +1,173 @@
+import os
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QListWidget,
+                             QListWidgetItem, QLabel)
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from core.logger import logger
+from services.cache_service import CacheService
+from services.library_index import LibraryIndex
+from utils.fingerprint import FingerprintIndex
+
+
+class LibraryIndexWorker(QThread):
+    """文献库预建索引线程，为文献库目录下所有尚未索引的PDF建立全文索引"""
+
+    progress = pyqtSignal(int, int, str)  # 已处理数量, 总数量, 当前文件路径
+
+    def __init__(self, root_path, page_extractor, parent=None):
+        super().__init__(parent)
+        self.root_path = root_path
+        self.page_extractor = page_extractor  # 与阅读器共用的页面提取器，复用其进程池
+        self._cancelled = False
+
+    def cancel(self):
+        """取消预建索引，当前文件处理完成后停止"""
+        self._cancelled = True
+
+    def run(self):
+        pdf_files = []
+        for root, _, files in os.walk(self.root_path):
+            pdf_files.extend(os.path.join(root, name) for name in files if name.lower().endswith('.pdf'))
+
+        library_index = LibraryIndex()
+        cache_service = CacheService()
+        fingerprint_index = FingerprintIndex()
+        page_extractor = self.page_extractor
+        for i, file_path in enumerate(pdf_files):
+            if self._cancelled:
+                break
+            self.progress.emit(i, len(pdf_files), file_path)
+            try:
+                md5 = fingerprint_index.get_md5(file_path)
+                if not md5 or library_index.is_indexed(md5, file_path):
+                    continue
+                if cache_service.check_cache_exists(md5):
+                    # 已有缓存时直接使用缓存中的页面文本
+                    pack = cache_service.get_cache_pack(md5)
+                    pages = pack.read_pages()
+                    title = pack.metadata().get('title', '')
+                else:
+                    import fitz
+                    with fitz.open(file_path) as doc:
+                        total_pages = doc.page_count
+                        title = (doc.metadata or {}).get('title', '')
+                    # 没有缓存时只提取页面文本，不为未打开的文献生成缓存
+                    pages = [text for _, text, _ in
+                             page_extractor.iter_pages(file_path, total_pages, with_images=False)]
+                library_index.add_document(md5, file_path, title or os.path.basename(file_path), pages)
+            except Exception as e:
+                logger.error(f"预建文献库索引失败: {file_path}, 错误: {str(e)}")
+        self.progress.emit(len(pdf_files), len(pdf_files), '')
+
+
+class LibrarySearchDialog(QDialog):
+    """文献库搜索对话框，在所有已索引的文献中按相关度搜索"""
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.library_index = LibraryIndex()
+        self.index_worker = None
+        self.setWindowTitle('文献库搜索')
+        self.resize(700, 500)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        # 搜索输入区域
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('输入要在文献库中搜索的内容')
+        self.search_input.returnPressed.connect(self.search)
+        search_layout.addWidget(self.search_input)
+
+        search_btn = QPushButton('搜索')
+        search_btn.clicked.connect(self.search)
+        search_layout.addWidget(search_btn)
+
+        self.index_btn = QPushButton('索引文献库')
+        self.index_btn.clicked.connect(self.build_library_index)
+        search_layout.addWidget(self.index_btn)
+        layout.addLayout(search_layout)
+
+        self.status_label = QLabel('')
+        layout.addWidget(self.status_label)
+
+        # 搜索结果列表
+        self.result_list = QListWidget()
+        self.result_list.setWordWrap(True)
+        self.result_list.itemDoubleClicked.connect(self.open_result)
+        layout.addWidget(self.result_list)
+
+    def search(self):
+        """执行搜索并显示结果"""
+        query = self.search_input.text().strip()
+        if not query:
+            return
+        logger.info(f"文献库搜索: {query}")
+        self.result_list.clear()
+        try:
+            results = self.library_index.search(query)
+        except Exception as e:
+            logger.error(f"文献库搜索失败: {str(e)}")
+            self.status_label.setText(f'搜索失败: {str(e)}')
+            return
+
+        for result in results:
+            item = QListWidgetItem(f"{result['title']} - 第{result['page'] + 1}页\n{result['text']}")
+            item.setToolTip(result['file_path'])
+            item.setData(Qt.UserRole, result)
+            self.result_list.addItem(item)
+        self.status_label.setText(f'搜索 "{query}" 共找到{len(results)}个结果')
+
+    def open_result(self, item):
+        """打开搜索结果对应的文献并定位到所在页
+
+        Args:
+            item: 双击的结果项
+        """
+        result = item.data(Qt.UserRole)
+        reader_panel = self.main_window.reader_panel
+        page_num = result['page'] + 1
+        if reader_panel.current_file_path == result['file_path']:
+            reader_panel.scroll_to_page(page_num)
+            return
+
+        def on_load_finished(file_path, success):
+            reader_panel.load_finished.disconnect(on_load_finished)
+            if success and file_path == result['file_path']:
+                reader_panel.scroll_to_page(page_num)
+
+        reader_panel.load_finished.connect(on_load_finished)
+        reader_panel.load_pdf(result['file_path'])
+
+    def build_library_index(self):
+        """为当前文献库目录下的所有PDF预建索引"""
+        root_path = self.main_window.config_manager.last_library_path
+        if not root_path or not os.path.isdir(root_path):
+            self.status_label.setText('请先通过"文件 - 打开文献库"选择文献库目录')
+            return
+        if self.index_worker is not None and self.index_worker.isRunning():
+            return
+
+        logger.info(f"开始预建文献库索引: {root_path}")
+        self.index_btn.setEnabled(False)
+        self.index_worker = LibraryIndexWorker(root_path, self.main_window.reader_panel.pdf_manager.page_extractor,
+                                               self)
+        self.index_worker.progress.connect(self.on_index_progress)
+        self.index_worker.finished.connect(lambda: self.index_btn.setEnabled(True))
+        self.index_worker.start()
+
+    def on_index_progress(self, done, total, file_path):
+        """显示预建索引进度"""
+        if file_path:
+            self.status_label.setText(f'正在索引 ({done + 1}/{total}): {os.path.basename(file_path)}')
+        else:
+            self.status_label.setText(f'文献库索引完成，共{total}个文件')
+
+    def done(self, result):
+        # 关闭对话框时停止预建索引
+        if self.index_worker is not None and self.index_worker.isRunning():
+            self.index_worker.cancel()
+            self.index_worker.wait()
+        super().done(result)
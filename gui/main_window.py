@@ -8,6 +8,7 @@ from .chat_list_panel import ChatListPanel
 from .image_viewer_panel import ImageViewerPanel
 from .menu_manager import MenuManager
 from conf.config_manager import ConfigManager
+from services.llm_service import LLMService
 from core import vars
 from core.logger import logger
 
@@ -111,6 +112,11 @@ class MainWindow(QMainWindow):
         # 添加文件选择功能
         self.file_panel.file_selected.connect(self.on_file_selected)
         
+        # 后台加载PDF的进度和结果
+        self.reader_panel.load_started.connect(self.on_pdf_load_started)
+        self.reader_panel.load_progress.connect(self.on_pdf_load_progress)
+        self.reader_panel.load_finished.connect(self.on_pdf_load_finished)
+        
         # 从配置中加载上次的文献库路径
         last_library = self.config_manager.last_library_path
         if last_library:
@@ -137,9 +143,34 @@ class MainWindow(QMainWindow):
             file_path: 选中的文件路径
         """
         logger.info(f"选择文件: {file_path}")
-        # 加载PDF文件
-        result = self.reader_panel.load_pdf(file_path)
+        # 在后台加载PDF文件，正在加载的其他文件会被取消
+        self.reader_panel.load_pdf(file_path)
+    
+    def on_pdf_load_started(self, file_path):
+        """处理PDF后台加载开始事件，加载期间禁用重建缓存菜单项
         
+        Args:
+            file_path: PDF文件路径
+        """
+        self.menu_manager.rebuild_cache_action.setEnabled(False)
+    
+    def on_pdf_load_progress(self, page_num, total_pages):
+        """处理PDF后台加载进度
+        
+        Args:
+            page_num: 已提取的页数
+            total_pages: 总页数
+        """
+        self.statusBar().showMessage(f"正在加载: {page_num}/{total_pages} 页")
+    
+    def on_pdf_load_finished(self, file_path, result):
+        """处理PDF后台加载完成事件
+        
+        Args:
+            file_path: PDF文件路径
+            result: 是否加载成功
+        """
+        self.statusBar().clearMessage()
         # 如果PDF加载成功，启用重建缓存菜单项
         if result:
             logger.debug("PDF加载成功，启用重建缓存菜单项")
@@ -157,6 +188,15 @@ class MainWindow(QMainWindow):
     
     def closeEvent(self, event):
         logger.info("应用程序关闭，保存配置")
+        # 停止正在进行的PDF加载
+        self.reader_panel.cancel_loading()
+        # 取消尚未开始的LLM请求
+        LLMService().shutdown()
+        # 取消尚未开始的缩略图生成
+        self.image_viewer_panel.thumbnail_loader.shutdown()
+        # 关闭页面提取进程池
+        self.reader_panel.pdf_manager.page_extractor.shutdown()
+        
         # 保存窗口几何信息
         geometry = self.geometry()
         window_geometry = {
@@ -1,3 +1,4 @@
+import os
 from PyQt5.QtWidgets import QAction, QInputDialog, QFileDialog, QMessageBox, QHBoxLayout
 from PyQt5.QtCore import Qt
 from core import vars
@@ -86,10 +87,18 @@ class MenuManager:
         search_action.triggered.connect(self.search_text)
         tools_menu.addAction(search_action)
         
+        library_search_action = QAction('文献库搜索', self.main_window)
+        library_search_action.triggered.connect(self.search_library)
+        tools_menu.addAction(library_search_action)
+        
         translate_action = QAction('翻译选中文本', self.main_window)
         translate_action.triggered.connect(self.translate_text)
         tools_menu.addAction(translate_action)
         
+        translate_document_action = QAction('翻译全文', self.main_window)
+        translate_document_action.triggered.connect(self.translate_document)
+        tools_menu.addAction(translate_document_action)
+        
         # 帮助菜单
         help_menu = menubar.addMenu('帮助')
         
@@ -117,30 +126,36 @@ class MenuManager:
         file_path, _ = QFileDialog.getOpenFileName(self.main_window, "选择PDF文件", "", "PDF文件 (*.pdf)")
         if file_path:
             logger.info(f"选择单个PDF文件: {file_path}")
-            result = self.main_window.reader_panel.load_pdf(file_path)
-            # 如果PDF加载成功，启用重建缓存菜单项
-            if result:
-                logger.debug("PDF加载成功，启用重建缓存菜单项")
-                self.rebuild_cache_action.setEnabled(True)
-            else:
-                logger.warning(f"PDF加载失败: {file_path}")
+            # 在后台加载，加载结果由主窗口的on_pdf_load_finished处理
+            self.main_window.reader_panel.load_pdf(file_path)
     
     def rebuild_pdf_cache(self):
-        """重建当前PDF文件的缓存"""
+        """在后台重建当前PDF文件的缓存"""
+        reader_panel = self.main_window.reader_panel
+        if reader_panel.is_loading:
+            QMessageBox.information(self.main_window, '重建缓存', 'PDF文件正在加载，请在加载完成后重试。')
+            return
         # 确认是否要重建缓存
         reply = QMessageBox.question(self.main_window, '确认重建缓存', 
                                     '确定要重建当前PDF文件的缓存吗？这将重新提取PDF内容。',
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
             logger.info("用户确认重建PDF缓存")
-            # 调用PDF管理器的重建缓存方法
-            result = self.main_window.reader_panel.pdf_manager.rebuild_cache()
-            if result:
-                logger.info("PDF缓存重建成功")
-                QMessageBox.information(self.main_window, '重建缓存成功', '已成功重建PDF文件的缓存。')
-            else:
-                logger.error("PDF缓存重建失败")
-                QMessageBox.warning(self.main_window, '重建缓存失败', '重建PDF文件缓存失败，请检查日志获取详细信息。')
+            
+            def on_load_finished(file_path, result):
+                reader_panel.load_finished.disconnect(on_load_finished)
+                if result:
+                    logger.info("PDF缓存重建成功")
+                    QMessageBox.information(self.main_window, '重建缓存成功', '已成功重建PDF文件的缓存。')
+                else:
+                    logger.error("PDF缓存重建失败")
+                    QMessageBox.warning(self.main_window, '重建缓存失败', '重建PDF文件缓存失败，请检查日志获取详细信息。')
+            
+            # 在后台线程中重新提取并加载，结果由on_load_finished处理
+            reader_panel.load_finished.connect(on_load_finished)
+            if not reader_panel.rebuild_cache():
+                reader_panel.load_finished.disconnect(on_load_finished)
+                QMessageBox.warning(self.main_window, '重建缓存失败', '当前没有可以重建缓存的PDF文件。')
     
     def copy_text(self):
         """复制选中的文本
@@ -253,6 +268,48 @@ class MenuManager:
                 logger.info("未找到搜索结果")
                 QMessageBox.information(self.main_window, '搜索结果', f'未找到匹配文本 "{text}"')
     
+    def search_library(self):
+        """打开文献库搜索对话框"""
+        from gui.library_search_dialog import LibrarySearchDialog
+        
+        logger.info("打开文献库搜索对话框")
+        if not hasattr(self, 'library_search_dialog'):
+            self.library_search_dialog = LibrarySearchDialog(self.main_window)
+        self.library_search_dialog.show()
+        self.library_search_dialog.raise_()
+    
+    def translate_document(self):
+        """在后台翻译当前文档的全文"""
+        from gui.document_translate_dialog import DocumentTranslateDialog
+        from services.llm_service import LLMService
+        
+        reader_panel = self.main_window.reader_panel
+        text_store = reader_panel.pdf_manager.text_store
+        if reader_panel.is_loading or text_store is None or text_store.page_count == 0:
+            QMessageBox.information(self.main_window, '翻译全文', '请先打开并等待PDF文件加载完成')
+            return
+        
+        languages = ['英语', '中文', '日语', '法语', '德语', '西班牙语', '俄语']
+        target_lang, ok = QInputDialog.getItem(self.main_window, '选择目标语言',
+                                               '请选择要翻译成的语言:', languages, 1, False)
+        if not ok or not target_lang:
+            return
+        
+        config_manager = self.main_window.config_manager
+        translate_config = config_manager.translate_llm_config
+        api_key = translate_config.get('api_key', '') or config_manager.api_key
+        if not api_key:
+            QMessageBox.warning(self.main_window, '翻译失败', '请先在设置中配置API密钥。')
+            return
+        llm_client = LLMService().get_client('translate', translate_config.get('api_url', ''), api_key)
+        
+        pages = [text_store.page_text(i) for i in range(text_store.page_count)]
+        title = os.path.splitext(os.path.basename(reader_panel.current_file_path or ''))[0]
+        logger.info(f"开始翻译全文，共{len(pages)}页，目标语言: {target_lang}")
+        dialog = DocumentTranslateDialog(self.main_window, llm_client, target_lang, pages, title)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+    
     def translate_text(self):
         """翻译选中文本"""
         from PyQt5.QtWidgets import QApplication
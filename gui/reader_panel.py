@@ -1,20 +1,37 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QTextBrowser, QScrollArea, QSlider, QInputDialog, QMenu, QAction
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QTextCursor
 from pdf.pdf_manager import PDFManager
+from pdf.pdf_loader import ObserverBridge, PDFLoadWorker
+from utils.fingerprint import FingerprintIndex
+from llm.llm_worker import LLMRequest
+from services.llm_service import LLMService
+from services.translation_cache import TranslationCache, TRANSLATE_PROMPT, TRANSLATE_MODEL
 from core.logger import logger
 import io
 
 class ReaderPanel(QWidget):
+    load_started = pyqtSignal(str)  # 后台加载开始：文件路径
+    load_progress = pyqtSignal(int, int)  # 后台加载进度：已提取页数, 总页数
+    load_finished = pyqtSignal(str, bool)  # 后台加载完成：文件路径, 是否成功
+    
     def __init__(self):
         super().__init__()
         logger.debug("初始化阅读器面板")
         self.pdf_manager = PDFManager()
+        self.fingerprint_index = FingerprintIndex()
+        self.pending_requests = []  # 正在进行的LLM请求
         self.zoom_level = 100  # 默认缩放级别为100%
         self.current_file_md5 = None  # 添加当前文件MD5变量
+        self.current_file_path = None  # 当前已加载的文件路径
+        self.load_worker = None  # 后台加载线程
+        self.is_loading = False  # 是否正在后台加载
+        self.pending_file_path = None  # 取消当前加载后等待加载的文件路径
         self.initUI()
-        # 将自身注册为PDF管理器的观察者
-        self.pdf_manager.add_observer(self)
+        # 通过信号桥注册为PDF管理器的观察者，使后台线程发出的通知在GUI线程中处理
+        self.observer_bridge = ObserverBridge(self)
+        self.observer_bridge.event_received.connect(self.update)
+        self.pdf_manager.add_observer(self.observer_bridge)
         # 初始化文本浏览器的字体大小
         self.update_text_font_size()
         # 添加键盘事件过滤器
@@ -79,7 +96,33 @@ class ReaderPanel(QWidget):
             event_type: 事件类型
             data: 事件数据
         """
-        if event_type == 'pdf_loaded':
+        if event_type in ('pdf_loading', 'page_extracted', 'pdf_loaded') \
+                and self.load_worker is not None and self.load_worker.is_cancelled:
+            # 忽略已取消的加载中尚未处理的通知
+            return
+        
+        if event_type == 'pdf_loading':
+            # 逐页加载开始，清除之前的内容并显示元数据
+            self.text_browser.clear()
+            metadata = data['metadata']
+            if metadata:
+                meta_text = "\n\n文档信息:\n"
+                for key, value in metadata.items():
+                    if value:
+                        meta_text += f"{key}: {value}\n"
+                self.text_browser.append(meta_text)
+        
+        elif event_type == 'page_extracted':
+            # 逐页追加文本内容，无需等待整个文档提取完成
+            self.append_page_text(data['page_num'], data['text'])
+        
+        elif event_type == 'pdf_loaded' and data.get('streamed', False):
+            # 页面文本已逐页显示，只需将图片数据和缩略图传递给图片查看器面板
+            main_window = self.window()
+            if main_window and hasattr(main_window, 'image_viewer_panel'):
+                main_window.image_viewer_panel.set_images(data.get('images', []), data.get('thumbnails'))
+        
+        elif event_type == 'pdf_loaded':
             # 显示元数据
             metadata = data['metadata']
             if metadata:
@@ -120,6 +163,30 @@ class ReaderPanel(QWidget):
             # 只更新文本字体大小，不重新加载图片
             self.update_text_font_size()
     
+    def append_page_text(self, page_num, text):
+        """在文本末尾追加一页内容，不改变当前的滚动位置
+        
+        Args:
+            page_num: 页码（从1开始）
+            text: 页面文本
+        """
+        cursor = QTextCursor(self.text_browser.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(f"\n--- 第 {page_num} 页 ---\n\n{text}")
+    
+    def scroll_to_page(self, page_num):
+        """滚动到指定页面的开头
+        
+        Args:
+            page_num: 页码（从1开始）
+        """
+        cursor = self.text_browser.document().find(f"--- 第 {page_num} 页 ---")
+        if cursor.isNull():
+            logger.warning(f"未找到页面: {page_num}")
+            return
+        self.text_browser.setTextCursor(cursor)
+        self.text_browser.ensureCursorVisible()
+    
     def eventFilter(self, obj, event):
         if event.type() == event.KeyPress and event.key() == Qt.Key_Control:
             self.is_ctrl_zooming = True
@@ -225,94 +292,163 @@ class ReaderPanel(QWidget):
             QMessageBox.warning(self, '翻译失败', '无法访问配置管理器。')
             return
         
-        try:
-            # 构建翻译提示
-            prompt = f"请将以下文本翻译成{target_lang}，只返回翻译结果，不要包含原文或解释：\n\n{selected_text}"
-            
-            # 使用LLM进行翻译
-            from llm.llm_handler import LLMClient
-            
-            # 获取翻译配置
-            translate_config = main_window.config_manager.translate_llm_config
-            api_key = translate_config.get('api_key', '') or main_window.config_manager.api_key
-            api_url = translate_config.get('api_url', '')
-            
-            if not api_key:
-                QMessageBox.warning(self, '翻译失败', '请先在设置中配置API密钥。')
-                return
-            
-            # 创建LLM客户端
-            llm_client = LLMClient(api_key=api_key, api_url=api_url, client_type='translate')
-            
-            # 显示等待提示
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            
-            # 发送翻译请求
-            messages = [{"role": "user", "content": prompt}]
-            response = llm_client.chat_completion(messages, temperature=0.3)
-            
-            # 恢复光标
-            QApplication.restoreOverrideCursor()
-            
-            # 提取翻译结果
-            if response and 'choices' in response and len(response['choices']) > 0:
-                translation = response['choices'][0]['message']['content'].strip()
-                
-                # 显示翻译结果
-                from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton
-                
-                dialog = QDialog(self)
-                dialog.setWindowTitle('翻译结果')
-                dialog.resize(500, 300)
-                
-                layout = QVBoxLayout(dialog)
-                
-                result_text = QTextEdit()
-                result_text.setReadOnly(True)
-                result_text.setText(translation)
-                layout.addWidget(result_text)
-                
-                copy_btn = QPushButton('复制结果')
-                copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(translation))
-                layout.addWidget(copy_btn)
-                
-                dialog.setLayout(layout)
-                dialog.exec_()
-            else:
-                QMessageBox.warning(self, '翻译失败', '无法获取翻译结果，请稍后再试。')
+        # 翻译缓存命中时直接显示，不访问网络
+        cached = TranslationCache().get(selected_text, target_lang)
+        if cached is not None:
+            logger.info(f"翻译缓存命中，目标语言: {target_lang}")
+            self.show_translation(cached)
+            return
         
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
-            QMessageBox.warning(self, '翻译失败', f'翻译过程中发生错误: {str(e)}')
-            import traceback
-            traceback.print_exc()
-            # 修复了这里的语法错误
-            # QMessageBox.warning(self, '翻译失败', '请先在设置中
+        # 构建翻译提示
+        prompt = TRANSLATE_PROMPT.format(target_lang=target_lang, text=selected_text)
+        
+        # 获取翻译配置
+        translate_config = main_window.config_manager.translate_llm_config
+        api_key = translate_config.get('api_key', '') or main_window.config_manager.api_key
+        api_url = translate_config.get('api_url', '')
+        
+        if not api_key:
+            QMessageBox.warning(self, '翻译失败', '请先在设置中配置API密钥。')
+            return
+        
+        # 获取共享的LLM客户端
+        llm_client = LLMService().get_client('translate', api_url, api_key)
+        
+        # 在LLM服务的线程池中发送翻译请求，界面不等待结果
+        messages = [{"role": "user", "content": prompt}]
+        request = LLMRequest(self)
+        request.completed.connect(lambda response: self.on_translation_received(selected_text, target_lang, response))
+        request.failed.connect(lambda error: QMessageBox.warning(self, '翻译失败', f'翻译过程中发生错误: {error}'))
+        request.finished.connect(lambda: self.pending_requests.remove(request))
+        request.finished.connect(request.deleteLater)
+        self.pending_requests.append(request)
+        request.attach(LLMService().chat_completion(llm_client, messages, model=TRANSLATE_MODEL, temperature=0.3))
+        logger.info(f"已提交翻译请求，目标语言: {target_lang}")
+    
+    def on_translation_received(self, source_text, target_lang, response):
+        """保存并显示翻译结果
+        
+        Args:
+            source_text: 源文本
+            target_lang: 目标语言
+            response: LLM模型的响应
+        """
+        from PyQt5.QtWidgets import QMessageBox
+        
+        # 提取翻译结果
+        if not response or 'choices' not in response or len(response['choices']) == 0:
+            QMessageBox.warning(self, '翻译失败', '无法获取翻译结果，请稍后再试。')
+            return
+        translation = response['choices'][0]['message']['content'].strip()
+        TranslationCache().put(source_text, target_lang, translation)
+        self.show_translation(translation)
+    
+    def show_translation(self, translation):
+        """显示翻译结果
+        
+        Args:
+            translation: 翻译结果
+        """
+        from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout, QTextEdit, QPushButton
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle('翻译结果')
+        dialog.resize(500, 300)
+        
+        layout = QVBoxLayout(dialog)
+        
+        result_text = QTextEdit()
+        result_text.setReadOnly(True)
+        result_text.setText(translation)
+        layout.addWidget(result_text)
+        
+        copy_btn = QPushButton('复制结果')
+        copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(translation))
+        layout.addWidget(copy_btn)
+        
+        dialog.setLayout(layout)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
     
     def load_pdf(self, file_path):
-        # 计算新文件的MD5值
-        new_pdf_md5 = self.pdf_manager.cache_manager.get_pdf_md5(file_path)
-        if not new_pdf_md5:
-            logger.error(f"计算PDF文件MD5值失败: {file_path}")
-            return False
+        """在后台线程中加载PDF文件
+        
+        如果已有文件正在加载，则取消该加载，并在其停止后加载新文件。
+        
+        Args:
+            file_path: PDF文件路径
             
-        # 检查是否正在打开相同的文件
-        if self.current_file_md5 == new_pdf_md5:
+        Returns:
+            bool: 是否已开始（或安排）加载
+        """
+        if self.is_loading:
+            if file_path == self.load_worker.file_path and not self.load_worker.is_cancelled:
+                logger.info(f"文件正在加载，跳过重复请求: {file_path}")
+                return True
+            # 取消正在进行的加载，待其停止后再加载新文件
+            self.load_worker.cancel()
+            self.pending_file_path = file_path
+            return True
+        
+        # 检查是否正在打开相同的文件，只查询指纹索引而不读取文件内容，
+        # 文件内容有变化时查询不到记录，会重新加载
+        if self.current_file_md5 and self.fingerprint_index.lookup(file_path) == self.current_file_md5:
             logger.info(f"文件已经打开，跳过加载: {file_path}")
             return True
-            
-        # 保存新文件的MD5值
-        self.current_file_md5 = new_pdf_md5
         
+        self.start_loading(file_path)
+        return True
+    
+    def rebuild_cache(self):
+        """在后台线程中重建当前PDF文件的缓存并重新加载
+        
+        Returns:
+            bool: 是否已开始重建，正在加载或没有打开的文件时返回False
+        """
+        if self.is_loading or not self.current_file_path:
+            logger.warning("无法重建缓存: 正在加载或没有打开的PDF文件")
+            return False
+        self.start_loading(self.current_file_path, force_rebuild=True)
+        return True
+    
+    def start_loading(self, file_path, force_rebuild=False):
+        """启动后台加载线程
+        
+        Args:
+            file_path: PDF文件路径
+            force_rebuild: 是否忽略已有缓存，重新提取内容并重建缓存
+        """
         # 重置UI状态
+        self.current_file_path = None
+        self.current_file_md5 = None
         self.text_browser.clear()
         self.clear_images()
         
         logger.info(f"阅读器面板开始加载PDF文件: {file_path}")
-        result = self.pdf_manager.load_pdf(file_path)
+        self.is_loading = True
+        self.load_worker = PDFLoadWorker(self.pdf_manager, file_path, self, force_rebuild=force_rebuild)
+        self.load_worker.progress.connect(self.load_progress)
+        self.load_worker.load_finished.connect(self.on_load_finished)
+        self.load_worker.finished.connect(self.load_worker.deleteLater)
+        # 加载线程作为观察者，用于报告提取进度
+        self.pdf_manager.add_observer(self.load_worker)
+        self.load_worker.start()
+        self.load_started.emit(file_path)
+    
+    def on_load_finished(self, file_path, result):
+        """处理后台加载完成
+        
+        Args:
+            file_path: PDF文件路径
+            result: 是否加载成功
+        """
+        self.pdf_manager.remove_observer(self.load_worker)
+        self.is_loading = False
         
         # 如果PDF加载成功，设置窗口标题为PDF标题 - LLMReader
         if result:
+            self.current_file_path = file_path
+            self.current_file_md5 = self.pdf_manager.current_pdf_md5
             # 获取PDF元数据
             metadata = self.pdf_manager.pdf_reader.get_metadata()
             # 获取标题，如果没有标题则使用文件名
@@ -326,11 +462,25 @@ class ReaderPanel(QWidget):
             main_window = self.window()
             if main_window:
                 main_window.setWindowTitle(f'{title} - LLMReader')
+        elif self.load_worker.is_cancelled:
+            logger.info(f"阅读器面板已取消加载PDF文件: {file_path}")
         else:
             logger.warning(f"阅读器面板加载PDF文件失败: {file_path}")
-            self.current_file_md5 = None  # 加载失败时重置MD5值
         
-        return result
+        self.load_finished.emit(file_path, result)
+        
+        # 加载被取消后等待加载的文件
+        if self.pending_file_path:
+            pending_file_path = self.pending_file_path
+            self.pending_file_path = None
+            self.start_loading(pending_file_path)
+    
+    def cancel_loading(self):
+        """取消正在进行的加载并等待加载线程结束，在窗口关闭时调用"""
+        self.pending_file_path = None
+        if self.is_loading:
+            self.load_worker.cancel()
+            self.load_worker.wait()
     
     # 图片处理功能已移至独立的ImageViewerPanel
     
@@ -346,32 +496,15 @@ class ReaderPanel(QWidget):
         if not self.pdf_manager.pdf_reader.doc or not self.pdf_manager.is_cached:
             return
         
-        # 收集所有图片数据
-        all_images = []
-        
-        # 从缓存中读取图片
-        import os
-        
-        # 获取缓存中的图片路径列表
-        cache_dir = self.pdf_manager.cache_manager.get_cache_dir(self.pdf_manager.current_pdf_md5)
-        img_dir = os.path.join(cache_dir, 'img')
-        
-        if os.path.exists(img_dir):
-            # 按顺序读取图片文件
-            img_files = sorted([f for f in os.listdir(img_dir) if os.path.isfile(os.path.join(img_dir, f))])
-            for img_file in img_files:
-                try:
-                    # 读取图片文件内容
-                    with open(os.path.join(img_dir, img_file), 'rb') as f:
-                        img_data = f.read()
-                        all_images.append(img_data)
-                except Exception as e:
-                    print(f"读取缓存图片文件失败: {str(e)}")
+        # 从缓存容器中读取图片（按需读取）和提取时生成的缩略图
+        cache_service = self.pdf_manager.cache_service
+        all_images = cache_service.get_cache_images(self.pdf_manager.current_pdf_md5)
+        thumbnails = cache_service.get_cache_thumbnails(self.pdf_manager.current_pdf_md5)
         
         # 将所有图片数据传递给主窗口中的图片查看器面板
         main_window = self.window()
         if main_window and hasattr(main_window, 'image_viewer_panel'):
-            main_window.image_viewer_panel.set_images(all_images)
+            main_window.image_viewer_panel.set_images(all_images, thumbnails)
         
         return all_images
     
@@ -393,39 +526,18 @@ class ReaderPanel(QWidget):
         try:
             # 只有在需要重新加载图片时才执行图片相关操作
             all_images = []
+            thumbnails = {}
             
             # 检查是否使用缓存加载的PDF
             if self.pdf_manager.is_cached:
-                # 从缓存中读取图片
-                import os
-                
-                # 获取缓存中的图片路径列表
-                cache_dir = self.pdf_manager.cache_manager.get_cache_dir(self.pdf_manager.current_pdf_md5)
-                
-                # 从缓存中读取文本内容并显示
-                raw_content_file = os.path.join(cache_dir, 'raw_content.txt')
-                if os.path.exists(raw_content_file) and os.path.getsize(raw_content_file) > 0:
-                    try:
-                        with open(raw_content_file, 'r', encoding='utf-8') as f:
-                            self.text_browser.setText(f.read())
-                    except Exception as e:
-                        logger.error(f"读取缓存文本内容失败: {str(e)}")
+                # 从共享的文本存储中显示缓存文本内容
+                if self.pdf_manager.text_store is not None:
+                    self.text_browser.setText(self.pdf_manager.text_store.full_text())
                 
-                # 只有在需要重新加载图片时才执行图片相关操作
+                # 只有在需要重新加载图片时才从缓存容器读取图片
                 if reload_images:
-                    img_dir = os.path.join(cache_dir, 'img')
-                    
-                    if os.path.exists(img_dir):
-                        # 按顺序读取图片文件
-                        img_files = sorted([f for f in os.listdir(img_dir) if os.path.isfile(os.path.join(img_dir, f))])
-                        for img_file in img_files:
-                            try:
-                                # 读取图片文件内容
-                                with open(os.path.join(img_dir, img_file), 'rb') as f:
-                                    img_data = f.read()
-                                    all_images.append(img_data)
-                            except Exception as e:
-                                logger.error(f"读取缓存图片文件失败: {str(e)}")
+                    all_images = self.pdf_manager.cache_service.get_cache_images(self.pdf_manager.current_pdf_md5)
+                    thumbnails = self.pdf_manager.cache_service.get_cache_thumbnails(self.pdf_manager.current_pdf_md5)
             else:
                 # 正常从PDF中提取图片
                 # 显示所有页面的内容
@@ -447,7 +559,7 @@ class ReaderPanel(QWidget):
             if reload_images:
                 main_window = self.window()
                 if main_window and hasattr(main_window, 'image_viewer_panel'):
-                    main_window.image_viewer_panel.set_images(all_images)
+                    main_window.image_viewer_panel.set_images(all_images, thumbnails)
             
             # 将文本浏览器滚动到顶部
             self.text_browser.moveCursor(self.text_browser.textCursor().Start)
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QTextDocument, QTextOption
+from core.logger import logger
+
+
+class TextMeasureService:
+    """文本测量服务
+
+    按 (文本哈希, 宽度, 字体) 缓存排版后的文本高度，聊天消息和聊天气泡共用同一个排版文档，
+    同一文本在同一宽度下只排版一次。重新布局请求合并到下一帧统一执行，
+    连续的内容变化和大小变化只触发一次高度调整。
+    """
+
+    _instance = None
+
+    # 高度缓存的最大条目数
+    MAX_CACHE_ENTRIES = 4096
+    # 合并重新布局请求的间隔（毫秒），约为一帧
+    FRAME_INTERVAL = 16
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        # 避免重复初始化
+        if getattr(self, '_initialized', False):
+            return
+
+        self.document = QTextDocument()
+        self.document.setDefaultTextOption(QTextOption(Qt.AlignLeft | Qt.AlignTop))
+        self.height_cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # 等待在下一帧执行的重新布局回调，同一回调只保留一次
+        self.pending_layouts = {}
+        self.frame_timer = QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(self.FRAME_INTERVAL)
+        self.frame_timer.timeout.connect(self.run_pending_layouts)
+        self._initialized = True
+
+    def text_height(self, text, width, font, rich=None, document_margin=0, wrap_mode=None):
+        """获取文本在指定宽度下排版后的高度
+
+        Args:
+            text: 文本
+            width: 排版宽度（像素）
+            font: 字体
+            rich: 是否按HTML排版，为None时自动判断
+            document_margin: 文档边距
+            wrap_mode: 换行方式，为None时使用默认方式
+
+        Returns:
+            int: 文本高度（像素），宽度无效时返回0
+        """
+        if width <= 0:
+            return 0
+        if rich is None:
+            rich = Qt.mightBeRichText(text)
+        key = (hash(text), len(text), width, font.key(), rich, document_margin, wrap_mode)
+        height = self.height_cache.get(key)
+        if height is not None:
+            self.hits += 1
+            self.height_cache.move_to_end(key)
+            return height
+
+        self.misses += 1
+        document = self.document
+        document.setDefaultFont(font)
+        document.setDocumentMargin(document_margin)
+        option = document.defaultTextOption()
+        option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere if wrap_mode is None else wrap_mode)
+        document.setDefaultTextOption(option)
+        if rich:
+            document.setHtml(text)
+        else:
+            document.setPlainText(text)
+        document.setTextWidth(width)
+        height = int(document.size().height() + 0.5)
+
+        self.height_cache[key] = height
+        if len(self.height_cache) > self.MAX_CACHE_ENTRIES:
+            self.height_cache.popitem(last=False)
+        logger.debug("测量文本高度 - 长度: %d, 宽度: %d, 高度: %d", len(text), width, height)
+        return height
+
+    def schedule_layout(self, callback):
+        """请求在下一帧执行重新布局，同一帧内的重复请求只执行一次
+
+        Args:
+            callback: 重新布局的回调函数
+        """
+        self.pending_layouts[callback] = None
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def run_pending_layouts(self):
+        """执行所有等待中的重新布局回调"""
+        pending, self.pending_layouts = self.pending_layouts, {}
+        for callback in pending:
+            try:
+                callback()
+            except RuntimeError:
+                # 组件已被销毁
+                pass
+        logger.debug("执行重新布局 %d 次，高度缓存命中 %d 次，未命中 %d 次", len(pending), self.hits, self.misses)
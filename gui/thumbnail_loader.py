@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from PyQt5.QtCore import QObject, Qt, QSize, QBuffer, QByteArray, QIODevice, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader
+from core.logger import logger
+from pdf.thumbnails import THUMBNAIL_HEIGHT
+
+# 解码缩略图的线程数
+THUMBNAIL_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def decode_thumbnail(data: bytes, height: int = THUMBNAIL_HEIGHT) -> QImage:
+    """解码图片并缩小到固定高度
+
+    优先让解码器直接按目标尺寸解码（JPEG等格式可以在解码时缩小），不需要先解码完整图片。
+    只使用QImage，可以在非GUI线程中调用。
+
+    Args:
+        data: 图片的二进制数据
+        height: 缩略图高度
+
+    Returns:
+        QImage: 缩略图，解码失败时返回空图片
+    """
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and size.height() > height:
+        reader.setScaledSize(QSize(max(1, round(size.width() * height / size.height())), height))
+    image = reader.read()
+    if image.isNull():
+        return image
+    if image.height() != height:
+        image = image.scaledToHeight(height, Qt.SmoothTransformation)
+    return image
+
+
+class ThumbnailLoader(QObject):
+    """缩略图加载器
+
+    在线程池中解码并缩小图片，完成后通过信号把QImage交给界面线程。
+    请求按提交顺序执行，调用方先提交可见的缩略图；不再需要的请求在开始前可以取消。
+    """
+
+    thumbnail_ready = pyqtSignal(int, int, QImage)  # 批次号, 图片序号, 缩略图
+
+    def __init__(self, parent=None, max_workers: int = THUMBNAIL_WORKERS):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='thumbnail')
+        # 每次更换图片列表时递增，丢弃旧批次的结果
+        self.generation = 0
+        self.futures = {}  # 图片序号 -> Future
+
+    def reset(self) -> int:
+        """取消当前批次尚未开始的请求并开始新批次
+
+        Returns:
+            int: 新的批次号
+        """
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+        self.generation += 1
+        return self.generation
+
+    def request(self, index: int, load_data: Callable[[], bytes]) -> None:
+        """请求生成缩略图，已在进行中的请求不会重复提交
+
+        Args:
+            index: 图片序号
+            load_data: 返回图片（或已缓存的缩略图）二进制数据的函数，在线程池中调用
+        """
+        if index in self.futures:
+            return
+        self.futures[index] = self.executor.submit(self._load, self.generation, index, load_data)
+
+    def cancel(self, index: int) -> bool:
+        """取消尚未开始的请求
+
+        Args:
+            index: 图片序号
+
+        Returns:
+            bool: 是否已取消（已开始或已完成的请求无法取消）
+        """
+        future = self.futures.get(index)
+        if future is not None and future.cancel():
+            del self.futures[index]
+            return True
+        return False
+
+    def pending_indexes(self):
+        """已提交的图片序号"""
+        return set(self.futures)
+
+    def finish(self, index: int) -> None:
+        """缩略图已交给界面后移除对应的请求记录"""
+        self.futures.pop(index, None)
+
+    def _load(self, generation: int, index: int, load_data: Callable[[], bytes]) -> None:
+        if generation != self.generation:
+            return
+        try:
+            image = decode_thumbnail(load_data())
+        except Exception as e:
+            logger.error(f"生成缩略图失败: {index}, 错误: {str(e)}")
+            image = QImage()
+        try:
+            self.thumbnail_ready.emit(generation, index, image)
+        except RuntimeError:
+            # 加载器已被销毁
+            pass
+
+    def shutdown(self) -> None:
+        """取消尚未开始的请求并关闭线程池"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QImage, QPixmap, QPainter
+
+# 图块边长（像素）
+TILE_SIZE = 256
+
+# 缓存的图块数量上限，每个图块约256KB
+MAX_TILES = 256
+
+
+class TiledImageWidget(QWidget):
+    """分块绘制的图片组件
+
+    组件大小等于缩放后的图片大小，但不生成整张缩放后的图片：绘制时只为与可见区域相交的图块
+    从缩放金字塔中最接近的一级缩放生成图块，图块按LRU缓存，内存占用与缩放比例无关。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pyramid = None  # 当前图片的缩放金字塔
+        self.scale = 1.0  # 相对原图的缩放比例
+        self.smooth = True  # 是否平滑缩放
+        self.text = ""  # 没有图片时显示的文字
+        self.tiles = OrderedDict()  # (缩放比例, 是否平滑, 列, 行) -> QPixmap
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def has_image(self):
+        """是否正在显示图片"""
+        return self.pyramid is not None
+
+    def clear_image(self, text=""):
+        """清除图片并显示提示文字
+
+        Args:
+            text: 提示文字
+        """
+        self.pyramid = None
+        self.text = text
+        self.tiles.clear()
+        self.updateGeometry()
+        self.update()
+
+    def set_image(self, pyramid, scale, smooth=True):
+        """设置要显示的图片和缩放比例
+
+        Args:
+            pyramid: 图片的缩放金字塔
+            scale: 相对原图的缩放比例
+            smooth: 是否平滑缩放，连续缩放过程中使用快速缩放
+        """
+        if pyramid is not self.pyramid:
+            self.tiles.clear()
+        self.pyramid = pyramid
+        self.scale = scale
+        self.smooth = smooth
+        self.updateGeometry()
+        self.update()
+
+    def image_size(self):
+        """缩放后的图片大小"""
+        if self.pyramid is None:
+            return QSize(0, 0)
+        return QSize(max(1, round(self.pyramid.width * self.scale)),
+                     max(1, round(self.pyramid.height * self.scale)))
+
+    def sizeHint(self):
+        return self.image_size() if self.pyramid is not None else super().sizeHint()
+
+    def minimumSizeHint(self):
+        return self.image_size()
+
+    def image_rect(self):
+        """图片在组件中的位置，组件比图片大时居中显示"""
+        size = self.image_size()
+        return QRect(max(0, (self.width() - size.width()) // 2), max(0, (self.height() - size.height()) // 2),
+                     size.width(), size.height())
+
+    def _tile(self, column, row):
+        """获取图块，不在缓存中时从缩放金字塔生成"""
+        key = (self.scale, self.smooth, column, row)
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+
+        size = self.image_size()
+        target = QRect(column * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE).intersected(
+            QRect(0, 0, size.width(), size.height()))
+        level, level_scale = self.pyramid.level_for(self.scale)
+        ratio = level_scale / self.scale
+        source = QRectF(target.x() * ratio, target.y() * ratio, target.width() * ratio, target.height() * ratio)
+
+        image = QImage(target.size(), QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.smooth)
+        painter.drawImage(QRectF(0, 0, target.width(), target.height()), level, source)
+        painter.end()
+
+        tile = QPixmap.fromImage(image)
+        self.tiles[key] = tile
+        while len(self.tiles) > MAX_TILES:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.pyramid is None:
+            if self.text:
+                painter.drawText(self.rect(), Qt.AlignCenter, self.text)
+            return
+
+        # 只绘制与需要重绘的区域相交的图块
+        image_rect = self.image_rect()
+        exposed = event.rect().intersected(image_rect).translated(-image_rect.topLeft())
+        if exposed.isEmpty():
+            return
+        for row in range(exposed.top() // TILE_SIZE, exposed.bottom() // TILE_SIZE + 1):
+            for column in range(exposed.left() // TILE_SIZE, exposed.right() // TILE_SIZE + 1):
+                painter.drawPixmap(image_rect.x() + column * TILE_SIZE, image_rect.y() + row * TILE_SIZE,
+                                   self._tile(column, row))
@@ -0,0 +1,132 @@
+from typing import Dict, Any, List
+from llm.token_counter import count_tokens, MESSAGE_OVERHEAD_TOKENS
+
+# 被丢弃的早期对话在摘要中保留的问题数量和每个问题保留的字符数
+SUMMARY_MAX_QUESTIONS = 10
+SUMMARY_QUESTION_CHARS = 60
+
+CONTEXT_PROMPT = "以下是文档内容，请基于这些内容回答用户的问题：\n\n{context}"
+
+
+def message_tokens(message: Dict[str, Any], model: str) -> int:
+    """计算消息的token数量（包括固定开销），结果缓存在消息的token_counts字段中
+
+    Args:
+        message: 聊天历史中的消息，包含role和content
+        model: 模型名称
+
+    Returns:
+        int: token数量
+    """
+    counts = message.setdefault('token_counts', {})
+    if model not in counts:
+        counts[model] = count_tokens(message.get('content', ''), model) + MESSAGE_OVERHEAD_TOKENS
+    return counts[model]
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """截断文本，使其token数量不超过上限
+
+    Args:
+        text: 文本
+        max_tokens: token数量上限
+        model: 模型名称
+
+    Returns:
+        str: 截断后的文本
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    # 二分查找能放下的最长前缀
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if count_tokens(text[:mid], model) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low]
+
+
+def summarize_dropped(messages: List[Dict[str, Any]]) -> str:
+    """为放不下的早期对话生成简短摘要（只列出用户提过的问题）
+
+    Args:
+        messages: 被丢弃的消息，按时间顺序排列
+
+    Returns:
+        str: 摘要文本，没有用户问题时返回空字符串
+    """
+    questions = [message['content'] for message in messages if message.get('role') == 'user']
+    if not questions:
+        return ""
+    lines = []
+    for question in questions[-SUMMARY_MAX_QUESTIONS:]:
+        question = " ".join(question.split())
+        if len(question) > SUMMARY_QUESTION_CHARS:
+            question = question[:SUMMARY_QUESTION_CHARS] + "..."
+        lines.append(f"- {question}")
+    return "此前的对话中用户还问过以下问题（回答已省略）：\n" + "\n".join(lines)
+
+
+def build_messages(history: List[Dict[str, Any]], context: str, model: str, window_tokens: int,
+                   reply_tokens: int, system_prompt: str = "") -> List[Dict[str, str]]:
+    """在模型上下文窗口内组装请求消息
+
+    依次放入系统提示、文档上下文和最新的用户问题，剩余预算从新到旧放入历史消息，
+    放不下的早期对话以摘要代替，摘要也放不下时直接丢弃。
+
+    Args:
+        history: 聊天历史，按时间顺序排列，最后一条为当前问题
+        context: 检索到的文档上下文
+        model: 模型名称
+        window_tokens: 模型上下文窗口的token数量
+        reply_tokens: 为回复预留的token数量
+        system_prompt: 系统提示
+
+    Returns:
+        List[Dict[str, str]]: 请求消息列表
+    """
+    budget = window_tokens - reply_tokens
+    if not history:
+        return []
+
+    # 当前问题必须完整发送，过长时截断
+    question = history[-1]
+    question_tokens = message_tokens(question, model)
+    if question_tokens > budget:
+        content = truncate_to_tokens(question['content'], budget - MESSAGE_OVERHEAD_TOKENS, model)
+        return [{'role': question['role'], 'content': content}]
+    budget -= question_tokens
+
+    # 系统提示和文档上下文
+    system_parts = [part for part in (system_prompt, CONTEXT_PROMPT.format(context=context) if context else "") if part]
+    system_content = "\n\n".join(system_parts)
+    if system_content:
+        system_content = truncate_to_tokens(system_content, budget - MESSAGE_OVERHEAD_TOKENS, model)
+    if system_content:
+        budget -= count_tokens(system_content, model) + MESSAGE_OVERHEAD_TOKENS
+
+    # 从新到旧放入历史消息
+    kept = []
+    index = len(history) - 1
+    while index > 0:
+        tokens = message_tokens(history[index - 1], model)
+        if tokens > budget:
+            break
+        budget -= tokens
+        index -= 1
+        kept.append(history[index])
+    kept.reverse()
+
+    messages = []
+    if system_content:
+        messages.append({'role': 'system', 'content': system_content})
+    summary = summarize_dropped(history[:index])
+    if summary and count_tokens(summary, model) + MESSAGE_OVERHEAD_TOKENS <= budget:
+        messages.append({'role': 'system', 'content': summary})
+    messages.extend({'role': message['role'], 'content': message['content']} for message in kept)
+    messages.append({'role': question['role'], 'content': question['content']})
+    return messages
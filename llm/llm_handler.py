@@ -1,28 +1,63 @@
+import httpx
 from openai import OpenAI
 import json
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterator
 from core.logger import logger
+from llm.rate_limit import EndpointGuard
+from llm.token_counter import count_message_tokens
+
+# 未指定max_tokens时，为限速估算的回复token数量
+DEFAULT_REPLY_TOKENS = 512
+
 
 class LLMClient:
     """LLM客户端，用于标准化与LLM模型的交互"""
     
-    def __init__(self, api_url: Optional[str] = None, api_key: Optional[str] = None, client_type: str = 'general'):
+    def __init__(self, api_url: Optional[str] = None, api_key: Optional[str] = None, client_type: str = 'general',
+                 http_client: Optional[httpx.Client] = None, timeout: Optional[httpx.Timeout] = None,
+                 guard: Optional[EndpointGuard] = None):
         """初始化LLM客户端
         
         Args:
             api_url: API的完整URL，如果为None则使用OpenAI默认URL
             api_key: API密钥，如果为None则使用环境变量中的密钥
             client_type: 客户端类型，可选值为'general'、'format'、'translate'、'chat'
+            http_client: 共享的HTTP客户端（连接池），为None时由OpenAI客户端自行创建
+            timeout: 请求超时时间，为None时使用OpenAI默认值
+            guard: 接口的限速、重试和熔断保护，为None时使用OpenAI客户端自带的重试
         """
         self.api_url = api_url
         self.api_key = api_key
         self.client_type = client_type
+        self.http_client = http_client
+        self.timeout = timeout
+        self.guard = guard
         
         # 初始化OpenAI客户端
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url=api_url
-        ) if api_key or api_url else OpenAI()
+        self.client = self._create_client()
+    
+    def _create_client(self) -> OpenAI:
+        """根据当前的URL、密钥和连接设置创建OpenAI客户端"""
+        kwargs = {}
+        if self.api_key or self.api_url:
+            kwargs['api_key'] = self.api_key
+            kwargs['base_url'] = self.api_url or None
+        if self.http_client is not None:
+            kwargs['http_client'] = self.http_client
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        if self.guard is not None:
+            # 由EndpointGuard负责重试，避免与OpenAI客户端的重试叠加
+            kwargs['max_retries'] = 0
+        return OpenAI(**kwargs)
+    
+    def _create_completion(self, params: Dict[str, Any]):
+        """发送请求，配置了接口保护时在限速、重试和熔断保护下发送"""
+        if self.guard is None:
+            return self.client.chat.completions.create(**params)
+        tokens = count_message_tokens(params['messages'], params['model']) + \
+            params.get('max_tokens', DEFAULT_REPLY_TOKENS)
+        return self.guard.call(lambda: self.client.chat.completions.create(**params), tokens)
     
     def set_api_url(self, api_url: str) -> None:
         """设置API URL
@@ -31,7 +66,7 @@ class LLMClient:
             api_url: API的完整URL
         """
         self.api_url = api_url
-        self.client = OpenAI(api_key=self.api_key, base_url=api_url)
+        self.client = self._create_client()
         logger.info(f"已设置API URL: {api_url}")
     
     def set_api_key(self, api_key: str) -> None:
@@ -41,7 +76,7 @@ class LLMClient:
             api_key: API密钥
         """
         self.api_key = api_key
-        self.client = OpenAI(api_key=api_key, base_url=self.api_url)
+        self.client = self._create_client()
         logger.info("已设置API密钥")
     
     def chat_completion(
@@ -50,8 +85,9 @@ class LLMClient:
         model: str = "gpt-3.5-turbo", 
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        system_prompt: Optional[str] = None
-    ) -> Dict[str, Any]:
+        system_prompt: Optional[str] = None,
+        stream: bool = False
+    ) -> Union[Dict[str, Any], Iterator[str]]:
         """发送聊天请求到LLM模型
         
         Args:
@@ -60,13 +96,17 @@ class LLMClient:
             temperature: 温度参数，控制输出的随机性
             max_tokens: 最大生成的token数量
             system_prompt: 系统提示，如果提供，将添加到消息列表的开头
+            stream: 是否使用流式响应，为True时返回逐段产出回复文本的迭代器
             
         Returns:
-            LLM模型的响应
+            LLM模型的响应；流式模式下为回复文本片段的迭代器
             
         Raises:
             Exception: 当API调用失败时抛出异常
         """
+        if stream:
+            return self.chat_completion_stream(messages, model, temperature, max_tokens, system_prompt)
+        
         try:
             # 如果提供了系统提示，则添加到消息列表的开头
             if system_prompt:
@@ -85,7 +125,7 @@ class LLMClient:
             
             # 发送请求
             logger.info(f"发送请求到LLM模型: {model}")
-            response = self.client.chat.completions.create(**params)
+            response = self._create_completion(params)
             
             # 将响应对象转换为字典
             response_dict = {
@@ -114,6 +154,55 @@ class LLMClient:
             logger.error(f"调用LLM模型时发生未知错误: {str(e)}")
             raise
     
+    def chat_completion_stream(
+        self, 
+        messages: List[Dict[str, str]], 
+        model: str = "gpt-3.5-turbo", 
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """以流式方式发送聊天请求，逐段产出LLM模型生成的文本
+        
+        Args:
+            messages: 消息列表，每个消息是一个字典，包含role和content字段
+            model: 模型名称
+            temperature: 温度参数，控制输出的随机性
+            max_tokens: 最大生成的token数量
+            system_prompt: 系统提示，如果提供，将添加到消息列表的开头
+            
+        Yields:
+            str: 新生成的文本片段
+            
+        Raises:
+            Exception: 当API调用失败时抛出异常
+        """
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+        
+        params = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "stream": True
+        }
+        if max_tokens is not None:
+            params["max_tokens"] = max_tokens
+        
+        try:
+            logger.info(f"发送流式请求到LLM模型: {model}")
+            response = self._create_completion(params)
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+            logger.info("LLM模型流式响应结束")
+        except Exception as e:
+            logger.error(f"OpenAI API错误: {str(e)}")
+            raise
+    
     def get_completion_text(self, response: Dict[str, Any]) -> str:
         """从LLM模型响应中提取文本
         
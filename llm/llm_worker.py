@@ -0,0 +1,67 @@
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+from core.logger import logger
+
+
+class LLMRequest(QObject):
+    """LLM请求的界面端句柄
+
+    将LLMService返回的Future和流式片段转换为Qt信号。信号在工作线程中发出，
+    由于本对象属于界面线程，连接的槽函数会在界面线程中执行。
+    """
+
+    delta_received = pyqtSignal(str)  # 新生成的文本片段
+    completed = pyqtSignal(object)  # 请求结果
+    failed = pyqtSignal(str)  # 错误信息
+    finished = pyqtSignal()  # 请求结束（无论成功、失败或取消）
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.future = None
+        self.cancel_event = threading.Event()
+
+    def attach(self, future):
+        """关联请求的Future，请求结束时发出相应信号
+
+        Args:
+            future: LLMService返回的Future
+
+        Returns:
+            LLMRequest: 本对象，便于链式调用
+        """
+        self.future = future
+        future.add_done_callback(self._on_done)
+        return self
+
+    def emit_delta(self, delta):
+        """在工作线程中转发流式片段"""
+        self._emit(self.delta_received, delta)
+
+    def cancel(self):
+        """取消请求，尚未开始的请求直接取消，流式请求在收到下一个片段时停止"""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    @property
+    def is_cancelled(self):
+        """请求是否已被取消"""
+        return self.cancel_event.is_set()
+
+    def _on_done(self, future):
+        if future.cancelled():
+            self._emit(self.failed, '请求已取消')
+        elif future.exception() is not None:
+            logger.error(f"LLM请求失败: {str(future.exception())}")
+            self._emit(self.failed, str(future.exception()))
+        else:
+            self._emit(self.completed, future.result())
+        self._emit(self.finished)
+
+    @staticmethod
+    def _emit(signal, *args):
+        try:
+            signal.emit(*args)
+        except RuntimeError:
+            # 接收结果的界面组件已被销毁
+            pass
@@ -0,0 +1,283 @@
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+from openai import APIConnectionError
+from core.logger import logger
+
+T = TypeVar('T')
+
+# 指数退避的初始等待时间和最大等待时间（秒）
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# 熔断器：连续失败多少次后断开，断开多少秒后放行一个试探请求
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+
+class CircuitOpenError(Exception):
+    """接口处于熔断状态，请求未发送"""
+
+
+class RateLimitWaitError(Exception):
+    """等待限速或限流恢复的时间超过上限，请求未发送"""
+
+
+class TokenBucket:
+    """令牌桶，容量为每分钟的配额，按固定速率补充"""
+
+    def __init__(self, per_minute: float):
+        """初始化令牌桶
+
+        Args:
+            per_minute: 每分钟的配额，不大于0时不限制
+        """
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1, timeout: Optional[float] = None) -> None:
+        """取出令牌，不足时阻塞等待补充
+
+        Args:
+            amount: 令牌数量，超过容量时按容量计算
+            timeout: 最长等待秒数，为None时不限制
+
+        Raises:
+            RateLimitWaitError: 在最长等待时间内无法取得令牌
+        """
+        if self.capacity <= 0:
+            return
+        amount = min(float(amount), self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                raise RateLimitWaitError(f"限速等待时间超过{timeout:.0f}秒")
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """熔断器，接口连续失败时在一段时间内直接拒绝请求，之后放行一个试探请求"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """请求前检查，处于熔断状态时抛出CircuitOpenError
+
+        Returns:
+            bool: 本次请求是否为半开状态下放行的试探请求
+        """
+        with self._lock:
+            if self.opened_at is None:
+                return False
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self.probing:
+                raise CircuitOpenError(f"接口暂时不可用，请在{max(remaining, 1):.0f}秒后重试")
+            # 半开状态：只放行一个试探请求
+            self.probing = True
+            return True
+
+    def release_probe(self) -> None:
+        """试探请求结束但没有记录成功或失败时，允许下一个请求继续试探"""
+        with self._lock:
+            self.probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self.probing:
+                    logger.warning(f"接口连续失败{self.failures}次，熔断{self.reset_timeout:.0f}秒")
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """从错误响应的Retry-After（或retry-after-ms）头中读取等待时间
+
+    Args:
+        error: 请求异常
+
+    Returns:
+        float: 等待秒数，没有该响应头时返回None
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    try:
+        value = headers.get('retry-after-ms')
+        if value is not None:
+            return max(0.0, float(value) / 1000)
+        value = headers.get('retry-after')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """请求异常是否值得重试：限流、超时、连接失败和服务端错误"""
+    status = _status_code(error)
+    if status is not None:
+        return status in (408, 409, 429) or status >= 500
+    return isinstance(error, (APIConnectionError, OSError))
+
+
+class EndpointGuard:
+    """单个LLM接口的请求保护：令牌桶限速（每分钟请求数和token数）、带抖动的指数退避重试
+    （优先遵循Retry-After）以及熔断
+
+    收到429时整个接口暂停到Retry-After指定的时间，同一接口上的所有请求一起等待，
+    而不是各自立即重试把配额耗得更快。请求在共享的线程池中执行，每次等待都不超过max_delay，
+    需要等待更久时直接失败，避免一个被限流的接口占满所有工作线程。
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, max_retries: int = 5,
+                 max_delay: float = BACKOFF_MAX):
+        """初始化请求保护
+
+        Args:
+            requests_per_minute: 每分钟请求数上限，0表示不限制
+            tokens_per_minute: 每分钟token数上限，0表示不限制
+            max_retries: 最大重试次数
+            max_delay: 单次等待（限速、限流暂停、退避）的最长秒数
+        """
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.max_delay = max_delay
+        self.breaker = CircuitBreaker()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """暂停该接口上的所有请求
+
+        Args:
+            seconds: 暂停秒数
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _wait_if_paused(self) -> None:
+        with self._lock:
+            wait = self._paused_until - time.monotonic()
+        if wait > self.max_delay:
+            raise RateLimitWaitError(f"接口限流中，请在{wait:.0f}秒后重试")
+        if wait > 0:
+            time.sleep(wait)
+
+    def call(self, request: Callable[[], T], tokens: int = 0) -> T:
+        """在限速、重试和熔断保护下执行请求
+
+        Args:
+            request: 发送请求的函数
+            tokens: 本次请求预计消耗的token数量
+
+        Returns:
+            请求函数的返回值
+
+        Raises:
+            CircuitOpenError: 接口处于熔断状态
+            RateLimitWaitError: 需要等待的时间超过max_delay
+            Exception: 不可重试的错误，Retry-After超过max_delay的错误，或重试次数用尽后的最后一个错误
+        """
+        attempt = 0
+        last_error = None
+        while True:
+            probe = False
+            try:
+                probe = self.breaker.before_request()
+                self._wait_if_paused()
+                if attempt == 0:
+                    # 一次请求只按配额计数一次，重试不重复扣除
+                    self.request_bucket.acquire(1, self.max_delay)
+                    self.token_bucket.acquire(tokens, self.max_delay)
+            except (CircuitOpenError, RateLimitWaitError) as e:
+                if probe:
+                    self.breaker.release_probe()
+                if last_error is None:
+                    raise
+                # 重试过程中熔断或需要等待过久时，把上一次的真实错误交给调用方
+                raise last_error from e
+            try:
+                result = request()
+            except Exception as e:
+                status = _status_code(e)
+                if not is_retryable(e):
+                    if status is not None:
+                        # 接口返回了错误响应，说明接口本身可用
+                        self.breaker.record_success()
+                    raise
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None and retry_after > self.max_delay:
+                    logger.warning(f"LLM请求失败（{status}），Retry-After为{retry_after:.0f}秒，超过等待上限，不再重试")
+                    if status == 429:
+                        self.breaker.record_success()
+                        self.pause(retry_after)
+                    else:
+                        self.breaker.record_failure()
+                    raise
+                delay = retry_after if retry_after is not None else min(self._backoff(attempt), self.max_delay)
+                if status == 429:
+                    # 限流说明接口本身可用，不计入熔断；暂停整个接口，下次循环时在暂停结束后重试
+                    self.breaker.record_success()
+                    self.pause(delay)
+                else:
+                    self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                last_error = e
+                logger.warning(f"LLM请求失败（{status or type(e).__name__}），{delay:.1f}秒后第{attempt}次重试")
+                if status != 429:
+                    time.sleep(delay)
+                continue
+            else:
+                self.breaker.record_success()
+                return result
+            finally:
+                # 试探请求以任何方式结束时都要退出试探状态，否则熔断器会一直拒绝请求
+                if probe:
+                    self.breaker.release_probe()
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """带完全抖动的指数退避时间"""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
@@ -0,0 +1,56 @@
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken为可选依赖，未安装时按字符估算
+    tiktoken = None
+
+# 估算时中日韩文字按每个字符1.5个token、其他文字按每4个字符1个token计算（均向上取整）
+_CJK_PATTERN = re.compile("[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+# 每条消息除内容外的固定开销（角色和分隔符）
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """计算文本的token数量
+
+    安装了tiktoken时精确计算，否则按字符类型保守估算。
+
+    Args:
+        text: 文本
+        model: 模型名称
+
+    Returns:
+        int: token数量
+    """
+    if not text:
+        return 0
+    if tiktoken is not None:
+        return len(_get_encoding(model).encode(text, disallowed_special=()))
+    cjk_count = len(_CJK_PATTERN.findall(text))
+    return (cjk_count * 3 + 1) // 2 + (len(text) - cjk_count + 3) // 4
+
+
+def count_message_tokens(messages: List[Dict[str, str]], model: str = "gpt-3.5-turbo") -> int:
+    """计算消息列表的token数量（包括每条消息的固定开销）
+
+    Args:
+        messages: 消息列表
+        model: 模型名称
+
+    Returns:
+        int: token数量
+    """
+    return sum(count_tokens(message.get('content', ''), model) + MESSAGE_OVERHEAD_TOKENS
+               for message in messages)
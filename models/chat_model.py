@@ -2,6 +2,8 @@
 from typing import Dict, Any, List, Optional
 from core.event_bus import EventBus
 from services.config_service import ConfigService
+from pdf.retrieval import DocumentRetriever
+from llm.token_counter import count_tokens
 
 class ChatModel:
     def __init__(self, config_service=None):
@@ -9,6 +11,8 @@ class ChatModel:
         self.event_bus = EventBus()
         self.chat_history = []
         self.current_context = ""
+        self.text_store = None  # 当前文档的按页文本存储，与PDF服务共享
+        self.retriever = None  # 当前文档的检索器，首次提问时建立
         self.api_key = self.config_service.api_key
         self.api_url = self.config_service.api_url
         
@@ -22,9 +26,15 @@ class ChatModel:
         Args:
             data: 事件数据
         """
-        if data.get('cached', False) and 'cache_content' in data:
+        cache_content = data.get('cache_content', {})
+        self.text_store = cache_content.get('text_store')
+        self.retriever = None
+        if self.text_store is not None:
+            # 使用与PDF服务共享的文本存储作为上下文，不复制全文
+            self.current_context = self.text_store.full_text()
+        elif data.get('cached', False) and 'cache_content' in data:
             # 从缓存中获取内容作为上下文
-            self.current_context = data['cache_content'].get('raw_content', '')
+            self.current_context = cache_content.get('raw_content', '')
         else:
             # 使用PDF的元数据作为上下文
             metadata = data.get('metadata', {})
@@ -44,18 +54,21 @@ class ChatModel:
         self.api_key = data.get('api_key', '')
         self.api_url = data.get('api_url', '')
     
-    def add_message(self, role: str, content: str) -> None:
+    def add_message(self, role: str, content: str, error: bool = False) -> None:
         """添加消息到聊天历史
         
         Args:
             role: 消息角色，'user'或'assistant'
             content: 消息内容
+            error: 是否为请求失败时的提示消息，这类消息不会作为历史发送给模型
         """
         message = {
             'role': role,
             'content': content,
             'timestamp': self._get_current_timestamp()
         }
+        if error:
+            message['error'] = True
         self.chat_history.append(message)
         
         # 发布消息添加事件
@@ -104,4 +117,23 @@ class ChatModel:
         Returns:
             str: 上下文内容
         """
-        return self.current_context
\ No newline at end of file
+        return self.current_context
+    
+    def retrieve_context(self, query: str) -> str:
+        """检索与问题最相关的文档片段作为上下文，总长度不超过配置的token预算
+        
+        Args:
+            query: 用户问题
+            
+        Returns:
+            str: 上下文内容，没有按页文本时返回当前上下文
+        """
+        if self.text_store is None or self.text_store.page_count == 0:
+            return self.current_context
+        
+        if self.retriever is None:
+            pages = [self.text_store.page_text(i) for i in range(self.text_store.page_count)]
+            self.retriever = DocumentRetriever(pages)
+        chunks = self.retriever.retrieve(query, count_tokens, self.config_service.chat_context_tokens,
+                                         self.config_service.chat_context_top_k)
+        return DocumentRetriever.format_context(chunks)
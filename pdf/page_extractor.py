@@ -0,0 +1,172 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Tuple, Optional
+from core.logger import logger
+
+
+def _iter_page_range(file_path: str, start: int, end: int,
+                     with_images: bool = True) -> Iterator[Tuple[int, str, List[bytes]]]:
+    """逐页提取指定页码范围的文本和图片
+
+    每次调用独立打开自己的PyMuPDF文档对象，文档对象不会在进程间共享。
+
+    Args:
+        file_path: PDF文件路径
+        start: 起始页码（从0开始，包含）
+        end: 结束页码（不包含）
+        with_images: 是否提取图片，为False时图片数据列表为空
+
+    Yields:
+        Tuple[int, str, List[bytes]]: (页码, 页面文本, 页面图片数据列表)
+    """
+    import fitz
+
+    doc = fitz.open(file_path)
+    try:
+        for page_num in range(start, end):
+            page = doc.load_page(page_num)
+            text = page.get_text()
+            images = []
+            for img in (page.get_images(full=True) if with_images else []):
+                try:
+                    extracted = doc.extract_image(img[0])
+                except Exception:
+                    continue
+                if extracted and extracted.get('image'):
+                    images.append(extracted['image'])
+            yield page_num, text, images
+    finally:
+        doc.close()
+
+
+def _extract_page_range(file_path: str, start: int, end: int,
+                        with_images: bool = True) -> List[Tuple[int, str, List[bytes]]]:
+    """在工作进程中提取指定页码范围的文本和图片
+
+    Args:
+        file_path: PDF文件路径
+        start: 起始页码（从0开始，包含）
+        end: 结束页码（不包含）
+        with_images: 是否提取图片
+
+    Returns:
+        List[Tuple[int, str, List[bytes]]]: (页码, 页面文本, 页面图片数据列表) 的列表
+    """
+    return list(_iter_page_range(file_path, start, end, with_images))
+
+
+class PageExtractor:
+    """PDF页面并行提取器，将页码范围分片后交给进程池处理，并按页码顺序合并结果
+    页数较少或只配置了一个工作进程时退化为串行提取
+
+    进程池在第一次并行提取时创建，之后在提取器的整个生命周期内复用（Windows上启动进程的开销较大），
+    不再使用时需要调用shutdown。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, parallel_threshold: int = 32):
+        """初始化页面提取器
+
+        Args:
+            max_workers: 工作进程数量，为None或0时使用CPU核心数
+            parallel_threshold: 启用并行提取的最小页数，少于该页数时串行提取
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """获取共享的进程池，第一次调用时创建"""
+        with self._executor_lock:
+            if self._executor is None:
+                logger.info(f"创建页面提取进程池，进程数: {self.max_workers}")
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """丢弃出错的进程池，下次并行提取时重新创建"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """取消尚未开始的分片并关闭进程池"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _split_ranges(self, total_pages: int, workers: int) -> List[Tuple[int, int]]:
+        """将页码划分为若干连续区间
+
+        每个工作进程分到约4个区间，使耗时不均的页面也能较好地负载均衡。
+
+        Args:
+            total_pages: 总页数
+            workers: 工作进程数量
+
+        Returns:
+            List[Tuple[int, int]]: (起始页码, 结束页码) 区间列表
+        """
+        chunk_size = max(1, -(-total_pages // (workers * 4)))
+        return [(start, min(start + chunk_size, total_pages))
+                for start in range(0, total_pages, chunk_size)]
+
+    def iter_pages(self, file_path: str, total_pages: int,
+                   with_images: bool = True) -> Iterator[Tuple[int, str, List[bytes]]]:
+        """按页码顺序逐页产出提取结果
+
+        并行模式下第一页在当前进程中立即提取，其余页面同时交给进程池处理，
+        因此首页的产出时间与总页数无关。
+
+        Args:
+            file_path: PDF文件路径
+            total_pages: 总页数
+            with_images: 是否提取图片，只需要文本时传入False
+
+        Yields:
+            Tuple[int, str, List[bytes]]: (页码, 页面文本, 页面图片数据列表)
+        """
+        workers = min(self.max_workers, total_pages - 1)
+        if workers <= 1 or total_pages < self.parallel_threshold:
+            logger.debug(f"串行提取PDF页面: {file_path}, 总页数: {total_pages}")
+            yield from _iter_page_range(file_path, 0, total_pages, with_images)
+            return
+
+        ranges = [(start + 1, end + 1) for start, end in self._split_ranges(total_pages - 1, workers)]
+        logger.info(f"并行提取PDF页面: {file_path}, 总页数: {total_pages}, 进程数: {workers}, 分片数: {len(ranges)}")
+        executor = self._get_executor()
+        futures = []
+        next_page = 0
+        try:
+            futures = [executor.submit(_extract_page_range, file_path, start, end, with_images) for start, end in ranges]
+            yield from _iter_page_range(file_path, 0, 1, with_images)
+            next_page = 1
+            for future in futures:
+                for result in future.result():
+                    yield result
+                    next_page = result[0] + 1
+        except Exception as e:
+            logger.error(f"并行提取PDF页面失败，从第 {next_page + 1} 页起改为串行提取: {str(e)}")
+            if isinstance(e, BrokenProcessPool):
+                self._discard_executor(executor)
+            yield from _iter_page_range(file_path, next_page, total_pages, with_images)
+        finally:
+            # 提前结束迭代时取消尚未开始的分片，进程池继续保留
+            for future in futures:
+                future.cancel()
+
+    def extract(self, file_path: str, total_pages: int) -> List[Tuple[str, List[bytes]]]:
+        """提取PDF所有页面的文本和图片
+
+        Args:
+            file_path: PDF文件路径
+            total_pages: 总页数
+
+        Returns:
+            List[Tuple[str, List[bytes]]]: 按页码顺序排列的 (页面文本, 页面图片数据列表)
+        """
+        return [(text, images) for _, text, images in self.iter_pages(file_path, total_pages)]
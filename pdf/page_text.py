@@ -0,0 +1,111 @@
+import re
+from typing import Iterable, List, Tuple
+
+# 页面分隔标记，与缓存文本content.txt中的格式保持一致
+PAGE_HEADER = "\n--- 第 {} 页 ---\n\n"
+_PAGE_HEADER_PATTERN = re.compile(r"\n--- 第 (\d+) 页 ---\n\n")
+
+
+class PageTextStore:
+    """按页存储的文档文本
+
+    所有页面的文本（含页面分隔标记）保存在同一个字符串缓冲区中，另外记录每页正文在缓冲区中的
+    起止偏移。追加页面时只记录片段，直到第一次读取时才合并为一个缓冲区，避免反复拼接字符串。
+    缓存、阅读器和聊天模型共享同一个实例，不再各自复制整篇文档。
+    """
+
+    def __init__(self, pages: Iterable[str] = ()):
+        """初始化文本存储
+
+        Args:
+            pages: 按页码顺序排列的页面文本
+        """
+        self._buffer = ""  # 已合并的全文缓冲区
+        self._pending = []  # 尚未合并到缓冲区的文本片段
+        self._length = 0  # 全文长度（含尚未合并的片段）
+        self._offsets: List[Tuple[int, int]] = []  # 每页正文在全文中的 (起始, 结束) 偏移
+        for text in pages:
+            self.append_page(text)
+
+    @classmethod
+    def from_text(cls, text: str) -> 'PageTextStore':
+        """从带页面分隔标记的全文构建文本存储，直接复用传入的字符串作为缓冲区
+
+        Args:
+            text: 带页面分隔标记的全文，例如缓存中的content.txt
+
+        Returns:
+            PageTextStore: 文本存储
+        """
+        store = cls()
+        store._buffer = text
+        store._length = len(text)
+        matches = list(_PAGE_HEADER_PATTERN.finditer(text))
+        for i, match in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            store._offsets.append((match.end(), end))
+        return store
+
+    def append_page(self, text: str) -> None:
+        """追加一页文本
+
+        Args:
+            text: 页面文本
+        """
+        header = PAGE_HEADER.format(len(self._offsets) + 1)
+        start = self._length + len(header)
+        self._pending.append(header)
+        self._pending.append(text)
+        self._length = start + len(text)
+        self._offsets.append((start, self._length))
+
+    def _flush(self) -> None:
+        """将尚未合并的片段合并到缓冲区"""
+        if self._pending:
+            self._pending.insert(0, self._buffer)
+            self._buffer = "".join(self._pending)
+            self._pending = []
+
+    @property
+    def page_count(self) -> int:
+        """页数"""
+        return len(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def page_text(self, page_num: int) -> str:
+        """获取指定页面的文本
+
+        Args:
+            page_num: 页码（从0开始）
+
+        Returns:
+            str: 页面文本
+        """
+        self._flush()
+        start, end = self._offsets[page_num]
+        return self._buffer[start:end]
+
+    def page_offsets(self, page_num: int) -> Tuple[int, int]:
+        """获取指定页面正文在全文中的起止偏移
+
+        Args:
+            page_num: 页码（从0开始）
+
+        Returns:
+            Tuple[int, int]: (起始偏移, 结束偏移)
+        """
+        return self._offsets[page_num]
+
+    def full_text(self) -> str:
+        """获取带页面分隔标记的全文，多次调用返回同一个字符串对象
+
+        Returns:
+            str: 全文
+        """
+        self._flush()
+        return self._buffer
+
+    def __str__(self) -> str:
+        return self.full_text()
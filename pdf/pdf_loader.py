@@ -0,0 +1,89 @@
+import threading
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from core.logger import logger
+
+
+class CancellationToken:
+    """取消令牌，由GUI线程设置，加载线程在各阶段之间检查"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """请求取消"""
+        self._event.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._event.is_set()
+
+
+class ObserverBridge(QObject):
+    """观察者信号桥，将PDF管理器的通知转换为Qt信号
+
+    PDF管理器可能在加载线程中通知观察者，通过信号转发后，
+    GUI组件的update方法总是在GUI线程中执行。
+    """
+
+    event_received = pyqtSignal(str, object)
+
+    def update(self, event_type, data=None):
+        """观察者模式的更新方法，转发为event_received信号
+
+        Args:
+            event_type: 事件类型
+            data: 事件数据
+        """
+        self.event_received.emit(event_type, data)
+
+
+class PDFLoadWorker(QThread):
+    """PDF后台加载线程，在GUI线程之外完成哈希计算、页面提取和缓存写入"""
+
+    progress = pyqtSignal(int, int)  # 已提取页数, 总页数
+    load_finished = pyqtSignal(str, bool)  # 文件路径, 是否加载成功
+
+    def __init__(self, pdf_manager, file_path, parent=None, force_rebuild=False):
+        """初始化加载线程
+
+        Args:
+            pdf_manager: PDF管理器
+            file_path: PDF文件路径
+            parent: 父对象
+            force_rebuild: 是否忽略已有缓存，重新提取内容并重建缓存
+        """
+        super().__init__(parent)
+        self.pdf_manager = pdf_manager
+        self.file_path = file_path
+        self.force_rebuild = force_rebuild
+        self.cancel_token = CancellationToken()
+
+    def cancel(self):
+        """取消加载，加载线程会在下一页提取完成后停止"""
+        logger.info(f"取消加载PDF文件: {self.file_path}")
+        self.cancel_token.cancel()
+
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已取消加载"""
+        return self.cancel_token.is_cancelled
+
+    def update(self, event_type, data=None):
+        """观察者模式的更新方法，在加载线程中被调用，用于发出进度信号
+
+        Args:
+            event_type: 事件类型
+            data: 事件数据
+        """
+        if event_type == 'page_extracted':
+            self.progress.emit(data['page_num'], data['total_pages'])
+
+    def run(self):
+        try:
+            result = self.pdf_manager.load_pdf(self.file_path, cancel_token=self.cancel_token,
+                                               force_rebuild=self.force_rebuild)
+        except Exception as e:
+            logger.error(f"后台加载PDF文件失败: {self.file_path}, 错误: {str(e)}")
+            result = False
+        self.load_finished.emit(self.file_path, bool(result) and not self.is_cancelled)
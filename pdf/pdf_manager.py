@@ -1,7 +1,13 @@
 from core.pdf_reader import PDFReader
 from typing import List, Dict, Any, Callable, Optional
 from core.logger import logger
-from core.cache_manager import CacheManager
+from services.cache_service import CacheService
+from services.library_index import LibraryIndex
+from conf.config_manager import ConfigManager
+from pdf.page_extractor import PageExtractor
+from pdf.page_text import PageTextStore
+from pdf.search_index import search, scan
+from utils.fingerprint import FingerprintIndex
 import os
 
 class PDFManager:
@@ -13,10 +19,18 @@ class PDFManager:
         self.pdf_reader = PDFReader()
         self.observers = []  # 观察者列表
         self.zoom_level = 1.0  # 缩放级别，1.0表示100%
-        self.cache_manager = CacheManager()  # 缓存管理器
+        self.cache_service = CacheService()  # 缓存服务
+        self.fingerprint_index = FingerprintIndex()  # 文件指纹索引
+        self.library_index = LibraryIndex()  # 文献库全文索引
+        config_manager = ConfigManager()
+        self.page_extractor = PageExtractor(  # 页面并行提取器
+            max_workers=config_manager.extract_workers,
+            parallel_threshold=config_manager.parallel_extract_threshold
+        )
         self.current_pdf_path = None  # 当前打开的PDF文件路径
         self.current_pdf_md5 = None  # 当前打开的PDF文件的MD5值
         self.is_cached = False  # 当前PDF是否使用了缓存
+        self.text_store = None  # 当前PDF的按页文本存储
         logger.info("PDF管理器初始化完成")
     
     def add_observer(self, observer):
@@ -46,15 +60,20 @@ class PDFManager:
             event_type: 事件类型
             data: 事件数据
         """
-        logger.debug(f"通知观察者事件: {event_type}, 数据: {data}")
+        # 逐页加载时事件数据包含页面文本和图片，不写入日志
+        logger.debug(f"通知观察者事件: {event_type}")
         for observer in self.observers:
             observer.update(event_type, data)
     
-    def load_pdf(self, file_path):
+    def load_pdf(self, file_path, streaming=True, cancel_token=None, force_rebuild=False):
         """加载PDF文件
         
         Args:
             file_path: PDF文件路径
+            streaming: 是否逐页加载。为True时每提取完一页即发出page_extracted事件，
+                阅读器无需等待整个文档提取完成即可显示内容
+            cancel_token: 取消令牌，在后台线程加载时用于中止加载
+            force_rebuild: 是否忽略已有缓存，重新提取内容并重建缓存
             
         Returns:
             bool: 是否成功加载PDF文件
@@ -64,19 +83,27 @@ class PDFManager:
         # 保存当前PDF文件路径
         self.current_pdf_path = file_path
         
-        # 计算PDF文件的MD5值
-        self.current_pdf_md5 = self.cache_manager.get_pdf_md5(file_path)
+        # 获取PDF文件的MD5值，文件未变化时直接使用指纹索引中的记录
+        self._unpin_current_cache()
+        self.current_pdf_md5 = self.fingerprint_index.get_md5(file_path)
         if not self.current_pdf_md5:
             logger.error(f"计算PDF文件MD5值失败: {file_path}")
             return False
+        # 文档打开期间按需从缓存读取图片，不允许淘汰它的缓存
+        self.cache_service.pin(self.current_pdf_md5)
+        
+        if cancel_token and cancel_token.is_cancelled:
+            logger.info(f"PDF文件加载已取消: {file_path}")
+            return False
         
         # 检查是否存在缓存
-        self.is_cached = self.cache_manager.check_cache_exists(self.current_pdf_md5)
+        self.is_cached = not force_rebuild and self.cache_service.check_cache_exists(self.current_pdf_md5)
         
         if self.is_cached:
             logger.info(f"使用缓存加载PDF文件: {file_path}")
             # 从缓存中获取内容
-            cache_content = self.cache_manager.get_cache_content(self.current_pdf_md5)
+            cache_content = self.cache_service.get_cache_content(self.current_pdf_md5)
+            self.text_store = cache_content['text_store']
             
             # 仍然需要打开PDF文件以获取元数据和总页数
             if not self.pdf_reader.open(file_path):
@@ -94,6 +121,7 @@ class PDFManager:
                 'cache_content': cache_content
             })
             
+            self._index_document(file_path, metadata)
             logger.info(f"从缓存加载PDF文件成功: {file_path}, 总页数: {total_pages}")
             return True
         else:
@@ -107,43 +135,108 @@ class PDFManager:
             metadata = self.pdf_reader.get_metadata()
             total_pages = self.pdf_reader.get_total_pages()
             
+            if streaming:
+                # 通知观察者开始逐页加载
+                self.notify_observers('pdf_loading', {
+                    'total_pages': total_pages,
+                    'metadata': metadata
+                })
+            
             # 提取所有页面的文本内容
-            all_text = ""
-            all_images = []
-            for page_num in range(total_pages):
-                page = self.pdf_reader.get_page(page_num)
-                if page:
-                    all_text += f"\n--- 第 {page_num + 1} 页 ---\n\n"
-                    all_text += page.get_text()
-                    all_images.extend(page.images)
+            content = self._extract_content(file_path, total_pages, streaming, cancel_token)
+            if content is None:
+                logger.info(f"PDF文件加载已取消: {file_path}")
+                return False
+            self.text_store, all_images = content
+            all_text = self.text_store.full_text()
             
-            # 创建缓存
-            self.cache_manager.create_cache(self.current_pdf_md5, all_text, all_images)
+            # 创建缓存，重建时同时清理旧版缓存目录
+            if force_rebuild:
+                cached = self.cache_service.rebuild_cache(self.current_pdf_md5, self.text_store, all_images, metadata)
+            else:
+                cached = self.cache_service.create_cache(self.current_pdf_md5, self.text_store, all_images, metadata)
+            # 读取创建缓存时生成的缩略图，首次打开时也不需要为缩略图解码完整图片
+            thumbnails = self.cache_service.get_cache_thumbnails(self.current_pdf_md5) if cached else {}
             
             # 通知观察者PDF已加载
             self.notify_observers('pdf_loaded', {
                 'total_pages': total_pages,
                 'metadata': metadata,
                 'cached': False,
-                'cache_content': {'raw_content': all_text}
+                'streamed': streaming,
+                'images': all_images,
+                'thumbnails': thumbnails,
+                'cache_content': {'raw_content': all_text, 'text_store': self.text_store}
             })
             
+            self._index_document(file_path, metadata)
             logger.info(f"PDF文件加载成功: {file_path}, 总页数: {total_pages}")
             return True
     
+    def _index_document(self, file_path, metadata):
+        """在后台将当前文档加入文献库全文索引
+        
+        Args:
+            file_path: PDF文件路径
+            metadata: PDF元数据
+        """
+        title = (metadata or {}).get('title', '') or os.path.basename(file_path)
+        pages = [self.text_store.page_text(i) for i in range(self.text_store.page_count)]
+        self.library_index.add_document_async(self.current_pdf_md5, file_path, title, pages)
+    
+    def _extract_content(self, file_path, total_pages, streaming=False, cancel_token=None):
+        """提取PDF所有页面的文本和图片，页数较多时使用进程池并行提取
+        
+        Args:
+            file_path: PDF文件路径
+            total_pages: 总页数
+            streaming: 是否在每页提取完成后发出page_extracted事件
+            cancel_token: 取消令牌，每提取完一页检查一次
+            
+        Returns:
+            tuple: (按页文本存储, 全部图片数据列表)，已取消时返回None
+        """
+        text_store = PageTextStore()
+        all_images = []
+        pages = self.page_extractor.iter_pages(file_path, total_pages)
+        for page_num, text, images in pages:
+            if cancel_token and cancel_token.is_cancelled:
+                # 关闭生成器以取消进程池中尚未开始的分片
+                pages.close()
+                return None
+            text_store.append_page(text)
+            all_images.extend(images)
+            if streaming:
+                self.notify_observers('page_extracted', {
+                    'page_num': page_num + 1,  # 转换为从1开始的页码
+                    'total_pages': total_pages,
+                    'text': text,
+                    'images': images
+                })
+        return text_store, all_images
+    
+    def _unpin_current_cache(self):
+        """允许淘汰当前文档的缓存"""
+        if self.current_pdf_md5:
+            self.cache_service.unpin(self.current_pdf_md5)
+            self.current_pdf_md5 = None
+    
     def close_pdf(self):
         """关闭PDF文件"""
         logger.info("关闭PDF文件")
         self.pdf_reader.close()
         # 重置缓存状态
+        self._unpin_current_cache()
         self.current_pdf_path = None
-        self.current_pdf_md5 = None
         self.is_cached = False
+        self.text_store = None
         # 通知观察者PDF已关闭
         self.notify_observers('pdf_closed')
         
     def rebuild_cache(self) -> bool:
-        """重建当前PDF文件的缓存
+        """重建当前PDF文件的缓存并重新加载
+        
+        在调用线程中同步执行，界面中应通过ReaderPanel.rebuild_cache在后台线程中重建。
         
         Returns:
             bool: 是否成功重建缓存
@@ -153,29 +246,7 @@ class PDFManager:
             return False
         
         logger.info(f"开始重建PDF文件缓存: {self.current_pdf_path}")
-        
-        # 提取所有页面的文本内容
-        total_pages = self.pdf_reader.get_total_pages()
-        all_text = ""
-        all_images = []
-        
-        for page_num in range(total_pages):
-            page = self.pdf_reader.get_page(page_num)
-            if page:
-                all_text += f"\n--- 第 {page_num + 1} 页 ---\n\n"
-                all_text += page.get_text()
-                all_images.extend(page.images)
-        
-        # 重建缓存
-        result = self.cache_manager.rebuild_cache(self.current_pdf_md5, all_text, all_images)
-        
-        if result:
-            logger.info(f"PDF文件缓存重建成功: {self.current_pdf_path}")
-            # 重新加载PDF文件以使用新缓存
-            return self.load_pdf(self.current_pdf_path)
-        else:
-            logger.error(f"PDF文件缓存重建失败: {self.current_pdf_path}")
-            return False
+        return self.load_pdf(self.current_pdf_path, force_rebuild=True)
     
     def get_current_page(self):
         """获取当前页面
@@ -306,13 +377,21 @@ class PDFManager:
             query: 搜索关键词
             
         Returns:
-            List[Dict]: 搜索结果列表
+            List[Dict]: 搜索结果列表，每项包含页码page（从0开始）和摘要text
         """
         if not self.pdf_reader.doc:
             logger.warning("搜索文本失败: 没有打开的PDF文档")
             return []
         
         logger.info(f"搜索文本: {query}")
-        results = self.pdf_reader.search_text(query)
+        pack = self.cache_service.get_cache_pack(self.current_pdf_md5) if self.current_pdf_md5 else None
+        if self.text_store is not None and pack is not None and pack.has_search_index():
+            # 使用缓存中的倒排索引搜索，只需核对候选页面
+            results = search(query, pack.lookup_prefix, self.text_store.page_text)
+            if not results:
+                # 索引只能从词的开头匹配，没有结果时逐页扫描，匹配词中间的文本
+                results = scan(query, self.text_store.page_text, self.text_store.page_count)
+        else:
+            results = self.pdf_reader.search_text(query)
         logger.info(f"搜索结果数量: {len(results)}")
         return results
\ No newline at end of file
@@ -0,0 +1,180 @@
+import heapq
+import math
+from collections import Counter
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+from pdf.search_index import tokenize
+
+# 文本块的目标长度和相邻文本块的重叠长度（字符）
+CHUNK_CHARS = 800
+CHUNK_OVERLAP = 100
+
+# BM25参数
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class Chunk(NamedTuple):
+    """文档文本块"""
+    page_num: int  # 所在页码（从0开始）
+    start: int  # 页内起始偏移
+    text: str
+
+
+def chunk_pages(pages: Iterable[str], chunk_chars: int = CHUNK_CHARS,
+                overlap: int = CHUNK_OVERLAP) -> List[Chunk]:
+    """将页面文本切分为有重叠的文本块，尽量在换行或空白处断开
+
+    Args:
+        pages: 按页码顺序排列的页面文本
+        chunk_chars: 文本块的目标长度
+        overlap: 相邻文本块的重叠长度
+
+    Returns:
+        List[Chunk]: 文本块列表
+    """
+    chunks = []
+    for page_num, text in enumerate(pages):
+        start = 0
+        while start < len(text):
+            end = min(len(text), start + chunk_chars)
+            if end < len(text):
+                # 在后半段中寻找最后一个换行或空白作为断点
+                cut = max(text.rfind('\n', start + chunk_chars // 2, end), text.rfind(' ', start + chunk_chars // 2, end))
+                if cut > start:
+                    end = cut + 1
+            piece = text[start:end].strip()
+            if piece:
+                chunks.append(Chunk(page_num, start, piece))
+            if end >= len(text):
+                break
+            start = max(start + 1, end - overlap)
+    return chunks
+
+
+def iter_terms(text: str) -> Iterator[str]:
+    """生成用于相关度计算的词项：词元本身，以及相邻中文字符组成的二元词
+
+    中文逐字切分后单字区分度很低，加入二元词可以让连续的词语获得更高的分数。
+
+    Args:
+        text: 文本
+
+    Yields:
+        str: 词项
+    """
+    prev_token, prev_end = None, -1
+    for token, offset in tokenize(text):
+        yield token
+        if len(token) == 1 and offset == prev_end and prev_token is not None and not token.isascii():
+            yield prev_token + token
+        if len(token) == 1 and not token.isascii():
+            prev_token, prev_end = token, offset + 1
+        else:
+            prev_token, prev_end = None, -1
+
+
+class BM25Index:
+    """文本块的BM25索引，词项 -> (文本块序号, 词频) 的倒排表"""
+
+    def __init__(self, chunks: List[Chunk]):
+        """建立索引
+
+        Args:
+            chunks: 文本块列表
+        """
+        self.chunks = chunks
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        self.lengths: List[int] = []
+        for i, chunk in enumerate(chunks):
+            counts = Counter(iter_terms(chunk.text))
+            self.lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                self.postings.setdefault(term, []).append((i, tf))
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def score(self, query: str) -> Dict[int, float]:
+        """计算查询与各文本块的BM25分数
+
+        Args:
+            query: 查询文本
+
+        Returns:
+            Dict[int, float]: 文本块序号 -> 分数，只包含分数大于0的文本块
+        """
+        n = len(self.chunks)
+        scores: Dict[int, float] = {}
+        for term in set(iter_terms(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[i] / self.avg_length)
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def top(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """返回分数最高的k个文本块
+
+        Args:
+            query: 查询文本
+            k: 数量
+
+        Returns:
+            List[Tuple[int, float]]: (文本块序号, 分数)，按分数从高到低排列
+        """
+        return heapq.nlargest(k, self.score(query).items(), key=lambda item: item[1])
+
+
+class DocumentRetriever:
+    """文档检索器，为问题挑选最相关的文本块作为对话上下文"""
+
+    def __init__(self, pages: Iterable[str]):
+        """初始化检索器
+
+        Args:
+            pages: 按页码顺序排列的页面文本
+        """
+        self.index = BM25Index(chunk_pages(pages))
+
+    def retrieve(self, query: str, count_tokens: Callable[[str], int], token_budget: int,
+                 top_k: int = 8) -> List[Chunk]:
+        """挑选与问题最相关、总token数不超过预算的文本块
+
+        问题与文档没有共同词项时（例如“总结这篇文章”），按顺序使用文档开头的文本块。
+
+        Args:
+            query: 用户问题
+            count_tokens: 计算文本token数量的函数
+            token_budget: 上下文的token预算
+            top_k: 最多选取的文本块数量
+
+        Returns:
+            List[Chunk]: 选中的文本块，按在文档中的位置排列
+        """
+        ranked = [i for i, _ in self.index.top(query, top_k)]
+        if not ranked:
+            ranked = range(min(top_k, len(self.index.chunks)))
+
+        selected, used = [], 0
+        for i in ranked:
+            chunk = self.index.chunks[i]
+            tokens = count_tokens(chunk.text)
+            if used + tokens > token_budget:
+                continue
+            selected.append(chunk)
+            used += tokens
+        selected.sort(key=lambda chunk: (chunk.page_num, chunk.start))
+        return selected
+
+    @staticmethod
+    def format_context(chunks: List[Chunk]) -> str:
+        """将文本块格式化为上下文文本，标注所在页码
+
+        Args:
+            chunks: 文本块列表
+
+        Returns:
+            str: 上下文文本
+        """
+        return "\n\n".join(f"[第{chunk.page_num + 1}页]\n{chunk.text}" for chunk in chunks)
@@ -0,0 +1,143 @@
+import re
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Any
+
+# 中日韩文字逐字切分，其他文字按连续的字母数字切分
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af"
+_TOKEN_PATTERN = re.compile(f"[{_CJK}]|[^\\W{_CJK}_]+")
+
+# 搜索结果摘要中匹配文本前后保留的字符数
+SNIPPET_CONTEXT = 30
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int]]:
+    """将文本切分为词元
+
+    Args:
+        text: 文本
+
+    Yields:
+        Tuple[str, int]: (小写词元, 词元在文本中的偏移)
+    """
+    for match in _TOKEN_PATTERN.finditer(text):
+        yield match.group().lower(), match.start()
+
+
+def build_postings(pages: Iterable[str]) -> Dict[str, array]:
+    """为文档建立倒排索引
+
+    Args:
+        pages: 按页码顺序排列的页面文本
+
+    Returns:
+        Dict[str, array]: 词元 -> 依次存放 (页码, 页内偏移) 的无符号整数数组
+    """
+    postings: Dict[str, array] = {}
+    for page_num, text in enumerate(pages):
+        for token, offset in tokenize(text):
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = array('I')
+            entry.append(page_num)
+            entry.append(offset)
+    return postings
+
+
+def make_snippet(text: str, start: int, end: int) -> str:
+    """截取匹配位置附近的文本作为摘要
+
+    Args:
+        text: 页面文本
+        start: 匹配起始偏移
+        end: 匹配结束偏移
+
+    Returns:
+        str: 单行摘要
+    """
+    left = max(0, start - SNIPPET_CONTEXT)
+    right = min(len(text), end + SNIPPET_CONTEXT)
+    snippet = text[left:right].replace('\n', ' ')
+    return ('...' if left > 0 else '') + snippet + ('...' if right < len(text) else '')
+
+
+def search(query: str, lookup_prefix: Callable[[str], Iterable[Tuple[int, int]]],
+           page_text: Callable[[int], str], max_results: int = 500) -> List[Dict[str, Any]]:
+    """使用倒排索引搜索文档
+
+    以查询的第一个词元做前缀查找得到候选位置，再逐个核对页面文本中该位置是否与整个查询匹配
+    （不区分大小写），因此只需读取候选页面，不会扫描整篇文档。匹配需从词的开头开始，
+    需要匹配词中间的文本时使用scan。
+
+    Args:
+        query: 搜索关键词
+        lookup_prefix: 按词元前缀查询 (页码, 页内偏移) 的函数
+        page_text: 按页码（从0开始）获取页面文本的函数
+        max_results: 最多返回的结果数量
+
+    Returns:
+        List[Dict[str, Any]]: 搜索结果列表，每项包含页码page（从0开始）、页内偏移offset和摘要text
+    """
+    query = query.strip()
+    first = next(tokenize(query), None)
+    if first is None:
+        return []
+    token, token_offset = first
+    query_lower = query.lower()
+
+    results = []
+    page_cache = {}
+    for page_num, offset in sorted(lookup_prefix(token)):
+        start = offset - token_offset
+        if start < 0:
+            continue
+        text = page_cache.get(page_num)
+        if text is None:
+            text = page_cache[page_num] = page_text(page_num)
+        end = start + len(query)
+        if text[start:end].lower() != query_lower:
+            continue
+        results.append({
+            'page': page_num,
+            'offset': start,
+            'text': make_snippet(text, start, end)
+        })
+        if len(results) >= max_results:
+            break
+    return results
+
+
+def scan(query: str, page_text: Callable[[int], str], page_count: int,
+         max_results: int = 500) -> List[Dict[str, Any]]:
+    """逐页扫描文本进行子串搜索（不区分大小写），可以匹配词中间的文本
+
+    倒排索引只能从词的开头匹配，索引搜索没有结果时使用本函数，例如"form"匹配"transformer"。
+
+    Args:
+        query: 搜索关键词
+        page_text: 按页码（从0开始）获取页面文本的函数
+        page_count: 总页数
+        max_results: 最多返回的结果数量
+
+    Returns:
+        List[Dict[str, Any]]: 与search相同格式的搜索结果列表
+    """
+    query_lower = query.strip().lower()
+    if not query_lower:
+        return []
+
+    results = []
+    for page_num in range(page_count):
+        text = page_text(page_num)
+        text_lower = text.lower()
+        start = text_lower.find(query_lower)
+        while start >= 0:
+            end = start + len(query_lower)
+            results.append({
+                'page': page_num,
+                'offset': start,
+                'text': make_snippet(text, start, end)
+            })
+            if len(results) >= max_results:
+                return results
+            start = text_lower.find(query_lower, end)
+    return results
@@ -0,0 +1,37 @@
+from typing import Optional, Tuple
+from core.logger import logger
+
+# 缩略图的固定高度（像素）
+THUMBNAIL_HEIGHT = 100
+
+# 缩略图的JPEG压缩质量
+THUMBNAIL_JPEG_QUALITY = 80
+
+
+def make_thumbnail(data: bytes, height: int = THUMBNAIL_HEIGHT) -> Optional[Tuple[int, bytes]]:
+    """生成固定高度的JPEG缩略图
+
+    Args:
+        data: 图片的二进制数据
+        height: 缩略图高度
+
+    Returns:
+        Tuple[int, bytes]: (按固定高度显示时的宽度, JPEG数据)，无法解码时返回None
+    """
+    import fitz
+
+    try:
+        pix = fitz.Pixmap(data)
+        # JPEG只支持灰度和RGB，且不带透明通道
+        if pix.colorspace is None or pix.colorspace.n not in (1, 3):
+            pix = fitz.Pixmap(fitz.csRGB, pix)
+        if pix.alpha:
+            pix = fitz.Pixmap(pix, 0)
+        # 返回按固定高度显示时的宽度，比缩略图矮的图片保持原尺寸，显示时再放大
+        width = max(1, round(pix.width * height / pix.height))
+        if pix.height > height:
+            pix = fitz.Pixmap(pix, width, height, None)
+        return width, pix.tobytes('jpg', jpg_quality=THUMBNAIL_JPEG_QUALITY)
+    except Exception as e:
+        logger.debug(f"生成缩略图失败: {str(e)}")
+        return None
@@ -1,10 +1,15 @@
 # services/ai_service.py
 import requests
 import json
+from concurrent.futures import Future
 from typing import Dict, Any, List, Optional
 from core.logger import logger
 from services.config_service import ConfigService
 from core.event_bus import EventBus
+from services.llm_service import LLMService
+from llm.context_window import CONTEXT_PROMPT
+from llm.llm_handler import DEFAULT_REPLY_TOKENS
+from llm.token_counter import count_message_tokens
 
 class AIService:
     def __init__(self, config_service=None):
@@ -12,6 +17,7 @@ class AIService:
         self.event_bus = EventBus()
         self.api_key = self.config_service.api_key
         self.api_url = self.config_service.api_url
+        self.model = "gpt-3.5-turbo"
         logger.info("AI服务初始化完成")
         
         # 订阅API密钥变更事件
@@ -26,12 +32,32 @@ class AIService:
         self.api_key = data.get('api_key', '')
         self.api_url = data.get('api_url', '')
     
-    def send_message(self, messages: List[Dict[str, str]], context: str = "") -> Optional[str]:
+    def send_message_async(self, messages: List[Dict[str, str]], context: str = "",
+                           max_tokens: Optional[int] = None) -> Future:
+        """在LLM服务的线程池中发送消息，不阻塞调用线程
+        
+        ai_response/ai_error事件在工作线程中发布。与进行中的相同请求合并，只发送一次。
+        
+        Args:
+            messages: 消息列表，每个消息包含role和content
+            context: 上下文内容
+            max_tokens: 回复的最大token数量
+            
+        Returns:
+            Future: 结果与send_message的返回值相同
+        """
+        llm_service = LLMService()
+        key = llm_service.request_key(self.api_url, self.api_key, self.model, messages, context, max_tokens)
+        return llm_service.submit_coalesced(key, self.send_message, messages, context, max_tokens)
+    
+    def send_message(self, messages: List[Dict[str, str]], context: str = "",
+                     max_tokens: Optional[int] = None) -> Optional[str]:
         """发送消息到AI API
         
         Args:
             messages: 消息列表，每个消息包含role和content
             context: 上下文内容
+            max_tokens: 回复的最大token数量
             
         Returns:
             str: AI的回复，如果请求失败则返回None
@@ -44,15 +70,17 @@ class AIService:
         try:
             # 构建请求数据
             payload = {
-                "model": "gpt-3.5-turbo",
-                "messages": messages
+                "model": self.model,
+                "messages": list(messages)
             }
+            if max_tokens is not None:
+                payload["max_tokens"] = max_tokens
             
             # 如果有上下文，添加到系统消息中
             if context:
                 system_message = {
                     "role": "system",
-                    "content": f"以下是文档内容，请基于这些内容回答用户的问题：\n\n{context}"
+                    "content": CONTEXT_PROMPT.format(context=context)
                 }
                 payload["messages"].insert(0, system_message)
             
@@ -66,8 +94,17 @@ class AIService:
             url = self.api_url or "https://api.openai.com/v1/chat/completions"
             
             logger.info(f"发送请求到AI API: {url}")
-            response = requests.post(url, headers=headers, data=json.dumps(payload))
-            response.raise_for_status()
+            llm_service = LLMService()
+            
+            def post():
+                response = llm_service.get_session().post(url, headers=headers, data=json.dumps(payload),
+                                                          timeout=llm_service.request_timeout())
+                response.raise_for_status()
+                return response
+            
+            # 在接口的限速、重试和熔断保护下发送
+            tokens = count_message_tokens(payload["messages"], self.model) + (max_tokens or DEFAULT_REPLY_TOKENS)
+            response = llm_service.get_guard(url).call(post, tokens)
             
             # 解析响应
             result = response.json()
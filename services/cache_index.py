@@ -0,0 +1,88 @@
+# services/cache_index.py
+import time
+import sqlite3
+from contextlib import closing
+from typing import List, Tuple, Optional
+from core.logger import logger
+
+
+class CacheIndex:
+    """缓存访问记录，保存每个缓存条目的大小和最后访问时间
+
+    淘汰缓存时只需查询这张表，不需要逐个读取缓存文件的状态。
+    """
+
+    def __init__(self, path: str):
+        """初始化缓存访问记录
+
+        Args:
+            path: 记录文件路径
+        """
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS entries ("
+                         "md5 TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(self, md5: str, size: int, last_access: Optional[float] = None) -> None:
+        """记录新写入的缓存条目
+
+        Args:
+            md5: 缓存条目的MD5值
+            size: 缓存条目占用的字节数
+            last_access: 最后访问时间，为None时使用当前时间
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT OR REPLACE INTO entries (md5, size, last_access) VALUES (?, ?, ?)",
+                         (md5, size, last_access if last_access is not None else time.time()))
+            conn.commit()
+
+    def touch(self, md5: str) -> None:
+        """更新缓存条目的最后访问时间
+
+        Args:
+            md5: 缓存条目的MD5值
+        """
+        try:
+            with closing(self._connect()) as conn:
+                conn.execute("UPDATE entries SET last_access = ? WHERE md5 = ?", (time.time(), md5))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"更新缓存访问时间失败: {str(e)}")
+
+    def remove(self, md5: str) -> None:
+        """删除缓存条目的记录
+
+        Args:
+            md5: 缓存条目的MD5值
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM entries WHERE md5 = ?", (md5,))
+            conn.commit()
+
+    def is_empty(self) -> bool:
+        """是否还没有任何记录"""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+
+    def totals(self) -> Tuple[int, int]:
+        """统计缓存总大小和条目数
+
+        Returns:
+            Tuple[int, int]: (总字节数, 条目数)
+        """
+        with closing(self._connect()) as conn:
+            total_size, count = conn.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries").fetchone()
+        return total_size, count
+
+    def least_recently_used(self) -> List[Tuple[str, int]]:
+        """按最后访问时间从早到晚列出缓存条目
+
+        Returns:
+            List[Tuple[str, int]]: (MD5值, 字节数) 列表
+        """
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT md5, size FROM entries ORDER BY last_access ASC").fetchall()
@@ -0,0 +1,211 @@
+# services/cache_pack.py
+import os
+import io
+import json
+import sqlite3
+from array import array
+from contextlib import closing
+from pathlib import Path
+from collections.abc import Sequence
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+from core.logger import logger
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE pages (page_num INTEGER PRIMARY KEY, text TEXT NOT NULL);
+CREATE TABLE images (idx INTEGER PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE thumbnails (idx INTEGER PRIMARY KEY, width INTEGER NOT NULL, data BLOB NOT NULL);
+CREATE TABLE search_index (token TEXT PRIMARY KEY, postings BLOB NOT NULL);
+"""
+
+
+class CachePack:
+    """单文件文档缓存容器
+
+    使用一个SQLite文件保存文档的页面文本、图片和元数据，可以按页码或图片序号随机读取，
+    不需要像旧的content.txt加images目录那样逐个读取小文件。
+    """
+
+    def __init__(self, path: str):
+        """初始化缓存容器
+
+        Args:
+            path: 容器文件路径
+        """
+        self.path = path
+
+    def exists(self) -> bool:
+        """容器文件是否存在（写入时先写临时文件再替换，存在即表示写入完整）"""
+        return os.path.isfile(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # 以只读方式打开，避免读取时意外创建空文件
+        return sqlite3.connect(f"{Path(self.path).as_uri()}?mode=ro", uri=True)
+
+    def write(self, pages: Iterable[str], images: Optional[List[Any]] = None,
+              metadata: Optional[Dict[str, Any]] = None,
+              search_index: Optional[Dict[str, array]] = None,
+              thumbnails: Optional[List[Optional[Tuple[int, bytes]]]] = None) -> None:
+        """写入容器，先写临时文件再替换原文件
+
+        Args:
+            pages: 按页码顺序排列的页面文本
+            images: 图片数据列表，元素为bytes或提供save方法的图片对象
+            metadata: 文档元数据
+            search_index: 倒排索引，词元 -> 依次存放 (页码, 页内偏移) 的整数数组
+            thumbnails: 与图片一一对应的缩略图 (显示宽度, JPEG数据)，无法生成的为None
+        """
+        tmp_path = self.path + '.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            conn.executescript(_SCHEMA)
+            conn.executemany("INSERT INTO pages (page_num, text) VALUES (?, ?)", enumerate(pages))
+            conn.executemany("INSERT INTO images (idx, data) VALUES (?, ?)",
+                             ((i, self._image_bytes(image)) for i, image in enumerate(images or [])))
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                             ((key, json.dumps(value, ensure_ascii=False)) for key, value in (metadata or {}).items()))
+            conn.executemany("INSERT INTO search_index (token, postings) VALUES (?, ?)",
+                             ((token, postings.tobytes()) for token, postings in (search_index or {}).items()))
+            conn.executemany("INSERT INTO thumbnails (idx, width, data) VALUES (?, ?, ?)",
+                             ((i, thumbnail[0], thumbnail[1]) for i, thumbnail in enumerate(thumbnails or [])
+                              if thumbnail))
+            conn.commit()
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _image_bytes(image: Any) -> bytes:
+        """将图片转换为字节数据"""
+        if isinstance(image, (bytes, bytearray)):
+            return bytes(image)
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    def page_count(self) -> int:
+        """页数"""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def page_text(self, page_num: int) -> Optional[str]:
+        """读取指定页面的文本
+
+        Args:
+            page_num: 页码（从0开始）
+
+        Returns:
+            str: 页面文本，页码无效时返回None
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT text FROM pages WHERE page_num = ?", (page_num,)).fetchone()
+        return row[0] if row else None
+
+    def read_pages(self) -> List[str]:
+        """按页码顺序读取所有页面文本"""
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT text FROM pages ORDER BY page_num")]
+
+    def image_count(self) -> int:
+        """图片数量"""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def image(self, index: int) -> Optional[bytes]:
+        """读取指定序号的图片
+
+        Args:
+            index: 图片序号（从0开始）
+
+        Returns:
+            bytes: 图片数据，序号无效时返回None
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT data FROM images WHERE idx = ?", (index,)).fetchone()
+        return row[0] if row else None
+
+    def read_images(self) -> List[bytes]:
+        """按顺序读取所有图片"""
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT data FROM images ORDER BY idx")]
+
+    def lazy_images(self) -> 'PackImages':
+        """按需读取的图片序列，访问某张图片时才从容器中读取其数据"""
+        return PackImages(self, self.image_count())
+
+    def read_thumbnails(self) -> Dict[int, Tuple[int, bytes]]:
+        """读取所有缩略图（早期版本写入的容器没有缩略图）
+
+        Returns:
+            Dict[int, Tuple[int, bytes]]: 图片序号 -> (显示宽度, JPEG数据)
+        """
+        try:
+            with closing(self._connect()) as conn:
+                return {idx: (width, data) for idx, width, data in
+                        conn.execute("SELECT idx, width, data FROM thumbnails")}
+        except sqlite3.Error:
+            return {}
+
+    def has_search_index(self) -> bool:
+        """容器中是否有倒排索引（早期版本写入的容器没有）"""
+        try:
+            with closing(self._connect()) as conn:
+                return conn.execute("SELECT 1 FROM search_index LIMIT 1").fetchone() is not None
+        except sqlite3.Error:
+            return False
+
+    def lookup_prefix(self, prefix: str) -> List[Tuple[int, int]]:
+        """查询以指定前缀开头的所有词元的出现位置
+
+        Args:
+            prefix: 词元前缀（小写）
+
+        Returns:
+            List[Tuple[int, int]]: (页码, 页内偏移) 列表
+        """
+        positions = []
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT postings FROM search_index WHERE token >= ? AND token < ?",
+                                (prefix, prefix + '\U0010ffff'))
+            for (blob,) in rows:
+                postings = array('I')
+                postings.frombytes(blob)
+                positions.extend(zip(postings[::2], postings[1::2]))
+        return positions
+
+    def metadata(self) -> Dict[str, Any]:
+        """读取文档元数据"""
+        try:
+            with closing(self._connect()) as conn:
+                return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM meta")}
+        except sqlite3.Error as e:
+            logger.error(f"读取缓存元数据失败: {str(e)}")
+            return {}
+
+
+class PackImages(Sequence):
+    """缓存容器中图片的只读序列，按序号访问时才读取图片数据，并保留最近读取的一张"""
+
+    def __init__(self, pack: CachePack, count: int):
+        self.pack = pack
+        self.count = count
+        self._last = (None, None)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        if self._last[0] == index:
+            return self._last[1]
+        try:
+            data = self.pack.image(index) or b''
+        except sqlite3.Error as e:
+            logger.error(f"读取缓存图片失败: {index}, 错误: {str(e)}")
+            data = b''
+        self._last = (index, data)
+        return data
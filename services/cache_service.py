@@ -1,10 +1,16 @@
 # services/cache_service.py
 import os
-import hashlib
 import shutil
-import io
-from typing import Dict, Any, Optional, List
+import threading
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
 from core.logger import logger
+from pdf.page_text import PageTextStore
+from pdf.search_index import build_postings
+from pdf.thumbnails import make_thumbnail
+from services.cache_pack import CachePack
+from services.cache_index import CacheIndex
+from services.config_service import ConfigService
+from utils.fingerprint import FingerprintIndex
 
 class CacheService:
     _instance = None
@@ -24,8 +30,21 @@ class CacheService:
         self.cache_root = os.path.join(os.getcwd(), 'data', 'storage')
         # 确保缓存根目录存在
         os.makedirs(self.cache_root, exist_ok=True)
+        # 缓存访问记录和容量上限
+        self.cache_index = CacheIndex(os.path.join(self.cache_root, 'cache_index.db'))
+        config_service = ConfigService()
+        self.max_bytes = config_service.cache_max_bytes
+        self.max_entries = config_service.cache_max_entries
+        self._eviction_lock = threading.Lock()
+        # 正在使用的缓存条目（md5 -> 引用次数），淘汰时跳过
+        self._pinned = {}
+        self._pin_lock = threading.Lock()
         self._initialized = True
         logger.info(f"缓存服务初始化完成，缓存根目录: {self.cache_root}")
+        
+        # 首次使用访问记录时登记已有的缓存条目，并按容量上限清理
+        if self.cache_index.is_empty():
+            self.schedule_eviction(seed_index=True)
     
     def get_pdf_md5(self, file_path: str) -> Optional[str]:
         """计算PDF文件的MD5值
@@ -36,19 +55,11 @@ class CacheService:
         Returns:
             str: PDF文件的MD5值，如果计算失败则返回None
         """
-        try:
-            with open(file_path, 'rb') as f:
-                md5 = hashlib.md5()
-                # 分块读取文件以处理大文件
-                for chunk in iter(lambda: f.read(4096), b""):
-                    md5.update(chunk)
-                return md5.hexdigest()
-        except Exception as e:
-            logger.error(f"计算PDF文件MD5值失败: {str(e)}")
-            return None
+        # 文件未变化时直接使用指纹索引中记录的MD5值
+        return FingerprintIndex().get_md5(file_path)
     
     def get_cache_dir(self, pdf_md5: str) -> str:
-        """获取PDF文件的缓存目录
+        """获取PDF文件的旧版缓存目录（content.txt加images目录）
         
         Args:
             pdf_md5: PDF文件的MD5值
@@ -58,6 +69,17 @@ class CacheService:
         """
         return os.path.join(self.cache_root, pdf_md5)
     
+    def get_cache_pack(self, pdf_md5: str) -> CachePack:
+        """获取PDF文件的缓存容器
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+            
+        Returns:
+            CachePack: 缓存容器
+        """
+        return CachePack(os.path.join(self.cache_root, f'{pdf_md5}.pack'))
+    
     def check_cache_exists(self, pdf_md5: str) -> bool:
         """检查PDF文件的缓存是否存在
         
@@ -67,42 +89,214 @@ class CacheService:
         Returns:
             bool: 缓存是否存在
         """
-        cache_dir = self.get_cache_dir(pdf_md5)
-        content_file = os.path.join(cache_dir, 'content.txt')
-        return os.path.exists(cache_dir) and os.path.exists(content_file)
+        return self.get_cache_pack(pdf_md5).exists()
     
-    def create_cache(self, pdf_md5: str, content: str, images: List[Any] = None) -> bool:
-        """创建PDF文件的缓存
+    def create_cache(self, pdf_md5: str, content: Union[str, PageTextStore], images: List[Any] = None,
+                     metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """创建PDF文件的缓存，文本、图片和元数据写入同一个缓存容器文件
         
         Args:
             pdf_md5: PDF文件的MD5值
-            content: PDF文件的文本内容
+            content: PDF文件的文本内容，可以是全文字符串或按页文本存储
             images: PDF文件中的图片列表
+            metadata: PDF文件的元数据
             
         Returns:
             bool: 是否成功创建缓存
         """
         try:
-            cache_dir = self.get_cache_dir(pdf_md5)
-            # 确保缓存目录存在
-            os.makedirs(cache_dir, exist_ok=True)
-            
-            # 保存文本内容
-            content_file = os.path.join(cache_dir, 'content.txt')
-            with open(content_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            # 保存图片（如果有）
-            if images:
-                images_dir = os.path.join(cache_dir, 'images')
-                os.makedirs(images_dir, exist_ok=True)
-                for i, image in enumerate(images):
-                    image_path = os.path.join(images_dir, f'image_{i}.png')
-                    image.save(image_path)
-            
+            text_store = content if isinstance(content, PageTextStore) else PageTextStore.from_text(content)
+            pages = [text_store.page_text(i) for i in range(text_store.page_count)]
+            # 提取时一并建立倒排索引，文档内搜索直接查询索引
+            search_index = build_postings(pages)
+            # 同时生成固定高度的缩略图，打开缓存时不需要再解码完整图片
+            thumbnails = [make_thumbnail(image) if isinstance(image, (bytes, bytearray)) else None
+                          for image in images or []]
+            pack = self.get_cache_pack(pdf_md5)
+            pack.write(pages, images, metadata, search_index, thumbnails)
+            self.cache_index.record(pdf_md5, os.path.getsize(pack.path))
             logger.info(f"成功创建缓存: {pdf_md5}")
+            # 在后台线程中淘汰超出容量上限的缓存
+            self.schedule_eviction()
             return True
             
         except Exception as e:
             logger.error(f"创建缓存失败: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+    
+    def rebuild_cache(self, pdf_md5: str, content: Union[str, PageTextStore], images: List[Any] = None,
+                      metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """重建PDF文件的缓存，同时清理旧版缓存目录
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+            content: PDF文件的文本内容，可以是全文字符串或按页文本存储
+            images: PDF文件中的图片列表
+            metadata: PDF文件的元数据
+            
+        Returns:
+            bool: 是否成功重建缓存
+        """
+        legacy_dir = self.get_cache_dir(pdf_md5)
+        if os.path.isdir(legacy_dir):
+            shutil.rmtree(legacy_dir, ignore_errors=True)
+        return self.create_cache(pdf_md5, content, images, metadata)
+    
+    def get_cache_content(self, pdf_md5: str) -> Dict[str, Any]:
+        """获取PDF文件的缓存内容
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+            
+        Returns:
+            Dict[str, Any]: 缓存内容，包括全文raw_content、按页文本存储text_store和元数据metadata
+        """
+        pack = self.get_cache_pack(pdf_md5)
+        self.cache_index.touch(pdf_md5)
+        try:
+            text_store = PageTextStore(pack.read_pages())
+            metadata = pack.metadata()
+        except Exception as e:
+            logger.error(f"读取缓存内容失败: {str(e)}")
+            text_store = PageTextStore()
+            metadata = {}
+        return {
+            'raw_content': text_store.full_text(),
+            'text_store': text_store,
+            'metadata': metadata
+        }
+    
+    def get_cache_images(self, pdf_md5: str) -> Sequence[bytes]:
+        """获取PDF文件缓存中的所有图片数据
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+            
+        Returns:
+            Sequence[bytes]: 按顺序排列的图片数据，访问某张图片时才从缓存容器中读取
+        """
+        try:
+            return self.get_cache_pack(pdf_md5).lazy_images()
+        except Exception as e:
+            logger.error(f"读取缓存图片失败: {str(e)}")
+            return []
+    
+    def get_cache_thumbnails(self, pdf_md5: str) -> Dict[int, Tuple[int, bytes]]:
+        """获取PDF文件缓存中的缩略图
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+            
+        Returns:
+            Dict[int, Tuple[int, bytes]]: 图片序号 -> (显示宽度, JPEG数据)，早期版本的缓存返回空字典
+        """
+        try:
+            return self.get_cache_pack(pdf_md5).read_thumbnails()
+        except Exception as e:
+            logger.error(f"读取缓存缩略图失败: {str(e)}")
+            return {}
+    
+    def remove_cache(self, pdf_md5: str) -> None:
+        """删除PDF文件的缓存，包括缓存容器、旧版缓存目录和访问记录
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+        """
+        pack = self.get_cache_pack(pdf_md5)
+        try:
+            if pack.exists():
+                os.remove(pack.path)
+        except OSError as e:
+            logger.error(f"删除缓存失败: {pdf_md5}, 错误: {str(e)}")
+            return
+        legacy_dir = self.get_cache_dir(pdf_md5)
+        if os.path.isdir(legacy_dir):
+            shutil.rmtree(legacy_dir, ignore_errors=True)
+        self.cache_index.remove(pdf_md5)
+    
+    def pin(self, pdf_md5: str) -> None:
+        """标记缓存正在使用，在对应的unpin之前不会被淘汰
+        
+        打开的文档按需从缓存容器读取图片，容器被淘汰后读取只能得到空数据。
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+        """
+        with self._pin_lock:
+            self._pinned[pdf_md5] = self._pinned.get(pdf_md5, 0) + 1
+    
+    def unpin(self, pdf_md5: str) -> None:
+        """取消pin的标记
+        
+        Args:
+            pdf_md5: PDF文件的MD5值
+        """
+        with self._pin_lock:
+            count = self._pinned.get(pdf_md5, 0) - 1
+            if count > 0:
+                self._pinned[pdf_md5] = count
+            else:
+                self._pinned.pop(pdf_md5, None)
+    
+    def is_pinned(self, pdf_md5: str) -> bool:
+        """缓存是否正在使用"""
+        with self._pin_lock:
+            return pdf_md5 in self._pinned
+    
+    def schedule_eviction(self, seed_index: bool = False) -> None:
+        """在后台线程中淘汰缓存，已有淘汰任务在运行时不重复启动
+        
+        Args:
+            seed_index: 是否先扫描缓存根目录，登记访问记录中还没有的缓存条目
+        """
+        if not self._eviction_lock.acquire(blocking=False):
+            return
+        
+        def run():
+            try:
+                if seed_index:
+                    self._seed_index()
+                self.evict()
+            except Exception as e:
+                logger.error(f"淘汰缓存失败: {str(e)}")
+            finally:
+                self._eviction_lock.release()
+        
+        threading.Thread(target=run, name='cache-eviction', daemon=True).start()
+    
+    def _seed_index(self) -> None:
+        """扫描缓存根目录，按文件修改时间登记已有的缓存条目"""
+        for entry in os.scandir(self.cache_root):
+            if entry.is_file() and entry.name.endswith('.pack'):
+                stat = entry.stat()
+                self.cache_index.record(entry.name[:-len('.pack')], stat.st_size, stat.st_mtime)
+            elif entry.is_dir():
+                # 旧版缓存目录
+                size = 0
+                for root, _, files in os.walk(entry.path):
+                    size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+                self.cache_index.record(entry.name, size, entry.stat().st_mtime)
+    
+    def evict(self) -> int:
+        """按最后访问时间淘汰最久未使用的缓存，直到总大小和条目数都不超过上限
+        
+        最近访问的一个条目以及正在使用（已pin）的条目不会被淘汰。
+        
+        Returns:
+            int: 淘汰的条目数
+        """
+        total_size, count = self.cache_index.totals()
+        evicted = 0
+        for md5, size in self.cache_index.least_recently_used()[:-1]:
+            over_size = self.max_bytes and total_size > self.max_bytes
+            over_count = self.max_entries and count > self.max_entries
+            if not over_size and not over_count:
+                break
+            if self.is_pinned(md5):
+                continue
+            logger.info(f"淘汰缓存: {md5}, 大小: {size} 字节")
+            self.remove_cache(md5)
+            total_size -= size
+            count -= 1
+            evicted += 1
+        return evicted
@@ -21,6 +21,25 @@ class ConfigService:
         'splitter_sizes': [200, 400, 400, 200],
         'image_viewer_splitter_sizes': [700, 300],
         'zoom_level': 1.0,
+        'extract_workers': 0,
+        'parallel_extract_threshold': 32,
+        'cache_max_bytes': 2 * 1024 ** 3,
+        'cache_max_entries': 0,
+        'llm_max_workers': 4,
+        'llm_pool_size': 10,
+        'llm_connect_timeout': 10.0,
+        'llm_read_timeout': 120.0,
+        'llm_requests_per_minute': 60,
+        'llm_tokens_per_minute': 90000,
+        'llm_max_retries': 5,
+        'llm_max_retry_delay': 60,
+        'translation_cache_max_entries': 10000,
+        'translate_max_in_flight': 3,
+        'chat_context_tokens': 3000,
+        'chat_context_top_k': 8,
+        'chat_window_tokens': 16385,
+        'chat_reply_tokens': 1024,
+        'image_cache_max_bytes': 512 * 1024 ** 2,
         'categories': {}
     }
     
@@ -140,6 +159,158 @@ class ConfigService:
     def zoom_level(self, value: float) -> None:
         self.set('zoom_level', value)
     
+    @property
+    def extract_workers(self) -> int:
+        return self.get('extract_workers', 0)
+    
+    @extract_workers.setter
+    def extract_workers(self, value: int) -> None:
+        self.set('extract_workers', value)
+    
+    @property
+    def parallel_extract_threshold(self) -> int:
+        return self.get('parallel_extract_threshold', 32)
+    
+    @parallel_extract_threshold.setter
+    def parallel_extract_threshold(self, value: int) -> None:
+        self.set('parallel_extract_threshold', value)
+    
+    @property
+    def cache_max_bytes(self) -> int:
+        return self.get('cache_max_bytes', 2 * 1024 ** 3)
+    
+    @cache_max_bytes.setter
+    def cache_max_bytes(self, value: int) -> None:
+        self.set('cache_max_bytes', value)
+    
+    @property
+    def cache_max_entries(self) -> int:
+        return self.get('cache_max_entries', 0)
+    
+    @cache_max_entries.setter
+    def cache_max_entries(self, value: int) -> None:
+        self.set('cache_max_entries', value)
+    
+    @property
+    def llm_max_workers(self) -> int:
+        return self.get('llm_max_workers', 4)
+    
+    @llm_max_workers.setter
+    def llm_max_workers(self, value: int) -> None:
+        self.set('llm_max_workers', value)
+    
+    @property
+    def llm_pool_size(self) -> int:
+        return self.get('llm_pool_size', 10)
+    
+    @llm_pool_size.setter
+    def llm_pool_size(self, value: int) -> None:
+        self.set('llm_pool_size', value)
+    
+    @property
+    def llm_connect_timeout(self) -> float:
+        return self.get('llm_connect_timeout', 10.0)
+    
+    @llm_connect_timeout.setter
+    def llm_connect_timeout(self, value: float) -> None:
+        self.set('llm_connect_timeout', value)
+    
+    @property
+    def llm_read_timeout(self) -> float:
+        return self.get('llm_read_timeout', 120.0)
+    
+    @llm_read_timeout.setter
+    def llm_read_timeout(self, value: float) -> None:
+        self.set('llm_read_timeout', value)
+    
+    @property
+    def llm_requests_per_minute(self) -> int:
+        return self.get('llm_requests_per_minute', 60)
+    
+    @llm_requests_per_minute.setter
+    def llm_requests_per_minute(self, value: int) -> None:
+        self.set('llm_requests_per_minute', value)
+    
+    @property
+    def llm_tokens_per_minute(self) -> int:
+        return self.get('llm_tokens_per_minute', 90000)
+    
+    @llm_tokens_per_minute.setter
+    def llm_tokens_per_minute(self, value: int) -> None:
+        self.set('llm_tokens_per_minute', value)
+    
+    @property
+    def llm_max_retries(self) -> int:
+        return self.get('llm_max_retries', 5)
+    
+    @llm_max_retries.setter
+    def llm_max_retries(self, value: int) -> None:
+        self.set('llm_max_retries', value)
+    
+    @property
+    def llm_max_retry_delay(self) -> float:
+        return self.get('llm_max_retry_delay', 60)
+    
+    @llm_max_retry_delay.setter
+    def llm_max_retry_delay(self, value: float) -> None:
+        self.set('llm_max_retry_delay', value)
+    
+    @property
+    def translation_cache_max_entries(self) -> int:
+        return self.get('translation_cache_max_entries', 10000)
+    
+    @translation_cache_max_entries.setter
+    def translation_cache_max_entries(self, value: int) -> None:
+        self.set('translation_cache_max_entries', value)
+    
+    @property
+    def translate_max_in_flight(self) -> int:
+        return self.get('translate_max_in_flight', 3)
+    
+    @translate_max_in_flight.setter
+    def translate_max_in_flight(self, value: int) -> None:
+        self.set('translate_max_in_flight', value)
+    
+    @property
+    def chat_context_tokens(self) -> int:
+        return self.get('chat_context_tokens', 3000)
+    
+    @chat_context_tokens.setter
+    def chat_context_tokens(self, value: int) -> None:
+        self.set('chat_context_tokens', value)
+    
+    @property
+    def chat_context_top_k(self) -> int:
+        return self.get('chat_context_top_k', 8)
+    
+    @chat_context_top_k.setter
+    def chat_context_top_k(self, value: int) -> None:
+        self.set('chat_context_top_k', value)
+    
+    @property
+    def chat_window_tokens(self) -> int:
+        return self.get('chat_window_tokens', 16385)
+    
+    @chat_window_tokens.setter
+    def chat_window_tokens(self, value: int) -> None:
+        self.set('chat_window_tokens', value)
+    
+    @property
+    def chat_reply_tokens(self) -> int:
+        return self.get('chat_reply_tokens', 1024)
+    
+    @chat_reply_tokens.setter
+    def chat_reply_tokens(self, value: int) -> None:
+        self.set('chat_reply_tokens', value)
+    
+    @property
+    def image_cache_max_bytes(self) -> int:
+        return self.get('image_cache_max_bytes', 512 * 1024 ** 2)
+    
+    @image_cache_max_bytes.setter
+    def image_cache_max_bytes(self, value: int) -> None:
+        self.set('image_cache_max_bytes', value)
+    
     @property
     def categories(self) -> Dict[str, Any]:
         return self.get('categories', {})
@@ -0,0 +1,152 @@
+# services/document_translator.py
+import re
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Callable, List, Optional, Tuple
+from core.logger import logger
+from services.llm_service import LLMService
+from services.translation_cache import TranslationCache, TRANSLATE_PROMPT, TRANSLATE_MODEL
+
+# 每个翻译片段的最大长度（字符）
+SEGMENT_MAX_CHARS = 1500
+
+# 超长段落按句末标点切分
+_SENTENCE_END = re.compile(r"(?<=[。！？；.!?;])\s*")
+
+
+def split_segments(text: str, max_chars: int = SEGMENT_MAX_CHARS) -> List[str]:
+    """将页面文本切分为翻译片段，按段落合并到不超过max_chars，超长段落再按句子切分
+
+    Args:
+        text: 页面文本
+        max_chars: 片段的最大长度
+
+    Returns:
+        List[str]: 片段列表
+    """
+    # (文本, 与前一部分的连接符)，同一段落内切开的句子直接相连
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append((paragraph, "\n\n"))
+            continue
+        joiner = "\n\n"
+        for sentence in _SENTENCE_END.split(paragraph):
+            # 没有标点的超长句子直接按长度截断
+            for start in range(0, len(sentence), max_chars):
+                pieces.append((sentence[start:start + max_chars], joiner))
+                joiner = ""
+
+    segments, current = [], ""
+    for piece, joiner in pieces:
+        if current and len(current) + len(joiner) + len(piece) > max_chars:
+            segments.append(current)
+            current = ""
+        current = current + joiner + piece if current else piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+class DocumentTranslator:
+    """全文翻译
+
+    将各页文本切分为片段，通过LLM服务并发翻译（同时进行的请求数有上限），再按原顺序拼接。
+    每个片段的结果都保存到翻译缓存中，中断后重新翻译同一文档时已完成的片段直接从缓存读取。
+    """
+
+    def __init__(self, llm_client, target_lang: str, max_in_flight: int = 3):
+        """初始化全文翻译
+
+        Args:
+            llm_client: LLMClient实例
+            target_lang: 目标语言
+            max_in_flight: 同时进行的翻译请求数上限
+        """
+        self.llm_client = llm_client
+        self.target_lang = target_lang
+        self.max_in_flight = max(1, max_in_flight)
+        self.cache = TranslationCache()
+        self.llm_service = LLMService()
+
+    def _submit(self, segment: str):
+        prompt = TRANSLATE_PROMPT.format(target_lang=self.target_lang, text=segment)
+        return self.llm_service.chat_completion(self.llm_client, [{"role": "user", "content": prompt}],
+                                                model=TRANSLATE_MODEL, temperature=0.3)
+
+    def translate_pages(self, pages: List[str],
+                        on_progress: Optional[Callable[[int, int], None]] = None,
+                        on_page: Optional[Callable[[int, str], None]] = None,
+                        is_cancelled: Optional[Callable[[], bool]] = None) -> Optional[List[str]]:
+        """翻译所有页面
+
+        Args:
+            pages: 按页码顺序排列的页面文本
+            on_progress: 进度回调，参数为 (已完成片段数, 片段总数)
+            on_page: 页面翻译完成的回调，参数为 (页码（从0开始）, 译文)，按页码顺序调用
+            is_cancelled: 返回是否已取消的函数
+
+        Returns:
+            List[str]: 各页译文，取消时返回None
+
+        Raises:
+            Exception: 某个片段翻译失败时抛出，已完成的片段仍保留在缓存中
+        """
+        segments: List[Tuple[int, str]] = [(page_num, segment) for page_num, text in enumerate(pages)
+                                           for segment in split_segments(text)]
+        results: List[Optional[str]] = [self.cache.get(segment, self.target_lang) for _, segment in segments]
+        pending = [i for i, result in enumerate(results) if result is None]
+        total = len(segments)
+        completed = total - len(pending)
+        logger.info(f"开始全文翻译，共{total}个片段，缓存中已有{completed}个")
+
+        # 按页码顺序输出已全部完成的页面
+        page_segments = [[] for _ in pages]
+        for i, (page_num, _) in enumerate(segments):
+            page_segments[page_num].append(i)
+        translated_pages: List[str] = []
+
+        def flush_pages():
+            while len(translated_pages) < len(pages):
+                indexes = page_segments[len(translated_pages)]
+                if any(results[i] is None for i in indexes):
+                    break
+                page_text = "\n\n".join(results[i] for i in indexes)
+                translated_pages.append(page_text)
+                if on_page:
+                    on_page(len(translated_pages) - 1, page_text)
+
+        if on_progress:
+            on_progress(completed, total)
+        flush_pages()
+
+        in_flight = {}
+        pending.reverse()
+        try:
+            while pending or in_flight:
+                if is_cancelled and is_cancelled():
+                    logger.info(f"全文翻译已取消，已完成{completed}/{total}个片段")
+                    return None
+                while pending and len(in_flight) < self.max_in_flight:
+                    i = pending.pop()
+                    in_flight[self._submit(segments[i][1])] = i
+
+                done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = in_flight.pop(future)
+                    response = future.result()
+                    translation = response['choices'][0]['message']['content'].strip()
+                    self.cache.put(segments[i][1], self.target_lang, translation)
+                    results[i] = translation
+                    completed += 1
+                    if on_progress:
+                        on_progress(completed, total)
+                flush_pages()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+        logger.info(f"全文翻译完成，共{total}个片段")
+        return translated_pages
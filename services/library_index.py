@@ -0,0 +1,176 @@
+# services/library_index.py
+import os
+import time
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Dict, Any, List, Iterable, Optional
+from core.logger import logger
+from pdf.search_index import tokenize, make_snippet
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    md5 TEXT PRIMARY KEY, file_path TEXT NOT NULL, title TEXT, indexed_at REAL NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    tokens, md5 UNINDEXED, page_num UNINDEXED, text UNINDEXED);
+CREATE TABLE IF NOT EXISTS page_rows (
+    md5 TEXT PRIMARY KEY, first_rowid INTEGER NOT NULL, last_rowid INTEGER NOT NULL);
+"""
+
+
+def _segment(text: str) -> str:
+    """将文本切分为以空格分隔的词元，使FTS5能逐字索引中文"""
+    return " ".join(token for token, _ in tokenize(text))
+
+
+class LibraryIndex:
+    """文献库全文索引，使用SQLite FTS5保存所有已打开或预建索引的文献的页面文本
+
+    搜索结果按BM25相关度排序，以 (文件, 页码, 摘要) 的形式返回。
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        # 避免重复初始化
+        if getattr(self, '_initialized', False):
+            return
+
+        self.index_file = os.path.join(os.getcwd(), 'data', 'library_index.db')
+        os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+        self._write_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        self._initialized = True
+        logger.info(f"文献库索引初始化完成: {self.index_file}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_file, timeout=30)
+
+    def is_indexed(self, md5: str, file_path: Optional[str] = None) -> bool:
+        """文献是否已经建立索引
+
+        Args:
+            md5: PDF文件的MD5值
+            file_path: 文件路径，提供时要求记录的路径也一致
+
+        Returns:
+            bool: 是否已建立索引
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT file_path FROM documents WHERE md5 = ?", (md5,)).fetchone()
+        return row is not None and (file_path is None or row[0] == file_path)
+
+    def add_document(self, md5: str, file_path: str, title: str, pages: Iterable[str]) -> None:
+        """将文献的页面文本加入索引，已存在的同一文献会被替换
+
+        Args:
+            md5: PDF文件的MD5值
+            file_path: 文件路径
+            title: 文献标题
+            pages: 按页码顺序排列的页面文本
+        """
+        pages = list(pages)
+        with self._write_lock, closing(self._connect()) as conn:
+            self._delete_pages(conn, md5)
+            # 同一文献的页面使用连续的rowid，删除时按rowid范围删除，不需要扫描UNINDEXED的md5列
+            first_rowid = conn.execute("SELECT COALESCE(MAX(rowid), 0) + 1 FROM pages_fts").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO pages_fts (rowid, tokens, md5, page_num, text) VALUES (?, ?, ?, ?, ?)",
+                ((first_rowid + page_num, _segment(text), md5, page_num, text) for page_num, text in enumerate(pages)))
+            conn.execute("INSERT OR REPLACE INTO page_rows (md5, first_rowid, last_rowid) VALUES (?, ?, ?)",
+                         (md5, first_rowid, first_rowid + len(pages) - 1))
+            conn.execute("INSERT OR REPLACE INTO documents (md5, file_path, title, indexed_at) VALUES (?, ?, ?, ?)",
+                         (md5, file_path, title, time.time()))
+            conn.commit()
+        logger.info(f"文献已加入文献库索引: {file_path}")
+
+    @staticmethod
+    def _delete_pages(conn: sqlite3.Connection, md5: str) -> None:
+        """删除文献已索引的页面
+
+        Args:
+            conn: 数据库连接
+            md5: PDF文件的MD5值
+        """
+        row = conn.execute("SELECT first_rowid, last_rowid FROM page_rows WHERE md5 = ?", (md5,)).fetchone()
+        if row is not None:
+            conn.execute("DELETE FROM pages_fts WHERE rowid BETWEEN ? AND ?", row)
+            conn.execute("DELETE FROM page_rows WHERE md5 = ?", (md5,))
+
+    def add_document_async(self, md5: str, file_path: str, title: str, pages: List[str]) -> None:
+        """在后台线程中将文献加入索引，已索引的文献直接跳过
+
+        Args:
+            md5: PDF文件的MD5值
+            file_path: 文件路径
+            title: 文献标题
+            pages: 按页码顺序排列的页面文本
+        """
+        def run():
+            try:
+                if not self.is_indexed(md5, file_path):
+                    self.add_document(md5, file_path, title, pages)
+            except Exception as e:
+                logger.error(f"加入文献库索引失败: {file_path}, 错误: {str(e)}")
+
+        threading.Thread(target=run, name='library-index', daemon=True).start()
+
+    @staticmethod
+    def build_match_query(query: str) -> str:
+        """将用户输入转换为FTS5查询，每个以空格分隔的词作为一个短语，短语之间为AND关系
+
+        Args:
+            query: 用户输入
+
+        Returns:
+            str: FTS5查询，输入中没有可检索的词元时返回空字符串
+        """
+        phrases = []
+        for term in query.split():
+            tokens = [token for token, _ in tokenize(term)]
+            if tokens:
+                phrases.append('"' + " ".join(tokens) + '"')
+        return " ".join(phrases)
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """在整个文献库中搜索
+
+        Args:
+            query: 搜索关键词
+            limit: 最多返回的结果数量
+
+        Returns:
+            List[Dict[str, Any]]: 按相关度排序的结果列表，每项包含file_path、title、page（从0开始）和摘要text
+        """
+        match_query = self.build_match_query(query)
+        if not match_query:
+            return []
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT d.file_path, d.title, f.page_num, f.text FROM pages_fts f "
+                "JOIN documents d ON d.md5 = f.md5 "
+                "WHERE pages_fts MATCH ? ORDER BY bm25(pages_fts) LIMIT ?",
+                (match_query, limit)).fetchall()
+
+        first_term = query.split()[0].lower()
+        results = []
+        for file_path, title, page_num, text in rows:
+            start = text.lower().find(first_term)
+            if start < 0:
+                start = 0
+            results.append({
+                'file_path': file_path,
+                'title': title or os.path.basename(file_path),
+                'page': page_num,
+                'text': make_snippet(text, start, start + len(first_term))
+            })
+        return results
@@ -0,0 +1,402 @@
+# services/llm_service.py
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, InvalidStateError
+from typing import Dict, Any, List, Callable, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from core.logger import logger
+from services.config_service import ConfigService
+from llm.llm_handler import LLMClient
+from llm.rate_limit import EndpointGuard
+
+# 未配置接口URL时使用的OpenAI默认接口
+DEFAULT_API_ORIGIN = 'https://api.openai.com'
+
+
+class _SharedStream:
+    """进行中的流式请求，把收到的文本片段分发给所有订阅的调用方"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        # 订阅者：[片段回调, 取消标记, 已收到的片段数, 调用方的Future]
+        self.subscribers: List[list] = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def subscribe(self, on_delta: Callable[[str], None],
+                  cancel_event: Optional[threading.Event]) -> Optional[Future]:
+        """加入流式请求，先补发已经收到的片段
+
+        Returns:
+            Future: 结果为该调用方收到的完整回复，请求已不再接收片段时返回None
+        """
+        with self._lock:
+            if self.closed:
+                return None
+            for delta in self.parts:
+                on_delta(delta)
+            follower = Future()
+            self.subscribers.append([on_delta, cancel_event, len(self.parts), follower])
+            return follower
+
+    def has_subscribers(self) -> bool:
+        """是否还有未取消的调用方，没有时不再接收片段"""
+        with self._lock:
+            self._drop_cancelled()
+            if not self.subscribers:
+                self.closed = True
+            return not self.closed
+
+    def publish(self, delta: str) -> bool:
+        """把新片段分发给所有未取消的调用方
+
+        Returns:
+            bool: 是否还有调用方需要后续片段
+        """
+        with self._lock:
+            self._drop_cancelled()
+            if not self.subscribers:
+                self.closed = True
+                return False
+            self.parts.append(delta)
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber[0](delta)
+            subscriber[2] += 1
+        return True
+
+    def finish(self) -> None:
+        """请求结束，把各调用方收到的完整回复设为结果"""
+        with self._lock:
+            self.closed = True
+            subscribers, self.subscribers = self.subscribers, []
+        for subscriber in subscribers:
+            self._resolve(subscriber)
+
+    def fail(self, error: Exception) -> None:
+        """请求失败，把错误交给所有调用方"""
+        with self._lock:
+            self.closed = True
+            subscribers, self.subscribers = self.subscribers, []
+        for subscriber in subscribers:
+            try:
+                subscriber[3].set_exception(error)
+            except InvalidStateError:
+                # 调用方已经取消
+                pass
+
+    def _drop_cancelled(self) -> None:
+        """移除已取消的调用方，并把它们已收到的部分回复设为结果"""
+        active = []
+        for subscriber in self.subscribers:
+            cancel_event, follower = subscriber[1], subscriber[3]
+            if follower.cancelled() or (cancel_event is not None and cancel_event.is_set()):
+                self._resolve(subscriber)
+            else:
+                active.append(subscriber)
+        self.subscribers = active
+
+    def _resolve(self, subscriber: list) -> None:
+        try:
+            subscriber[3].set_result(''.join(self.parts[:subscriber[2]]))
+        except InvalidStateError:
+            # 调用方已经取消
+            pass
+
+
+class LLMService:
+    """LLM请求执行服务
+
+    所有LLM请求（对话、翻译、文本整理）都提交到同一个有上限的线程池中执行，立即返回Future，
+    调用方不会阻塞界面线程，多个请求可以同时进行。LLM客户端按 (类型, URL, 密钥) 在进程内共享，
+    每个客户端保持长连接池，避免每次请求重新建立TLS连接。同一接口（协议加主机）上的请求共用一个EndpointGuard，
+    统一限速、重试和熔断。完全相同的请求在前一个尚未完成时不会重复发送，而是共享同一个结果。
+    """
+
+    _instance = None
+
+    def __new__(cls, config_service=None):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, config_service=None):
+        # 避免重复初始化
+        if getattr(self, '_initialized', False):
+            return
+
+        self.config_service = config_service or ConfigService()
+        self.max_workers = max(1, self.config_service.llm_max_workers)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='llm')
+        self.pool_size = max(1, self.config_service.llm_pool_size)
+        self.timeout = httpx.Timeout(self.config_service.llm_read_timeout,
+                                     connect=self.config_service.llm_connect_timeout)
+        self._clients: Dict[Tuple[str, str, str], LLMClient] = {}
+        self._guards: Dict[str, EndpointGuard] = {}
+        self._clients_lock = threading.Lock()
+        self._session = None
+        # 进行中的请求：请求键 -> [共享的Future, 等待结果的调用方数量]
+        self._in_flight: Dict[str, list] = {}
+        # 进行中的流式请求：请求键 -> _SharedStream
+        self._in_flight_streams: Dict[str, '_SharedStream'] = {}
+        self._in_flight_lock = threading.RLock()
+        self._initialized = True
+        logger.info(f"LLM服务初始化完成，最大并发请求数: {self.max_workers}")
+
+    def get_client(self, client_type: str = 'general', api_url: Optional[str] = None,
+                   api_key: Optional[str] = None) -> LLMClient:
+        """获取共享的LLM客户端，相同 (类型, URL, 密钥) 的调用方复用同一个客户端和连接池
+
+        Args:
+            client_type: 客户端类型，可选值为'general'、'format'、'translate'、'chat'
+            api_url: API的完整URL，为空时使用OpenAI默认URL
+            api_key: API密钥
+
+        Returns:
+            LLMClient: 共享的LLM客户端
+        """
+        key = (client_type, api_url or '', api_key or '')
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                    timeout=self.timeout)
+                client = LLMClient(api_url=api_url or None, api_key=api_key or None, client_type=client_type,
+                                   http_client=http_client, timeout=self.timeout,
+                                   guard=self._get_guard_locked(api_url))
+                self._clients[key] = client
+                logger.info(f"创建共享LLM客户端: {client_type}, 连接池大小: {self.pool_size}")
+            return client
+
+    def get_guard(self, api_url: str) -> EndpointGuard:
+        """获取接口的限速、重试和熔断保护，同一接口（协议加主机）共用一个
+
+        Args:
+            api_url: 接口URL，可以是基础URL或完整的请求URL，为空表示OpenAI默认接口
+
+        Returns:
+            EndpointGuard: 接口保护
+        """
+        with self._clients_lock:
+            return self._get_guard_locked(api_url)
+
+    @staticmethod
+    def endpoint_key(api_url: Optional[str]) -> str:
+        """将接口URL规范化为 协议://主机[:端口]，基础URL和完整请求URL得到相同的结果
+
+        Args:
+            api_url: 接口URL，为空表示OpenAI默认接口
+
+        Returns:
+            str: 接口标识
+        """
+        parts = urlsplit((api_url or DEFAULT_API_ORIGIN).strip())
+        if not parts.netloc:
+            # 没有写协议的URL（如 api.example.com/v1）
+            parts = urlsplit('https://' + (api_url or '').strip())
+        return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+    def _get_guard_locked(self, api_url: Optional[str]) -> EndpointGuard:
+        key = self.endpoint_key(api_url)
+        guard = self._guards.get(key)
+        if guard is None:
+            guard = EndpointGuard(self.config_service.llm_requests_per_minute,
+                                  self.config_service.llm_tokens_per_minute,
+                                  self.config_service.llm_max_retries,
+                                  self.config_service.llm_max_retry_delay)
+            self._guards[key] = guard
+            logger.info(f"创建接口请求保护: {key}")
+        return guard
+
+    def get_session(self):
+        """获取共享的requests会话，供直接调用HTTP接口的服务复用连接
+
+        Returns:
+            requests.Session: 共享的会话
+        """
+        with self._clients_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    def request_timeout(self) -> Tuple[float, float]:
+        """requests使用的 (连接超时, 读取超时)"""
+        return self.config_service.llm_connect_timeout, self.config_service.llm_read_timeout
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """在线程池中执行一个请求函数
+
+        Args:
+            fn: 请求函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            Future: 请求函数的返回值
+        """
+        return self.executor.submit(fn, *args, **kwargs)
+
+    @staticmethod
+    def request_key(*parts: Any) -> str:
+        """计算请求键，参数完全相同的请求得到相同的键
+
+        Args:
+            *parts: 决定请求结果的参数，需可序列化为JSON
+
+        Returns:
+            str: 请求键
+        """
+        data = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def submit_coalesced(self, key: str, fn: Callable, *args, **kwargs) -> Future:
+        """在线程池中执行请求函数，键相同的请求仍在进行时直接共享它的结果
+
+        每个调用方得到各自的Future，取消它只会让该调用方不再等待；所有调用方都取消后，
+        尚未开始的共享请求才会被取消。
+
+        Args:
+            key: 请求键
+            fn: 请求函数
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            Future: 请求函数的返回值
+        """
+        with self._in_flight_lock:
+            entry = self._in_flight.get(key)
+            if entry is None:
+                shared = self.executor.submit(fn, *args, **kwargs)
+                entry = self._in_flight[key] = [shared, 0]
+                shared.add_done_callback(lambda future: self._forget(key, future))
+            else:
+                logger.info("合并相同的LLM请求，复用进行中的请求结果")
+            entry[1] += 1
+        return self._follow(entry)
+
+    def _forget(self, key: str, future: Future) -> None:
+        with self._in_flight_lock:
+            entry = self._in_flight.get(key)
+            if entry is not None and entry[0] is future:
+                del self._in_flight[key]
+
+    def _follow(self, entry: list) -> Future:
+        """为调用方创建跟随共享请求结果的Future"""
+        shared = entry[0]
+        follower = Future()
+
+        def on_shared_done(future):
+            try:
+                if future.cancelled():
+                    follower.cancel()
+                elif future.exception() is not None:
+                    follower.set_exception(future.exception())
+                else:
+                    follower.set_result(future.result())
+            except InvalidStateError:
+                # 调用方已经取消
+                pass
+
+        def on_follower_done(future):
+            if not future.cancelled():
+                return
+            with self._in_flight_lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    shared.cancel()
+
+        follower.add_done_callback(on_follower_done)
+        shared.add_done_callback(on_shared_done)
+        return follower
+
+    def chat_completion(self, llm_client, messages: List[Dict[str, str]], **kwargs) -> Future:
+        """异步发送聊天请求，与进行中的相同请求（相同接口、模型、消息、温度和max_tokens）合并
+
+        Args:
+            llm_client: LLMClient实例
+            messages: 消息列表
+            **kwargs: 传给LLMClient.chat_completion的其他参数
+
+        Returns:
+            Future: 结果为LLM模型的响应
+        """
+        key = self.request_key(llm_client.client_type, llm_client.api_url, llm_client.api_key, messages, kwargs)
+        return self.submit_coalesced(key, llm_client.chat_completion, list(messages), **kwargs)
+
+    def stream_chat_completion(self, llm_client, messages: List[Dict[str, str]],
+                               on_delta: Callable[[str], None],
+                               cancel_event: Optional[threading.Event] = None, **kwargs) -> Future:
+        """异步发送流式聊天请求，与进行中的相同请求合并
+
+        后加入的调用方先收到已经生成的片段，之后与第一个调用方同时收到新的片段。
+        所有调用方都取消后才停止接收。
+
+        Args:
+            llm_client: LLMClient实例
+            messages: 消息列表
+            on_delta: 收到新文本片段时在工作线程中调用的函数
+            cancel_event: 取消标记，被设置后在收到下一个片段时停止接收
+            **kwargs: 传给LLMClient.chat_completion的其他参数
+
+        Returns:
+            Future: 结果为已接收到的完整回复
+        """
+        key = self.request_key('stream', llm_client.client_type, llm_client.api_url, llm_client.api_key,
+                               messages, kwargs)
+        with self._in_flight_lock:
+            stream = self._in_flight_streams.get(key)
+            follower = stream.subscribe(on_delta, cancel_event) if stream is not None else None
+            if follower is not None:
+                logger.info("合并相同的流式LLM请求，复用进行中的请求")
+                return follower
+            stream = self._in_flight_streams[key] = _SharedStream()
+            follower = stream.subscribe(on_delta, cancel_event)
+
+        def run():
+            try:
+                if stream.has_subscribers():
+                    for delta in llm_client.chat_completion(list(messages), stream=True, **kwargs):
+                        if not stream.publish(delta):
+                            logger.info("流式请求已取消")
+                            break
+            except Exception as e:
+                self._forget_stream(key, stream)
+                stream.fail(e)
+            else:
+                self._forget_stream(key, stream)
+                stream.finish()
+
+        try:
+            self.submit(run)
+        except RuntimeError:
+            # 线程池已关闭
+            self._forget_stream(key, stream)
+            raise
+        return follower
+
+    def _forget_stream(self, key: str, stream: '_SharedStream') -> None:
+        with self._in_flight_lock:
+            if self._in_flight_streams.get(key) is stream:
+                del self._in_flight_streams[key]
+
+    def shutdown(self) -> None:
+        """停止接受新请求，取消尚未开始的请求，并关闭共享的连接池"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        with self._clients_lock:
+            for client in self._clients.values():
+                client.http_client.close()
+            self._clients.clear()
+            if self._session is not None:
+                self._session.close()
+                self._session = None
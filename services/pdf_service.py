@@ -3,23 +3,33 @@ from core.pdf_reader import PDFReader
 from typing import List, Dict, Any, Optional
 from core.logger import logger
 from services.cache_service import CacheService
+from services.config_service import ConfigService
+from pdf.page_extractor import PageExtractor
+from pdf.page_text import PageTextStore
 from core.event_bus import EventBus
 
 class PDFService:
-    def __init__(self, cache_service=None):
+    def __init__(self, cache_service=None, config_service=None):
         self.pdf_reader = PDFReader()
         self.cache_service = cache_service or CacheService()
+        self.config_service = config_service or ConfigService()
+        self.page_extractor = PageExtractor(
+            max_workers=self.config_service.extract_workers,
+            parallel_threshold=self.config_service.parallel_extract_threshold
+        )
         self.event_bus = EventBus()
         self.current_pdf_path = None
         self.current_pdf_md5 = None
+        self.text_store = None
         self.zoom_level = 1.0
         logger.info("PDF服务初始化完成")
     
-    def load_pdf(self, file_path: str) -> bool:
+    def load_pdf(self, file_path: str, streaming: bool = True) -> bool:
         """加载PDF文件
         
         Args:
             file_path: PDF文件路径
+            streaming: 是否逐页加载，为True时每提取完一页即发布page_extracted事件
             
         Returns:
             bool: 是否成功加载PDF文件
@@ -42,6 +52,7 @@ class PDFService:
             logger.info(f"使用缓存加载PDF文件: {file_path}")
             # 从缓存中获取内容
             cache_content = self.cache_service.get_cache_content(self.current_pdf_md5)
+            self.text_store = cache_content['text_store']
             
             # 仍然需要打开PDF文件以获取元数据和总页数
             if not self.pdf_reader.open(file_path):
@@ -72,25 +83,41 @@ class PDFService:
             metadata = self.pdf_reader.get_metadata()
             total_pages = self.pdf_reader.get_total_pages()
             
-            # 提取所有页面的文本内容
-            all_text = ""
+            if streaming:
+                # 发布开始逐页加载事件
+                self.event_bus.publish('pdf_loading', {
+                    'total_pages': total_pages,
+                    'metadata': metadata
+                })
+            
+            # 提取所有页面的文本内容（页数较多时并行提取）
+            self.text_store = PageTextStore()
             all_images = []
-            for page_num in range(total_pages):
-                page = self.pdf_reader.get_page(page_num)
-                if page:
-                    all_text += f"\n--- 第 {page_num + 1} 页 ---\n\n"
-                    all_text += page.get_text()
-                    all_images.extend(page.images)
+            for page_num, text, images in self.page_extractor.iter_pages(file_path, total_pages):
+                self.text_store.append_page(text)
+                all_images.extend(images)
+                if streaming:
+                    self.event_bus.publish('page_extracted', {
+                        'page_num': page_num + 1,
+                        'total_pages': total_pages,
+                        'text': text,
+                        'images': images
+                    })
             
             # 创建缓存
-            self.cache_service.create_cache(self.current_pdf_md5, all_text, all_images)
+            self.cache_service.create_cache(self.current_pdf_md5, self.text_store, all_images, metadata)
             
             # 发布PDF已加载事件
             self.event_bus.publish('pdf_loaded', {
                 'total_pages': total_pages,
                 'metadata': metadata,
                 'cached': False,
-                'cache_content': {'raw_content': all_text}
+                'streamed': streaming,
+                'images': all_images,
+                'cache_content': {
+                    'raw_content': self.text_store.full_text(),
+                    'text_store': self.text_store
+                }
             })
             
             logger.info(f"PDF文件加载成功: {file_path}, 总页数: {total_pages}")
@@ -159,6 +186,7 @@ class PDFService:
             self.pdf_reader.close()
             self.current_pdf_path = None
             self.current_pdf_md5 = None
+            self.text_store = None
             logger.info("关闭PDF文件")
             # 发布PDF已关闭事件
             self.event_bus.publish('pdf_closed', {})
\ No newline at end of file
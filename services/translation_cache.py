@@ -0,0 +1,145 @@
+# services/translation_cache.py
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from contextlib import closing
+from typing import Optional
+from core.logger import logger
+from services.config_service import ConfigService
+
+# 翻译提示词，修改提示词时需要同时增加版本号，使旧的缓存结果失效
+TRANSLATE_PROMPT = "请将以下文本翻译成{target_lang}，只返回翻译结果，不要包含原文或解释：\n\n{text}"
+TRANSLATE_PROMPT_VERSION = 1
+TRANSLATE_MODEL = "gpt-3.5-turbo"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    key TEXT PRIMARY KEY, source TEXT NOT NULL, target_lang TEXT NOT NULL, model TEXT NOT NULL,
+    prompt_version INTEGER NOT NULL, translation TEXT NOT NULL, last_access REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS translations_lru ON translations (last_access);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """规范化源文本：统一Unicode形式并合并连续空白（包括Qt选区中的段落分隔符）
+
+    Args:
+        text: 源文本
+
+    Returns:
+        str: 规范化后的文本
+    """
+    return " ".join(unicodedata.normalize('NFKC', text).split())
+
+
+class TranslationCache:
+    """翻译记忆，使用SQLite保存翻译结果
+
+    以 (规范化源文本的哈希, 目标语言, 模型, 提示词版本) 为键，命中时无需访问网络。
+    条目数超过上限时按最后访问时间淘汰。
+    """
+
+    _instance = None
+
+    def __new__(cls, config_service=None):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, config_service=None):
+        # 避免重复初始化
+        if getattr(self, '_initialized', False):
+            return
+
+        self.config_service = config_service or ConfigService()
+        self.max_entries = self.config_service.translation_cache_max_entries
+        self.cache_file = os.path.join(os.getcwd(), 'data', 'translation_cache.db')
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        self._write_lock = threading.Lock()
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        self._initialized = True
+        logger.info(f"翻译缓存初始化完成: {self.cache_file}")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.cache_file, timeout=10)
+
+    @staticmethod
+    def make_key(source: str, target_lang: str, model: str, prompt_version: int) -> str:
+        """计算缓存键
+
+        Args:
+            source: 规范化后的源文本
+            target_lang: 目标语言
+            model: 模型名称
+            prompt_version: 提示词版本
+
+        Returns:
+            str: 缓存键
+        """
+        digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        return f"{digest}:{target_lang}:{model}:{prompt_version}"
+
+    def get(self, text: str, target_lang: str, model: str = TRANSLATE_MODEL,
+            prompt_version: int = TRANSLATE_PROMPT_VERSION) -> Optional[str]:
+        """查询翻译结果
+
+        Args:
+            text: 源文本
+            target_lang: 目标语言
+            model: 模型名称
+            prompt_version: 提示词版本
+
+        Returns:
+            str: 翻译结果，未命中时返回None
+        """
+        source = normalize_text(text)
+        if not source:
+            return None
+        key = self.make_key(source, target_lang, model, prompt_version)
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE translations SET last_access = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+            return row[0]
+        except sqlite3.Error as e:
+            logger.error(f"读取翻译缓存失败: {str(e)}")
+            return None
+
+    def put(self, text: str, target_lang: str, translation: str, model: str = TRANSLATE_MODEL,
+            prompt_version: int = TRANSLATE_PROMPT_VERSION) -> None:
+        """保存翻译结果，超过条目数上限时淘汰最久未使用的条目
+
+        Args:
+            text: 源文本
+            target_lang: 目标语言
+            translation: 翻译结果
+            model: 模型名称
+            prompt_version: 提示词版本
+        """
+        source = normalize_text(text)
+        if not source or not translation:
+            return
+        key = self.make_key(source, target_lang, model, prompt_version)
+        try:
+            with self._write_lock, closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO translations "
+                    "(key, source, target_lang, model, prompt_version, translation, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, source, target_lang, model, prompt_version, translation, time.time()))
+                if self.max_entries > 0:
+                    conn.execute(
+                        "DELETE FROM translations WHERE key IN (SELECT key FROM translations "
+                        "ORDER BY last_access DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"保存翻译缓存失败: {str(e)}")
@@ -1,8 +1,8 @@
 import os
 import shutil
-import hashlib
 from typing import Optional
 from core.logger import logger
+from utils.fingerprint import FingerprintIndex
 
 class FileUtils:
     """文件工具类，提供文件操作相关的工具方法"""
@@ -28,16 +28,8 @@ class FileUtils:
         Returns:
             str: 文件的MD5值，如果计算失败则返回None
         """
-        try:
-            with open(file_path, 'rb') as f:
-                md5 = hashlib.md5()
-                # 分块读取文件以处理大文件
-                for chunk in iter(lambda: f.read(4096), b""):
-                    md5.update(chunk)
-                return md5.hexdigest()
-        except Exception as e:
-            logger.error(f"计算文件MD5值失败: {str(e)}")
-            return None
+        # 文件未变化时直接使用指纹索引中记录的MD5值
+        return FingerprintIndex().get_md5(file_path)
     
     @staticmethod
     def copy_file(src: str, dst: str) -> bool:
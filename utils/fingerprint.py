@@ -0,0 +1,133 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+from core.logger import logger
+
+# 计算哈希时每次读取的字节数
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def compute_md5(file_path: str) -> str:
+    """计算文件的MD5值，使用1MB的复用缓冲区读取
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        str: 文件的MD5值
+    """
+    md5 = hashlib.md5()
+    buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    with open(file_path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            md5.update(view[:size])
+    return md5.hexdigest()
+
+
+class FingerprintIndex:
+    """文件指纹索引，按 (路径, 大小, 修改时间, inode) 记住文件的MD5值
+
+    文件未变化时直接返回记录的MD5值，只有文件变化或首次打开时才读取整个文件计算哈希。
+    索引持久化保存在data/fingerprints.json中，可在加载线程和GUI线程中同时使用。
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        # 避免重复初始化
+        if getattr(self, '_initialized', False):
+            return
+
+        self.index_file = os.path.join(os.getcwd(), 'data', 'fingerprints.json')
+        self._lock = threading.Lock()
+        self._entries = self._load_index()
+        self._initialized = True
+        logger.info(f"文件指纹索引初始化完成，已记录 {len(self._entries)} 个文件")
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """从索引文件加载指纹记录"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.error(f"加载文件指纹索引失败: {str(e)}")
+        return {}
+
+    def _save_index(self) -> None:
+        """保存指纹记录到索引文件，先写临时文件再替换以免写入中断损坏索引"""
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            tmp_file = self.index_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.error(f"保存文件指纹索引失败: {str(e)}")
+
+    @staticmethod
+    def _stat_key(file_path: str):
+        """获取文件的规范路径和状态信息
+
+        Returns:
+            tuple: (规范路径, 状态信息字典)
+        """
+        path = os.path.normcase(os.path.abspath(file_path))
+        st = os.stat(path)
+        return path, {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino}
+
+    def lookup(self, file_path: str) -> Optional[str]:
+        """查询已记录的MD5值，不读取文件内容
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            str: 文件未变化时返回记录的MD5值，否则返回None
+        """
+        try:
+            path, stat = self._stat_key(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry and all(entry.get(key) == value for key, value in stat.items()):
+            return entry['md5']
+        return None
+
+    def get_md5(self, file_path: str) -> Optional[str]:
+        """获取文件的MD5值，文件未变化时直接使用索引中的记录
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            str: 文件的MD5值，如果计算失败则返回None
+        """
+        md5 = self.lookup(file_path)
+        if md5:
+            return md5
+
+        try:
+            path, stat = self._stat_key(file_path)
+            logger.debug(f"文件指纹未命中，计算MD5值: {file_path}")
+            md5 = compute_md5(path)
+            with self._lock:
+                self._entries[path] = dict(stat, md5=md5)
+                self._save_index()
+            return md5
+        except Exception as e:
+            logger.error(f"计算文件MD5值失败: {str(e)}")
+            return None
@@ -4,7 +4,8 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QTextCursor
 from core.logger import logger
 from core.event_bus import EventBus
-from llm.llm_handler import LLMClient
+from services.llm_service import LLMService
+from llm.llm_worker import LLMRequest
 
 class ReaderView(QWidget):
     def __init__(self, controller=None):
@@ -12,6 +13,7 @@ class ReaderView(QWidget):
         self.controller = controller
         self.event_bus = EventBus()
         self.zoom_level = 1.0  # 默认缩放级别为100%
+        self.pending_requests = []  # 正在进行的LLM请求
         logger.info("初始化阅读器视图")
         self.init_ui()
         
@@ -232,56 +234,56 @@ class ReaderView(QWidget):
             QMessageBox.warning(self, '翻译失败', '无法访问配置管理器。')
             return
         
-        try:
-            # 构建翻译提示
-            prompt = f"请将以下文本翻译成{target_lang}，只返回翻译结果，不要包含原文或解释：\n\n{selected_text}"
-            
-            # 获取API密钥
-            api_key = main_window.config_manager.api_key
-            if not api_key:
-                QMessageBox.warning(self, '翻译失败', '请先在设置中配置API密钥。')
-                return
-            
-            # 创建LLM客户端
-            llm_client = LLMClient(api_key=api_key)
-            
-            # 显示等待提示
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            
-            # 发送翻译请求
-            messages = [{"role": "user", "content": prompt}]
-            response = llm_client.chat_completion(messages, temperature=0.3)
-            
-            # 恢复光标
-            QApplication.restoreOverrideCursor()
-            
-            # 提取翻译结果
-            if response and 'choices' in response and len(response['choices']) > 0:
-                translation = response['choices'][0]['message']['content'].strip()
-                
-                # 显示翻译结果
-                dialog = QDialog(self)
-                dialog.setWindowTitle('翻译结果')
-                dialog.resize(500, 300)
-                
-                layout = QVBoxLayout(dialog)
-                
-                result_text = QTextEdit()
-                result_text.setReadOnly(True)
-                result_text.setText(translation)
-                layout.addWidget(result_text)
-                
-                copy_btn = QPushButton('复制结果')
-                copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(translation))
-                layout.addWidget(copy_btn)
-                
-                dialog.setLayout(layout)
-                dialog.exec_()
-            else:
-                QMessageBox.warning(self, '翻译失败', '无法获取翻译结果，请稍后再试。')
+        # 构建翻译提示
+        prompt = f"请将以下文本翻译成{target_lang}，只返回翻译结果，不要包含原文或解释：\n\n{selected_text}"
+        
+        # 获取API密钥
+        api_key = main_window.config_manager.api_key
+        if not api_key:
+            QMessageBox.warning(self, '翻译失败', '请先在设置中配置API密钥。')
+            return
+        
+        # 获取共享的LLM客户端
+        llm_client = LLMService().get_client(api_key=api_key)
+        
+        # 在LLM服务的线程池中发送翻译请求，界面不等待结果
+        messages = [{"role": "user", "content": prompt}]
+        request = LLMRequest(self)
+        request.completed.connect(self.on_translation_received)
+        request.failed.connect(lambda error: QMessageBox.warning(self, '翻译失败', f'翻译过程中发生错误: {error}'))
+        request.finished.connect(lambda: self.pending_requests.remove(request))
+        request.finished.connect(request.deleteLater)
+        self.pending_requests.append(request)
+        request.attach(LLMService().chat_completion(llm_client, messages, temperature=0.3))
+        logger.info(f"已提交翻译请求，目标语言: {target_lang}")
+    
+    def on_translation_received(self, response):
+        """显示翻译结果
+        
+        Args:
+            response: LLM模型的响应
+        """
+        # 提取翻译结果
+        if not response or 'choices' not in response or len(response['choices']) == 0:
+            QMessageBox.warning(self, '翻译失败', '无法获取翻译结果，请稍后再试。')
+            return
+        translation = response['choices'][0]['message']['content'].strip()
+        
+        # 显示翻译结果
+        dialog = QDialog(self)
+        dialog.setWindowTitle('翻译结果')
+        dialog.resize(500, 300)
+        
+        layout = QVBoxLayout(dialog)
+        
+        result_text = QTextEdit()
+        result_text.setReadOnly(True)
+        result_text.setText(translation)
+        layout.addWidget(result_text)
+        
+        copy_btn = QPushButton('复制结果')
+        copy_btn.clicked.connect(lambda: QApplication.clipboard().setText(translation))
+        layout.addWidget(copy_btn)
         
-        except Exception as e:
-            QApplication.restoreOverrideCursor()
-            QMessageBox.warning(self, '翻译失败', f'翻译过程中发生错误: {str(e)}')
-            import traceback
-            traceback.print_exc()
\ No newline at end of file
+        dialog.setLayout(layout)
+        dialog.exec_()
\ No newline at end of file